@@ -0,0 +1,120 @@
+"""
+Token-budget chunking for translation prompts.
+Chunk lớn nhất có thể mà prompt + bản dịch (ước lượng theo tỉ lệ nở) vẫn vừa context window của model:
+ít lượt gọi nhất, không bị cắt cụt. Paragraph quá dài được tách theo câu.
+"""
+import math
+import re
+
+from app.config import TRANSLATE_MAX_CHUNK_TOKENS
+
+# Chỉ dùng phần này của context (ước lượng token có sai số)
+_CONTEXT_SAFETY = 0.85
+# Lời dặn + tiêu đề + nhãn "Phần i/n" của prompt dịch
+PROMPT_OVERHEAD_TOKENS = 400
+_MIN_CHUNK_TOKENS = 256
+
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?…])[\"'”’)\]]*\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count without a tokenizer: ~4 ASCII chars per token (English), while accented /
+    non-Latin chars (tiếng Việt có dấu) cost about 1.5 chars per token on BPE vocabularies.
+    """
+    if not text:
+        return 0
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return math.ceil((len(text) - non_ascii) / 4 + non_ascii / 1.5)
+
+
+def chunk_token_budget(context_tokens: int, expansion: float, overhead: int = PROMPT_OVERHEAD_TOKENS) -> int:
+    """
+    Max input tokens per chunk: input + expansion × input (output) + overhead ≤ safe part of the context,
+    capped at TRANSLATE_MAX_CHUNK_TOKENS (giữ vài chunk để dịch song song; 0 = không giới hạn).
+    """
+    budget = int((context_tokens * _CONTEXT_SAFETY - overhead) / (1 + expansion))
+    if TRANSLATE_MAX_CHUNK_TOKENS > 0:
+        budget = min(budget, TRANSLATE_MAX_CHUNK_TOKENS)
+    return max(_MIN_CHUNK_TOKENS, budget)
+
+
+def _split_words(text: str, max_tokens: int) -> list[str]:
+    pieces: list[str] = []
+    current: list[str] = []
+    used = 0
+    # "Từ" dài hơn cả ngân sách (URL, chuỗi base64...): cắt cứng theo ký tự
+    step = max_tokens * 2
+    words: list[str] = []
+    for word in text.split():
+        if estimate_tokens(word) > max_tokens:
+            words.extend(word[i:i + step] for i in range(0, len(word), step))
+        else:
+            words.append(word)
+    for word in words:
+        cost = estimate_tokens(word) + 1
+        if current and used + cost > max_tokens:
+            pieces.append(" ".join(current))
+            current, used = [], 0
+        current.append(word)
+        used += cost
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def _split_paragraph(paragraph: str, max_tokens: int) -> list[str]:
+    """Oversized paragraph → pieces of whole sentences (câu vẫn quá dài thì tách theo từ)."""
+    pieces: list[str] = []
+    current: list[str] = []
+    used = 0
+    for sentence in (s.strip() for s in _SENTENCE_END_RE.split(paragraph)):
+        if not sentence:
+            continue
+        cost = estimate_tokens(sentence) + 1
+        if cost > max_tokens:
+            if current:
+                pieces.append(" ".join(current))
+                current, used = [], 0
+            pieces.extend(_split_words(sentence, max_tokens))
+            continue
+        if current and used + cost > max_tokens:
+            pieces.append(" ".join(current))
+            current, used = [], 0
+        current.append(sentence)
+        used += cost
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def chunk_by_tokens(text: str, max_tokens: int) -> list[str]:
+    """
+    Chia text thành chunk ≤ max_tokens (ước lượng), theo paragraph (\\n\\n); paragraph vượt ngân sách
+    được tách theo câu thành nhiều paragraph nhỏ. Trả về [] cho text rỗng.
+    """
+    if not text or not text.strip():
+        return []
+    if estimate_tokens(text) <= max_tokens:
+        return [text.strip()]
+
+    units: list[str] = []
+    for p in (p.strip() for p in text.split("\n\n")):
+        if not p:
+            continue
+        units.extend([p] if estimate_tokens(p) <= max_tokens else _split_paragraph(p, max_tokens))
+
+    chunks: list[str] = []
+    current: list[str] = []
+    used = 0
+    for unit in units:
+        cost = estimate_tokens(unit) + (1 if current else 0)  # "\n\n"
+        if current and used + cost > max_tokens:
+            chunks.append("\n\n".join(current))
+            current, used = [], 0
+            cost = estimate_tokens(unit)
+        current.append(unit)
+        used += cost
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
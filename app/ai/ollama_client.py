@@ -0,0 +1,286 @@
+"""
+Shared Ollama client: one pooled connection set for all translation threads, with an AIMD
+concurrency limit (tăng dần khi backend theo kịp, giảm một nửa khi lỗi hoặc latency tăng vọt).
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+from ollama import Client
+
+from app.config import (
+    OLLAMA_BASE_URL,
+    OLLAMA_MODEL,
+    OLLAMA_TIMEOUT,
+    OLLAMA_MIN_CONCURRENCY,
+    OLLAMA_MAX_CONCURRENCY,
+    OLLAMA_INITIAL_CONCURRENCY,
+    OLLAMA_LATENCY_TOLERANCE,
+    OLLAMA_NUM_CTX,
+    OLLAMA_STREAM,
+)
+from .chunking import estimate_tokens
+
+_client: Optional[Client] = None
+_client_lock = threading.Lock()
+_context: Optional[int] = None
+
+
+def get_client() -> Client:
+    """Process-wide Client (httpx pool sized to OLLAMA_MAX_CONCURRENCY, keep-alive)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = Client(
+                host=OLLAMA_BASE_URL,
+                timeout=OLLAMA_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=OLLAMA_MAX_CONCURRENCY,
+                    max_keepalive_connections=OLLAMA_MAX_CONCURRENCY,
+                ),
+            )
+        return _client
+
+
+def context_window() -> int:
+    """
+    Context tokens per request: OLLAMA_NUM_CTX, capped at the model's trained context_length
+    when /api/show reports one (hỏi một lần mỗi process).
+    """
+    global _context
+    if _context is None:
+        limit = OLLAMA_NUM_CTX
+        try:
+            info = get_client().show(OLLAMA_MODEL).modelinfo or {}
+            trained = next((int(v) for k, v in info.items() if k.endswith(".context_length")), 0)
+            if trained:
+                limit = min(limit, trained)
+        except Exception as e:
+            print(f"[Ollama] Could not read context length of {OLLAMA_MODEL}: {e}. Using {limit}.")
+        _context = limit
+    return _context
+
+
+# Nhóm output theo cỡ: < _BUCKET_CHARS, rồi mỗi nhóm gấp đôi
+_BUCKET_CHARS = 256
+
+
+class AdaptiveLimiter:
+    """
+    AIMD limit on in-flight requests.
+    Thành công với latency bình thường: limit += 1/limit (≈ +1 sau mỗi "vòng" limit request).
+    Lỗi, hoặc latency chuẩn hoá > OLLAMA_LATENCY_TOLERANCE × mức thấp nhất gần đây của các response
+    cùng cỡ: limit giảm một nửa (tối đa một lần mỗi vòng, tránh sập về min vì một loạt request cùng chậm).
+    Thời gian sinh tăng theo độ dài output, nên latency được chuẩn hoá theo output (giây / (1 + kB output))
+    và chỉ so với baseline của nhóm output cùng cỡ (mỗi nhóm gấp đôi nhóm trước): chunk dài không bị
+    so với câu ngắn và tính là nghẽn.
+    """
+
+    def __init__(self, initial: int = OLLAMA_INITIAL_CONCURRENCY, minimum: int = OLLAMA_MIN_CONCURRENCY,
+                 maximum: int = OLLAMA_MAX_CONCURRENCY, tolerance: float = OLLAMA_LATENCY_TOLERANCE):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(self.maximum, max(self.minimum, initial)))
+        self.tolerance = tolerance
+        self.in_flight = 0
+        self.peak_limit = self.limit
+        self.decreases = 0
+        self._recent: Dict[int, deque] = {}  # nhóm cỡ output -> latency chuẩn hoá gần đây
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def slot(self):
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self.in_flight -= 1
+                self._cond.notify_all()
+
+    def record(self, ok: bool, latency: float, output_chars: int) -> None:
+        normalized = latency / (1 + output_chars / 1000)
+        with self._cond:
+            congested = False
+            if ok:
+                recent = self._recent.setdefault((output_chars // _BUCKET_CHARS).bit_length(), deque(maxlen=50))
+                baseline = min(recent) if recent else normalized
+                recent.append(normalized)
+                congested = normalized > self.tolerance * baseline
+            now = time.monotonic()
+            if not ok or congested:
+                # Giảm tối đa một lần mỗi khoảng latency hiện tại (một "vòng")
+                if now - self._last_decrease >= latency:
+                    self.limit = max(float(self.minimum), self.limit / 2)
+                    self._last_decrease = now
+                    self.decreases += 1
+            else:
+                self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+                self.peak_limit = max(self.peak_limit, self.limit)
+            self._cond.notify_all()
+
+
+class OllamaStats:
+    """Counters for throughput reporting (chunks/s = successful calls / wall time of a run)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.prompt_chars = 0
+        self.output_chars = 0
+        self.stopped = {"commentary": 0, "repetition": 0, "length": 0}
+
+    def record(self, ok: bool, seconds: float, prompt_chars: int, output_chars: int,
+               stop: Optional[str] = None) -> None:
+        with self._lock:
+            if ok:
+                self.calls += 1
+            else:
+                self.errors += 1
+            self.busy_seconds += seconds
+            self.prompt_chars += prompt_chars
+            self.output_chars += output_chars
+            if stop in self.stopped:
+                self.stopped[stop] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "errors": self.errors,
+                "busy_seconds": self.busy_seconds,
+                "prompt_chars": self.prompt_chars,
+                "output_chars": self.output_chars,
+                "stopped": dict(self.stopped),
+            }
+
+
+limiter = AdaptiveLimiter()
+stats = OllamaStats()
+
+
+# Output bị cắt giữa chừng: không phải bản dịch đầy đủ
+_FAILED_STOPS = ("length", "repetition")
+# Thử lại sau vòng lặp: phạt lặp mạnh hơn và sampling khác (mặc định Ollama: 1.1 / 0.8)
+_RESAMPLE_OPTIONS = {"repeat_penalty": 1.3, "temperature": 1.0}
+
+
+def _stream_chat(client: Client, prompt: str, format: Optional[str], options: dict,
+                 monitor: Optional[Callable[[str], Optional[Tuple[int, str]]]]) -> Tuple[str, Optional[str]]:
+    """
+    Stream one response. monitor(text so far) → (cut, reason) dừng sinh ngay: đóng stream (Ollama hủy
+    generation khi client ngắt kết nối) và trả text[:cut]. Returns (text, stop reason or None).
+    """
+    parts: List[str] = []
+    text = ""
+    stream = client.chat(
+        model=OLLAMA_MODEL,
+        messages=[{'role': 'user', 'content': prompt}],
+        format=format,
+        options=options,
+        stream=True,
+    )
+    try:
+        for chunk in stream:
+            parts.append(chunk.message.content or "")
+            if chunk.done:
+                text = "".join(parts)
+                return text, "length" if chunk.done_reason == "length" else None
+            if monitor is not None:
+                text = "".join(parts)
+                stop = monitor(text)
+                if stop is not None:
+                    return text[:stop[0]], stop[1]
+        return "".join(parts), None
+    finally:
+        stream.close()
+
+
+def chat_with_stop(prompt: str, max_retries: int = 2, format: Optional[str] = None,
+                   max_output_tokens: Optional[int] = None,
+                   monitor: Optional[Callable[[], Callable[[str], Optional[Tuple[int, str]]]]] = None,
+                   ) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Gửi prompt tới Ollama qua client dùng chung (trong giới hạn AIMD). Retry khi lỗi tạm thời.
+    format="json": model bị ràng buộc trả về JSON hợp lệ. max_output_tokens: num_predict.
+    monitor: factory of a per-attempt check on the streamed text (xem output_guard.OutputMonitor);
+    với OLLAMA_STREAM=false phản hồi không được stream và monitor bị bỏ qua.
+    Output bị cắt vì "length" (num_predict / hết context) hoặc "repetition" là bản dịch hỏng và chỉ
+    được thử lại một lần với điều kiện khác: "length" với num_predict gấp đôi (trong phần context còn
+    lại), "repetition" với repeat_penalty / temperature cao hơn; không đổi được thì thất bại ngay.
+    Returns (text, stop reason): reason là "commentary" khi phần bình luận cuối đã bị cắt bỏ,
+    None khi model kết thúc bình thường; (None, None) nếu mọi lần thử đều hỏng.
+    """
+    client = get_client()
+    num_ctx = context_window()
+    options = {"num_ctx": num_ctx}
+    if max_output_tokens:
+        options["num_predict"] = max_output_tokens
+    remedied = set()  # lý do dừng đã thử lại một lần
+    last_error = None
+    for attempt in range(max_retries + 1):
+        with limiter.slot():
+            started = time.perf_counter()
+            try:
+                if OLLAMA_STREAM:
+                    out, stop = _stream_chat(client, prompt, format, options, monitor() if monitor else None)
+                else:
+                    response = client.chat(
+                        model=OLLAMA_MODEL,
+                        messages=[{'role': 'user', 'content': prompt}],
+                        format=format,
+                        options=options,
+                    )
+                    out = response.message.content or ""
+                    stop = "length" if response.done_reason == "length" else None
+                out = out.strip()
+            except Exception as e:
+                elapsed = time.perf_counter() - started
+                limiter.record(False, elapsed, 0)
+                stats.record(False, elapsed, len(prompt), 0)
+                last_error = e
+                if attempt < max_retries:
+                    print(f"[Ollama] Attempt {attempt + 1} failed: {e}. Retrying...")
+                continue
+        elapsed = time.perf_counter() - started
+        # Backend vẫn phục vụ bình thường: không giảm limit vì output hỏng
+        limiter.record(True, elapsed, len(out))
+        stats.record(True, elapsed, len(prompt), len(out), stop)
+        if stop:
+            print(f"[Ollama] Output stopped early ({stop}) after {len(out)} chars, {elapsed:.1f}s.")
+        if stop in _FAILED_STOPS:
+            last_error = f"output stopped ({stop})"
+            if attempt >= max_retries or stop in remedied:
+                break
+            if stop == "length":
+                # Hết context thì num_predict lớn hơn cũng không giúp được
+                room = num_ctx - estimate_tokens(prompt)
+                grown = min(options.get("num_predict", room) * 2, room)
+                if grown <= options.get("num_predict", room):
+                    break
+                change = {"num_predict": grown}
+            else:
+                change = _RESAMPLE_OPTIONS
+            options.update(change)
+            remedied.add(stop)
+            print(f"[Ollama] Attempt {attempt + 1} failed: {last_error}. Retrying with {change}...")
+            continue
+        return (out, stop) if out else (None, None)
+    print(f"[Ollama] Error after {attempt + 1} attempts: {last_error}")
+    return None, None
+
+
+def chat(prompt: str, max_retries: int = 2, format: Optional[str] = None,
+         max_output_tokens: Optional[int] = None,
+         monitor: Optional[Callable[[], Callable[[str], Optional[Tuple[int, str]]]]] = None) -> Optional[str]:
+    """chat_with_stop without the stop reason: the response text, or None."""
+    return chat_with_stop(prompt, max_retries, format, max_output_tokens, monitor)[0]
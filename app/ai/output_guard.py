@@ -0,0 +1,114 @@
+"""
+Incremental checks on a streaming model response: dừng sinh token ngay khi model bắt đầu bình luận
+("Could you clarify…") hoặc rơi vào vòng lặp, thay vì chờ sinh hết rồi mới cắt bỏ.
+"""
+import re
+from typing import List, Optional, Tuple
+
+from app.config import TRANSLATE_MAX_OUTPUT_RATIO
+from .chunking import estimate_tokens
+
+# Đoạn văn khớp một marker = model đang bình luận / hỏi lại chứ không dịch (từ đó đến hết bị bỏ)
+COMMENTARY_MARKERS = [
+    r"it\s+seems\s+(the\s+)?text\s+you\s+provided",
+    r"it\s+seems\s+like\s+you",
+    r"could\s+you\s+clarify",
+    r"clarify\s+what\s+you\s+need",
+    r"if\s+you['’]d\s+like\s*,\s*i\s+can\s*:",
+    r"let\s+me\s+know\s*!",
+    r"dường\s+như\s+bạn\s+đang\s+cố\s+gắng",
+    r"hãy\s+cho\s+mình\s+biết\s+thêm\s+nhé",
+    r"^\s*##\s+Ví dụ\s*$",
+    r"cryptocurrency\s+holdings",
+    r"listing\s+cryptocurrency",
+    r"^\s*##\s*Phân\s+trích\s+số\s+liệu",
+    r"phân\s+trích\s+số\s+liệu",
+    r"dãy\s+số\s+có\s+vẻ",
+    r"repeated\s+[\"']?D[\"']?\s+character",
+    r"message\s+consisting\s+of\s+repeated",
+    r"Đề\s+bài\s*:\s*Người\s+dùng",
+]
+_MARKER_RES = [re.compile(m, re.IGNORECASE) for m in COMMENTARY_MARKERS]
+
+# Vòng lặp: đuôi output là một đoạn (chu kỳ ≤ _MAX_PERIOD ký tự) lặp liên tiếp, dài tổng ≥ _MIN_RUN ký tự
+_MAX_PERIOD = 200
+_MIN_RUN = 300
+_MIN_REPEATS = 3
+# Kiểm tra mỗi khi output dài thêm chừng này ký tự
+_CHECK_EVERY = 160
+# Ngân sách output tối thiểu (token) cho prompt ngắn
+_MIN_OUTPUT_TOKENS = 256
+
+
+def is_commentary(paragraph: str) -> bool:
+    p = paragraph.strip()
+    if not p:
+        return False
+    first_line = (p.split("\n")[0] or "").strip()
+    return any(r.search(p) or r.search(first_line) for r in _MARKER_RES)
+
+
+def max_output_tokens(prompt: str) -> int:
+    """num_predict for a prompt: TRANSLATE_MAX_OUTPUT_RATIO × prompt tokens (bản dịch dài hơn thế = đang chạy vòng)."""
+    return max(_MIN_OUTPUT_TOKENS, int(estimate_tokens(prompt) * TRANSLATE_MAX_OUTPUT_RATIO))
+
+
+def runaway_cut(text: str) -> Optional[int]:
+    """
+    If text ends in a loop (một đoạn ngắn lặp lại liên tục), the offset just after its first
+    occurrence; otherwise None.
+    """
+    tail = text[-(_MAX_PERIOD * _MIN_REPEATS + _MIN_RUN):]
+    for period in range(1, _MAX_PERIOD + 1):
+        unit = tail[-period:]
+        if len(unit) < period:
+            break
+        repeats = 1
+        while (repeats + 1) * period <= len(tail) and tail[-(repeats + 1) * period:-repeats * period] == unit:
+            repeats += 1
+        if repeats >= _MIN_REPEATS and repeats * period >= _MIN_RUN:
+            return len(text) - repeats * period + period
+    return None
+
+
+class OutputMonitor:
+    """
+    Stateful check for one streaming response; call with the text generated so far.
+    Returns (cut offset, reason) once generation should stop, else None.
+    commentary=False for structured (JSON) output, where only loops are checked.
+    """
+
+    def __init__(self, commentary: bool = True):
+        self.commentary = commentary
+        self._starts: List[int] = [0]  # offset đầu mỗi paragraph đã thấy
+        self._scan = 0
+        self._checked = 0  # số paragraph hoàn chỉnh đã kiểm tra
+        self._next_check = _CHECK_EVERY
+
+    def __call__(self, text: str) -> Optional[Tuple[int, str]]:
+        if len(text) < self._next_check:
+            return None
+        self._next_check = len(text) + _CHECK_EVERY
+
+        while (i := text.find("\n\n", self._scan)) >= 0:
+            self._starts.append(i + 2)
+            self._scan = i + 2
+        self._scan = max(self._scan, len(text) - 1)  # "\n" cuối có thể là nửa đầu của "\n\n"
+
+        # Paragraph hoàn chỉnh mới: bình luận (khi đã có bản dịch phía trước) hoặc lặp nguyên đoạn
+        complete = len(self._starts) - 1
+        for k in range(self._checked, complete):
+            start, end = self._starts[k], self._starts[k + 1]
+            paragraph = text[start:end].strip()
+            if self.commentary and k > 0 and text[:start].strip() and is_commentary(paragraph):
+                return start, "commentary"
+            if k >= 2 and paragraph and len(paragraph) >= 20 and all(
+                text[self._starts[j]:self._starts[j + 1]].strip() == paragraph for j in (k - 1, k - 2)
+            ):
+                return self._starts[k - 1], "repetition"
+        self._checked = complete
+
+        cut = runaway_cut(text)
+        if cut is not None:
+            return cut, "repetition"
+        return None
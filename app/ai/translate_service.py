@@ -1,35 +1,63 @@
 """Translation and formatting service using Ollama."""
-import re
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional
-from ollama import Client
+from typing import Any, Callable, Optional
 
-from app.config import OLLAMA_BASE_URL, OLLAMA_MODEL, ENABLE_TRANSLATION
+from app.config import OLLAMA_MODEL, ENABLE_TRANSLATION, TRANSLATE_CHUNK_CONCURRENCY, TRANSLATE_EXPANSION_RATIO
+from . import ollama_client
+from .chunking import chunk_by_tokens, chunk_token_budget
+from .output_guard import OutputMonitor, is_commentary, max_output_tokens
+from .translation_memory import PARAGRAPH, SHORT, get_translation_memory
 
 # Chỉ chạy step 2 (format) khi bản dịch đủ dài; dưới ngưỡng này giữ nguyên bản dịch thô
 MIN_LENGTH_FOR_FORMAT = 400
-# Chunking: mỗi chunk tối đa bao nhiêu ký tự để phù hợp context qwen3:8b
-MAX_CHARS_PER_CHUNK = 3500
-
-
-def _call_ollama(prompt: str, max_retries: int = 2) -> Optional[str]:
-    """Gửi prompt tới Ollama và trả về nội dung phản hồi. Retry khi lỗi tạm thời."""
-    client = Client(host=OLLAMA_BASE_URL)
-    last_error = None
-    for attempt in range(max_retries + 1):
-        try:
-            response = client.chat(
-                model=OLLAMA_MODEL,
-                messages=[{'role': 'user', 'content': prompt}],
-            )
-            out = (response.message.content or "").strip()
-            return out if out else None
-        except Exception as e:
-            last_error = e
-            if attempt < max_retries:
-                print(f"[Ollama] Attempt {attempt + 1} failed: {e}. Retrying...")
-    print(f"[Ollama] Error after {max_retries + 1} attempts: {last_error}")
-    return None
+# Format giữ nguyên tiếng Việt, chỉ thêm markdown: bản format dài hơn input không nhiều
+FORMAT_EXPANSION_RATIO = 1.2
+
+
+def _call_ollama_with_stop(prompt: str, max_retries: int = 2,
+                           format: Optional[str] = None) -> tuple[Optional[str], Optional[str]]:
+    """
+    Gửi prompt tới Ollama (client dùng chung, giới hạn đồng thời AIMD); trả về (nội dung, lý do dừng sớm).
+    Phản hồi được stream: dừng sớm khi model bắt đầu bình luận hoặc lặp vòng; số token output
+    tối đa tính theo độ dài prompt. Output bị cắt cụt / lặp vòng được thử lại, hết lượt thì None.
+    """
+    return ollama_client.chat_with_stop(
+        prompt,
+        max_retries=max_retries,
+        format=format,
+        max_output_tokens=max_output_tokens(prompt),
+        monitor=lambda: OutputMonitor(commentary=format is None),
+    )
+
+
+def _call_ollama(prompt: str, max_retries: int = 2, format: Optional[str] = None) -> Optional[str]:
+    """Gửi prompt tới Ollama và trả về nội dung phản hồi (None nếu lỗi hoặc output hỏng)."""
+    return _call_ollama_with_stop(prompt, max_retries, format)[0]
+
+
+def _call_ollama_timed(prompt: str, format: Optional[str] = None) -> tuple[Optional[str], float, bool]:
+    """
+    _call_ollama kèm thời gian gọi (giây), để translation memory biết bản dịch đáng giá bao nhiêu,
+    và cờ stopped: output đã bị dừng sớm/cắt bớt, không được lưu vào translation memory.
+    """
+    started = time.perf_counter()
+    out, stop = _call_ollama_with_stop(prompt, format=format)
+    return out, time.perf_counter() - started, stop is not None
+
+
+def _call_ollama_many(prompts: list[str], call: Callable[[str], Any] = _call_ollama) -> list:
+    """
+    Gửi các prompt độc lập (các chunk của một bài) đồng thời, tối đa TRANSLATE_CHUNK_CONCURRENCY
+    request mỗi bài; kết quả giữ đúng thứ tự prompt. Tổng request tới Ollama vẫn do limiter AIMD chặn.
+    """
+    workers = min(len(prompts), max(1, TRANSLATE_CHUNK_CONCURRENCY))
+    if workers <= 1:
+        return [call(prompt) for prompt in prompts]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="translate-chunk") as pool:
+        return list(pool.map(call, prompts))
 
 
 def _strip_model_commentary(text: str) -> str:
@@ -40,88 +68,38 @@ def _strip_model_commentary(text: str) -> str:
     """
     if not text or len(text.strip()) < 50:
         return text
-    markers = [
-        r"it\s+seems\s+(the\s+)?text\s+you\s+provided",
-        r"it\s+seems\s+like\s+you",
-        r"could\s+you\s+clarify",
-        r"clarify\s+what\s+you\s+need",
-        r"if\s+you['\u2019]d\s+like\s*,\s*i\s+can\s*:",
-        r"let\s+me\s+know\s*!",
-        r"dường\s+như\s+bạn\s+đang\s+cố\s+gắng",
-        r"hãy\s+cho\s+mình\s+biết\s+thêm\s+nhé",
-        r"^\s*##\s+Ví dụ\s*$",
-        r"cryptocurrency\s+holdings",
-        r"listing\s+cryptocurrency",
-        r"^\s*##\s*Phân\s+trích\s+số\s+liệu",
-        r"phân\s+trích\s+số\s+liệu",
-        r"dãy\s+số\s+có\s+vẻ",
-        r"repeated\s+[\"']?D[\"']?\s+character",
-        r"message\s+consisting\s+of\s+repeated",
-        r"Đề\s+bài\s*:\s*Người\s+dùng",
-    ]
     paragraphs = text.split("\n\n")
     keep: list[str] = []
     for p in paragraphs:
-        p_stripped = p.strip()
-        if not p_stripped:
-            keep.append(p)
-            continue
-        p_lower = p_stripped.lower()
-        p_first_line = (p_stripped.split("\n")[0] or "").strip().lower()
-        found = False
-        for m in markers:
-            if re.search(m, p_lower, re.IGNORECASE) or re.search(m, p_first_line, re.IGNORECASE):
-                found = True
-                break
-        if found:
+        if is_commentary(p):
             break
         keep.append(p)
     return "\n\n".join(keep).strip() or text
 
 
-def _chunk_by_paragraphs(text: str, max_chars: int = MAX_CHARS_PER_CHUNK) -> list[str]:
-    """
-    Chia nội dung theo đoạn (paragraph). Mỗi chunk = một hoặc nhiều đoạn, không vượt max_chars.
-    Đoạn được xác định bởi \\n\\n (hai xuống dòng).
-    """
-    if not text or len(text.strip()) <= max_chars:
-        return [text.strip()] if text and text.strip() else []
-
-    paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
-    if not paragraphs:
-        return [text[:max_chars]] if text else []
-
-    chunks: list[str] = []
-    current: list[str] = []
-    current_len = 0
-    sep_len = 2  # "\n\n"
-
-    for p in paragraphs:
-        p_len = len(p) + (sep_len if current else 0)
-        if current_len + p_len > max_chars and current:
-            chunks.append("\n\n".join(current))
-            current = [p]
-            current_len = len(p)
-        else:
-            current.append(p)
-            current_len += p_len
-
-    if current:
-        chunks.append("\n\n".join(current))
-    return chunks
+def _chunk_budget(expansion: float) -> int:
+    """Input tokens per chunk for the configured model's context window."""
+    return chunk_token_budget(ollama_client.context_window(), expansion)
 
 
 def translate_short_text(text: str) -> Optional[str]:
     """
     Translate a short text (e.g. title or summary) to Vietnamese.
-    Single prompt, no chunking. Keeps proper nouns.
+    Single prompt, no chunking. Keeps proper nouns. Reuses the translation memory.
     """
     if not text or not text.strip():
         return None
+    memory = get_translation_memory()
+    known = memory.get(text, SHORT) if memory else None
+    if known is not None:
+        return known
     prompt = f"""Dịch sang tiếng Việt. Giữ nguyên tên riêng, địa danh, tên công ty. Chỉ trả về bản dịch, không giải thích.
 
 {text.strip()}"""
-    return _call_ollama(prompt)
+    out, seconds, stopped = _call_ollama_timed(prompt)
+    if out and memory and not stopped:
+        memory.put(text, out, seconds, SHORT)
+    return out
 
 
 def translate_title_and_summary(title: str, summary: Optional[str] = None) -> tuple[Optional[str], Optional[str]]:
@@ -136,52 +114,179 @@ def translate_title_and_summary(title: str, summary: Optional[str] = None) -> tu
     return (title_vn, summary_vn)
 
 
+def _split_by_memory(content: str, memory) -> list:
+    """
+    Paragraph của content theo thứ tự, gom thành các đoạn liên tiếp: str = bản dịch có sẵn trong
+    translation memory, list[str] = các paragraph liền nhau cần dịch.
+    """
+    paragraphs = [p.strip() for p in content.split("\n\n") if p.strip()]
+    known = memory.get_many(paragraphs, PARAGRAPH) if memory else {}
+    segments: list = []
+    for p in paragraphs:
+        if p in known:
+            segments.append(known[p])
+        elif segments and isinstance(segments[-1], list):
+            segments[-1].append(p)
+        else:
+            segments.append([p])
+    return segments
+
+
+def _remember_paragraphs(memory, chunk: str, translated: str, seconds: float) -> None:
+    """Lưu bản dịch từng paragraph khi model giữ đúng số paragraph (khớp 1-1 với nguồn)."""
+    sources = [p.strip() for p in chunk.split("\n\n") if p.strip()]
+    targets = [p.strip() for p in translated.split("\n\n") if p.strip()]
+    if len(sources) != len(targets):
+        return
+    total = sum(len(p) for p in sources) or 1
+    memory.put_many(
+        ((src, dst, seconds * len(src) / total) for src, dst in zip(sources, targets)), PARAGRAPH
+    )
+
+
+BATCH_PROMPT = """Dịch tiêu đề (title) và tóm tắt (summary) của các bài viết sau sang tiếng Việt. Giữ nguyên tên riêng, địa danh, tên công ty.
+Trả về DUY NHẤT một JSON object: key là "id" của từng bài, value là object chỉ gồm đúng các trường có trong bài đó ("title", "summary") với nội dung đã dịch.
+Không bỏ sót bài nào, không thêm trường khác, không giải thích.
+
+Bài viết (JSON):
+"""
+
+
+def _parse_batch(out: Optional[str], expected: dict[str, dict]) -> dict[str, dict]:
+    """
+    Bản dịch hợp lệ trong phản hồi JSON của một batch: {id: {field: text}}.
+    Bài thiếu, sai kiểu hoặc thiếu trường bị loại (sẽ dịch lại từng bài).
+    """
+    try:
+        data = json.loads(out or "")
+    except ValueError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    valid: dict[str, dict] = {}
+    for item_id, fields in expected.items():
+        got = data.get(item_id)
+        if not isinstance(got, dict):
+            continue
+        texts = {f: got.get(f) for f in fields}
+        if all(isinstance(t, str) and t.strip() for t in texts.values()):
+            valid[item_id] = {f: t.strip() for f, t in texts.items()}
+    return valid
+
+
+def translate_titles_and_summaries(
+    items: list[tuple[str, Optional[str]]],
+) -> list[tuple[Optional[str], Optional[str]]]:
+    """
+    Batched translate_title_and_summary: (title, summary) của nhiều bài trong MỘT lượt gọi Ollama
+    (JSON theo id bài). Text đã có trong translation memory không gửi; bài nào phản hồi thiếu/hỏng
+    thì dịch lại riêng bằng translate_title_and_summary. Trả về [(title_vn, summary_vn)] cùng thứ tự.
+    """
+    if not ENABLE_TRANSLATION:
+        return [(None, None) for _ in items]
+    memory = get_translation_memory()
+    texts = [t for title, summary in items for t in (title, summary) if t]
+    known = memory.get_many(texts, SHORT) if memory else {}
+    results: list[dict] = []
+    pending: dict[str, dict] = {}  # id -> {field: source text}
+    for i, (title, summary) in enumerate(items):
+        fields = {"title": title, "summary": summary}
+        done = {f: known.get(t) for f, t in fields.items() if t and known.get(t)}
+        results.append(done)
+        todo = {f: t for f, t in fields.items() if t and f not in done}
+        if todo:
+            pending[str(i + 1)] = todo
+
+    if pending:
+        payload = [{"id": item_id, **fields} for item_id, fields in pending.items()]
+        out, seconds, stopped = _call_ollama_timed(
+            BATCH_PROMPT + json.dumps(payload, ensure_ascii=False), format="json"
+        )
+        valid = _parse_batch(out, pending)
+        share = seconds / max(1, sum(len(f) for f in pending.values()))
+        for item_id, fields in pending.items():
+            i = int(item_id) - 1
+            if item_id in valid:
+                results[i].update(valid[item_id])
+                if memory and not stopped:
+                    for f, text in valid[item_id].items():
+                        memory.put(fields[f], text, share, SHORT)
+                continue
+            # Fallback từng bài
+            title_vn, summary_vn = translate_title_and_summary(fields.get("title"), fields.get("summary"))
+            results[i].update({k: v for k, v in (("title", title_vn), ("summary", summary_vn)) if v})
+        if len(valid) < len(pending):
+            print(f"[Translate] Batch: {len(pending) - len(valid)}/{len(pending)} items fell back to single calls.")
+    return [(r.get("title"), r.get("summary")) for r in results]
+
+
 def translate_to_vietnamese(content: str, title: str = "") -> Optional[str]:
     """
     Bước 1: Dịch 100% sang tiếng Việt (giữ tên riêng, địa danh, tên công ty).
-    Nội dung dài được chia theo paragraph, dịch từng chunk rồi nối lại.
+    Paragraph đã có trong translation memory không gửi lại; phần còn lại được chia chunk,
+    các chunk được dịch song song rồi nối lại đúng thứ tự.
     """
     if not content:
         return None
 
-    chunks = _chunk_by_paragraphs(content, MAX_CHARS_PER_CHUNK)
+    memory = get_translation_memory()
+    segments = _split_by_memory(content, memory)
+    # (vị trí segment, chunk) cho mọi chunk cần dịch
+    budget = _chunk_budget(TRANSLATE_EXPANSION_RATIO)
+    jobs = [
+        (i, chunk)
+        for i, segment in enumerate(segments) if isinstance(segment, list)
+        for chunk in chunk_by_tokens("\n\n".join(segment), budget)
+    ]
+    if not jobs:
+        return "\n\n".join(segments) or None
     # Instruction to prevent model from adding commentary, questions, or suggestions
     _only_output = "Chỉ trả về đúng bản dịch, không giải thích, không bình luận, không hỏi lại, không gợi ý (summary/format/clarify). Nếu nội dung lặp hoặc dài, vẫn chỉ xuất bản dịch."
 
-    if len(chunks) == 1:
-        prompt = f"""Dịch toàn bộ nội dung sau sang tiếng Việt. Giữ nguyên tên riêng, địa danh, tên công ty. {_only_output}
+    num_chunks = len(jobs)
+    if num_chunks == 1:
+        prompts = [f"""Dịch toàn bộ nội dung sau sang tiếng Việt. Giữ nguyên tên riêng, địa danh, tên công ty. {_only_output}
 
 Tiêu đề: {title}
 
 Nội dung:
-{chunks[0]}"""
-        out = _call_ollama(prompt)
-        return _strip_model_commentary(out) if out else None
-
-    # Nhiều chunk: dịch lần lượt, chunk đầu kèm title
-    num_chunks = len(chunks)
-    print(f"[Translate] Long content: splitting into {num_chunks} paragraph chunks (max {MAX_CHARS_PER_CHUNK} chars each).")
-    translated_parts: list[str] = []
-    for i, chunk in enumerate(chunks):
-        part_label = f"Phần {i + 1}/{num_chunks}"
-        if i == 0:
-            prompt = f"""Đây là {part_label} của một bài viết. Nhiệm vụ: DỊCH toàn bộ nội dung dưới đây từ tiếng Anh sang tiếng Việt. Đây là đoạn văn nguồn cần dịch, KHÔNG phải câu hỏi của người dùng, KHÔNG phải dữ liệu cần phân tích. Giữ nguyên tên riêng, địa danh, tên công ty. {_only_output}
+{jobs[0][1]}"""]
+    else:
+        # Nhiều chunk: dịch song song (TRANSLATE_CHUNK_CONCURRENCY), mỗi chunk đều kèm title làm ngữ cảnh
+        print(f"[Translate] Long content: splitting into {num_chunks} chunks (max ~{budget} tokens each).")
+        prompts = []
+        for i, (_, chunk) in enumerate(jobs):
+            part_label = f"Phần {i + 1}/{num_chunks}"
+            if i == 0:
+                prompt = f"""Đây là {part_label} của một bài viết. Nhiệm vụ: DỊCH toàn bộ nội dung dưới đây từ tiếng Anh sang tiếng Việt. Đây là đoạn văn nguồn cần dịch, KHÔNG phải câu hỏi của người dùng, KHÔNG phải dữ liệu cần phân tích. Giữ nguyên tên riêng, địa danh, tên công ty. {_only_output}
 
 Tiêu đề: {title}
 
 Nội dung cần dịch:
 {chunk}"""
-        else:
-            prompt = f"""Đây là {part_label} của cùng một bài viết. Nhiệm vụ: DỊCH tiếp nội dung dưới đây từ tiếng Anh sang tiếng Việt. Đây là đoạn văn nguồn (ví dụ: tin tức, bảng số liệu, danh sách) — chỉ cần dịch nguyên văn, KHÔNG giải thích, KHÔNG phân tích, KHÔNG trả lời như thể đây là câu hỏi. {_only_output}
+            else:
+                prompt = f"""Đây là {part_label} của cùng một bài viết. Nhiệm vụ: DỊCH tiếp nội dung dưới đây từ tiếng Anh sang tiếng Việt. Đây là đoạn văn nguồn (ví dụ: tin tức, bảng số liệu, danh sách) — chỉ cần dịch nguyên văn, KHÔNG giải thích, KHÔNG phân tích, KHÔNG trả lời như thể đây là câu hỏi. Giữ nguyên tên riêng, địa danh, tên công ty. {_only_output}
+
+Tiêu đề bài viết (chỉ để hiểu ngữ cảnh, không dịch lại): {title}
 
 Nội dung cần dịch:
 {chunk}"""
-        part = _call_ollama(prompt)
-        if part is None:
-            return None
-        translated_parts.append(_strip_model_commentary(part))
+            prompts.append(prompt)
 
-    return "\n\n".join(translated_parts)
+    results = _call_ollama_many(prompts, call=_call_ollama_timed)
+    if any(out is None for out, _, _ in results):
+        return None
+    translated: dict[int, list[str]] = {}
+    for (i, chunk), (out, seconds, stopped) in zip(jobs, results):
+        part = _strip_model_commentary(out)
+        translated.setdefault(i, []).append(part)
+        # Output dừng sớm (đã cắt phần bình luận): không chắc khớp từng đoạn, không lưu
+        if memory and not stopped:
+            _remember_paragraphs(memory, chunk, part, seconds)
+    return "\n\n".join(
+        segment if isinstance(segment, str) else "\n\n".join(translated[i])
+        for i, segment in enumerate(segments)
+    )
 
 
 FORMAT_INSTRUCTIONS = """Format lại nội dung tiếng Việt sau theo yêu cầu:
@@ -198,26 +303,26 @@ Nội dung:
 def format_vietnamese_content(content: str) -> Optional[str]:
     """
     Bước 2: Format nội dung tiếng Việt (đoạn văn, gạch đầu dòng, in đậm, tiêu đề phụ).
-    Nội dung dài được chia theo paragraph, format từng chunk rồi nối lại.
+    Nội dung dài được chia theo paragraph, các chunk được format song song rồi nối lại đúng thứ tự.
     """
     if not content:
         return None
 
-    chunks = _chunk_by_paragraphs(content, MAX_CHARS_PER_CHUNK)
+    budget = _chunk_budget(FORMAT_EXPANSION_RATIO)
+    chunks = chunk_by_tokens(content, budget)
     if len(chunks) == 1:
         out = _call_ollama(FORMAT_INSTRUCTIONS + chunks[0])
         return _strip_model_commentary(out) if out else None
 
     num_chunks = len(chunks)
-    print(f"[Format] Long content: splitting into {num_chunks} paragraph chunks (max {MAX_CHARS_PER_CHUNK} chars each).")
-    formatted_parts: list[str] = []
-    for i, chunk in enumerate(chunks):
-        part_label = f"[Phần {i + 1}/{num_chunks} của nội dung tiếng Việt, chỉ format đoạn này.]\n\n"
-        part = _call_ollama(FORMAT_INSTRUCTIONS + part_label + chunk)
-        if part is None:
-            return None
-        formatted_parts.append(_strip_model_commentary(part))
-    return "\n\n".join(formatted_parts)
+    print(f"[Format] Long content: splitting into {num_chunks} chunks (max ~{budget} tokens each).")
+    parts = _call_ollama_many([
+        FORMAT_INSTRUCTIONS + f"[Phần {i + 1}/{num_chunks} của nội dung tiếng Việt, chỉ format đoạn này.]\n\n" + chunk
+        for i, chunk in enumerate(chunks)
+    ])
+    if any(part is None for part in parts):
+        return None
+    return "\n\n".join(_strip_model_commentary(part) for part in parts)
 
 
 def translate_and_format(content: str, title: str = "") -> Optional[str]:
@@ -0,0 +1,194 @@
+"""
+Translation memory: bản dịch đã có của từng đoạn văn / text ngắn, theo hash(model, loại, text chuẩn hoá).
+Byline, disclaimer, đoạn mở đầu chuyên mục, tiêu đề lặp giữa các feed không phải gọi Ollama lại.
+LRU trong process phía trước collection Mongo TRANSLATION_MEMORY_COLLECTION.
+"""
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+
+from app.config import (
+    OLLAMA_MODEL,
+    TRANSLATION_MEMORY,
+    TRANSLATION_MEMORY_LRU_SIZE,
+    TRANSLATION_MEMORY_MAX_CHARS,
+)
+from app.database import get_translation_memory_collection
+
+_WS_RE = re.compile(r"\s+")
+
+# Loại bản dịch (prompt khác nhau → bản dịch khác nhau)
+PARAGRAPH = "paragraph"
+SHORT = "short"
+# Mongo lỗi: chỉ dùng LRU trong khoảng này (giây) rồi thử lại
+_STORE_RETRY_SECONDS = 300
+
+
+def normalize(text: str) -> str:
+    return _WS_RE.sub(" ", text).strip()
+
+
+def memory_key(text: str, kind: str, model: str = OLLAMA_MODEL) -> str:
+    return hashlib.sha256(f"{model}\0{kind}\0{normalize(text)}".encode("utf-8")).hexdigest()
+
+
+class TranslationMemory:
+    """
+    get_many: LRU trước, phần còn thiếu hỏi Mongo một lần ($in). put_many: ghi LRU + một bulk upsert.
+    kind (PARAGRAPH / SHORT) là bắt buộc: cùng text nhưng prompt khác thì bản dịch khác.
+    Mongo lỗi thì chỉ dùng LRU (dịch vẫn chạy) và thử lại sau _STORE_RETRY_SECONDS. seconds: thời gian gọi Ollama đã tốn cho bản dịch đó,
+    cộng vào seconds_saved mỗi lần dùng lại.
+    """
+
+    def __init__(self, capacity: int = TRANSLATION_MEMORY_LRU_SIZE, max_chars: int = TRANSLATION_MEMORY_MAX_CHARS):
+        self.capacity = capacity
+        self.max_chars = max_chars
+        self._lru: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._store_ok = True
+        self._store_retry_at = 0.0
+        self.stats = {"lookups": 0, "lru_hits": 0, "store_hits": 0, "writes": 0, "seconds_saved": 0.0}
+
+    def accepts(self, text: str) -> bool:
+        """Only texts up to max_chars are remembered (đoạn dài hiếm khi lặp lại nguyên văn)."""
+        return bool(text and text.strip()) and len(text) <= self.max_chars
+
+    def _remember(self, key: str, value: Tuple[str, float]) -> None:
+        self._lru[key] = value
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.capacity:
+            self._lru.popitem(last=False)
+
+    def _collection(self):
+        if not self._store_ok and time.monotonic() < self._store_retry_at:
+            return None
+        try:
+            return get_translation_memory_collection()
+        except PyMongoError as e:
+            self._store_failed(e)
+            return None
+
+    def _stored(self) -> None:
+        if not self._store_ok:
+            print("[TM] Mongo available again.")
+        self._store_ok = True
+
+    def _store_failed(self, error: Exception) -> None:
+        if self._store_ok:
+            print(f"[TM] Mongo unavailable, using in-process memory only for {_STORE_RETRY_SECONDS}s: {error}")
+        self._store_ok = False
+        self._store_retry_at = time.monotonic() + _STORE_RETRY_SECONDS
+
+    def get_many(self, texts: Iterable[str], kind: str) -> Dict[str, str]:
+        """{text: translation} for the texts already translated with this model."""
+        keys = {memory_key(t, kind): t for t in texts if self.accepts(t)}
+        found: Dict[str, str] = {}
+        missing: List[str] = []
+        with self._lock:
+            self.stats["lookups"] += len(keys)
+            for key, text in keys.items():
+                hit = self._lru.get(key)
+                if hit is None:
+                    missing.append(key)
+                    continue
+                self._lru.move_to_end(key)
+                found[text] = hit[0]
+                self.stats["lru_hits"] += 1
+                self.stats["seconds_saved"] += hit[1]
+        col = self._collection() if missing else None
+        if col is None:
+            return found
+        try:
+            docs = list(col.find({"_id": {"$in": missing}}, {"target": 1, "seconds": 1}))
+        except PyMongoError as e:
+            self._store_failed(e)
+            return found
+        self._stored()
+        with self._lock:
+            for doc in docs:
+                value = (doc["target"], float(doc.get("seconds") or 0.0))
+                self._remember(doc["_id"], value)
+                found[keys[doc["_id"]]] = value[0]
+                self.stats["store_hits"] += 1
+                self.stats["seconds_saved"] += value[1]
+        return found
+
+    def get(self, text: str, kind: str) -> Optional[str]:
+        return self.get_many([text], kind).get(text)
+
+    def put_many(self, items: Iterable[Tuple[str, str, float]], kind: str) -> None:
+        """items: (source text, translation, Ollama seconds spent on it)."""
+        now = datetime.utcnow()
+        ops = []
+        with self._lock:
+            for source, target, seconds in items:
+                if not self.accepts(source) or not target:
+                    continue
+                key = memory_key(source, kind)
+                self._remember(key, (target, seconds))
+                ops.append(UpdateOne({"_id": key}, {"$set": {
+                    "model": OLLAMA_MODEL,
+                    "kind": kind,
+                    "source": normalize(source),
+                    "target": target,
+                    "seconds": round(seconds, 3),
+                    "created_at": now,
+                }}, upsert=True))
+            self.stats["writes"] += len(ops)
+        col = self._collection() if ops else None
+        if col is None:
+            return
+        try:
+            col.bulk_write(ops, ordered=False)
+        except PyMongoError as e:
+            self._store_failed(e)
+            return
+        self._stored()
+
+    def put(self, source: str, target: str, seconds: float, kind: str) -> None:
+        self.put_many([(source, target, seconds)], kind)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.stats)
+
+
+_memory: Optional[TranslationMemory] = None
+_memory_lock = threading.Lock()
+
+
+def get_translation_memory() -> Optional[TranslationMemory]:
+    """Process-wide memory, or None when TRANSLATION_MEMORY is off."""
+    global _memory
+    if not TRANSLATION_MEMORY:
+        return None
+    with _memory_lock:
+        if _memory is None:
+            _memory = TranslationMemory()
+        return _memory
+
+
+def stats_snapshot() -> dict:
+    """Current counters ({} when the memory is off); pass to report() later for a per-run summary."""
+    memory = get_translation_memory()
+    return memory.snapshot() if memory else {}
+
+
+def report(before: Optional[dict] = None) -> str:
+    """One-line summary (hit rate, Ollama seconds saved) since the snapshot `before`."""
+    memory = get_translation_memory()
+    if memory is None:
+        return "[TM] disabled"
+    now = memory.snapshot()
+    delta = {k: now[k] - (before or {}).get(k, 0) for k in now}
+    hits = delta["lru_hits"] + delta["store_hits"]
+    rate = hits / delta["lookups"] * 100 if delta["lookups"] else 0.0
+    return (f"[TM] {hits}/{delta['lookups']} hits ({rate:.0f}%, {delta['store_hits']} from Mongo), "
+            f"{delta['writes']} stored, ~{delta['seconds_saved']:.1f}s of Ollama time saved")
@@ -0,0 +1,3 @@
+from .story_cluster import StoryIndex, assign_story_clusters, get_story_index, minhash_signature, similarity
+
+__all__ = ["StoryIndex", "assign_story_clusters", "get_story_index", "minhash_signature", "similarity"]
@@ -0,0 +1,150 @@
+"""Near-duplicate story clustering: MinHash signatures (NumPy) + LSH banding over title/summary/content."""
+import re
+import threading
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from bson import ObjectId
+
+from app.config import STORY_MINHASH_PERM, STORY_LSH_BANDS, STORY_SIMILARITY, STORY_WINDOW_HOURS
+from app.database import get_articles_collection
+from app.models import CrawlRecord
+
+# Mersenne prime 2^31 - 1: a * x + b với a, b < P và x < 2^32 vẫn nằm trong uint64
+_PRIME = np.uint64((1 << 31) - 1)
+_SHINGLE_WORDS = 3
+_MAX_CONTENT_CHARS = 5000
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+_rng = np.random.default_rng(20240601)  # cố định để chữ ký lưu trong DB so sánh được giữa các lần chạy
+_A = _rng.integers(1, int(_PRIME), size=STORY_MINHASH_PERM, dtype=np.uint64)
+_B = _rng.integers(0, int(_PRIME), size=STORY_MINHASH_PERM, dtype=np.uint64)
+
+
+def _article_text(title: str, summary: Optional[str], content: Optional[str]) -> str:
+    return " ".join(p for p in (title, summary, (content or "")[:_MAX_CONTENT_CHARS]) if p)
+
+
+def _shingle_hashes(text: str) -> np.ndarray:
+    """CRC32 of every run of _SHINGLE_WORDS lower-cased words (unique, uint64)."""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < _SHINGLE_WORDS:
+        words = words + [""] * (_SHINGLE_WORDS - len(words))
+    shingles = {" ".join(words[i:i + _SHINGLE_WORDS]) for i in range(len(words) - _SHINGLE_WORDS + 1)}
+    return np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+
+def minhash_signature(title: str, summary: Optional[str] = None, content: Optional[str] = None) -> np.ndarray:
+    """MinHash signature (STORY_MINHASH_PERM x uint32) computed for all permutations at once."""
+    hashes = _shingle_hashes(_article_text(title, summary, content))
+    # (perm, shingle) matrix of (a * x + b) mod P, min over shingles
+    permuted = (np.outer(_A, hashes) + _B[:, None]) % _PRIME
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.mean(sig_a == sig_b))
+
+
+class StoryIndex:
+    """
+    LSH index of recent stories: signature chia thành STORY_LSH_BANDS band, bài trùng band
+    là ứng viên, rồi xác nhận bằng độ tương đồng ước lượng >= STORY_SIMILARITY.
+    Mỗi story được đại diện bởi link của bài đầu tiên (story_id).
+    """
+
+    def __init__(self, bands: int = STORY_LSH_BANDS, threshold: float = STORY_SIMILARITY):
+        if STORY_MINHASH_PERM % bands:
+            raise ValueError("STORY_MINHASH_PERM must be divisible by STORY_LSH_BANDS")
+        self.bands = bands
+        self.rows = STORY_MINHASH_PERM // bands
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        self._signatures: List[np.ndarray] = []
+        self._story_ids: List[str] = []
+        self._links: set = set()
+        self._last_id: Optional[ObjectId] = None
+        self._loaded = False
+
+    def _band_keys(self, sig: np.ndarray):
+        for b in range(self.bands):
+            yield b, sig[b * self.rows:(b + 1) * self.rows].tobytes()
+
+    def _add(self, sig: np.ndarray, story_id: str, link: str) -> None:
+        if link in self._links:
+            return
+        self._links.add(link)
+        idx = len(self._signatures)
+        self._signatures.append(sig)
+        self._story_ids.append(story_id)
+        for key in self._band_keys(sig):
+            self._buckets.setdefault(key, []).append(idx)
+
+    def find(self, sig: np.ndarray) -> Optional[Tuple[str, float]]:
+        """Best matching story (story_id, similarity) above threshold, or None."""
+        with self._lock:
+            candidates = {i for key in self._band_keys(sig) for i in self._buckets.get(key, ())}
+            best: Optional[Tuple[str, float]] = None
+            for i in candidates:
+                sim = similarity(sig, self._signatures[i])
+                if sim >= self.threshold and (best is None or sim > best[1]):
+                    best = (self._story_ids[i], sim)
+            return best
+
+    def add(self, sig: np.ndarray, story_id: str, link: str) -> None:
+        with self._lock:
+            self._add(sig, story_id, link)
+
+    def refresh(self) -> None:
+        """Load signatures of articles crawled in the last STORY_WINDOW_HOURS (incrementally by _id)."""
+        col = get_articles_collection()
+        if self._loaded and self._last_id is not None:
+            query = {"_id": {"$gt": self._last_id}, "minhash": {"$ne": None}}
+        else:
+            since = datetime.utcnow() - timedelta(hours=STORY_WINDOW_HOURS)
+            query = {"crawled_at": {"$gte": since}, "minhash": {"$ne": None}}
+        docs = list(col.find(query, {"link": 1, "minhash": 1, "story_id": 1}).sort("_id", 1))
+        with self._lock:
+            for doc in docs:
+                sig = np.frombuffer(bytes(doc["minhash"]), dtype=np.uint32)
+                if len(sig) == STORY_MINHASH_PERM:
+                    self._add(sig, doc.get("story_id") or doc["link"], doc["link"])
+                self._last_id = doc["_id"]
+            self._loaded = True
+
+
+_index: Optional[StoryIndex] = None
+
+
+def get_story_index() -> StoryIndex:
+    """Process-wide StoryIndex (kept across cycles of `all --loop`)."""
+    global _index
+    if _index is None:
+        _index = StoryIndex()
+    return _index
+
+
+def assign_story_clusters(articles: List[CrawlRecord]) -> int:
+    """
+    Set minhash, story_id and duplicate_of on new articles before save.
+    Bài gần trùng với một story đã có (kể cả trong cùng batch) nhận duplicate_of = story_id;
+    run_translation bỏ qua/để sau các bài này. Return number of duplicates found.
+    """
+    index = get_story_index()
+    index.refresh()
+    duplicates = 0
+    for a in articles:
+        sig = minhash_signature(a.title, a.summary, a.content)
+        match = index.find(sig)
+        a.minhash = sig.tobytes()
+        if match:
+            a.story_id, a.duplicate_of = match[0], match[0]
+            duplicates += 1
+        else:
+            a.story_id = a.link
+        index.add(sig, a.story_id, a.link)
+    return duplicates
@@ -2,14 +2,75 @@ from .settings import (
     MONGO_URI,
     DB_NAME,
     ARTICLES_COLLECTION,
+    FEED_STATE_COLLECTION,
+    TRANSLATION_MEMORY_COLLECTION,
     RSS_FEEDS_BY_CATEGORY,
     FETCH_TIMEOUT,
+    HTTP_POOL_HOSTS,
+    HTTP_POOL_SIZE,
+    BREAKER_FAILURES,
+    BREAKER_ERROR_RATE,
+    BREAKER_WINDOW,
+    BREAKER_COOLDOWN,
+    FEED_BACKOFF_AFTER,
+    FEED_BACKOFF_BASE,
+    FEED_BACKOFF_MAX,
     CRAWL_LIMIT_PER_FEED,
     CRAWL_FETCH_WINDOW,
+    CRAWL_MAX_WORKERS,
+    CRAWL_HOST_CONCURRENCY,
+    CRAWL_HOST_MIN_INTERVAL,
+    FEED_CACHE_ENABLED,
+    ADAPTIVE_POLLING,
+    POLL_MIN_INTERVAL,
+    POLL_MAX_INTERVAL,
+    POLL_JITTER,
+    FAST_FEED_PARSER,
+    FEED_STOP_AFTER_KNOWN,
+    DEDUP_RECENT_DAYS,
+    DEDUP_BLOOM_FP_RATE,
     EXTRACT_CONTENT,
+    EXTRACT_MAX_WORKERS,
+    EXTRACT_HOST_CONCURRENCY,
+    EXTRACT_HOST_MIN_INTERVAL,
+    EXTRACT_MAX_BYTES,
+    EXTRACT_PARSE_IN_PROCESSES,
+    EXTRACT_PARSE_PROCESSES,
+    EXTRACT_PARSE_MAX_TASKS,
+    CONTENT_QUALITY_GATE,
+    CONTENT_QUALITY_MIN,
+    CONTENT_MIN_WORDS,
+    HERO_IMAGE_SIZE,
+    HERO_RETRY_HOURS,
+    HTML_CACHE_ENABLED,
+    HTML_CACHE_DIR,
+    HTML_CACHE_MAX_MB,
+    HTML_CACHE_TTL_DAYS,
+    STORY_CLUSTERING,
+    STORY_MINHASH_PERM,
+    STORY_LSH_BANDS,
+    STORY_SIMILARITY,
+    STORY_WINDOW_HOURS,
+    TRANSLATE_SKIP_DUPLICATES,
     OLLAMA_BASE_URL,
     OLLAMA_MODEL,
     ENABLE_TRANSLATION,
+    OLLAMA_TIMEOUT,
+    OLLAMA_MIN_CONCURRENCY,
+    OLLAMA_MAX_CONCURRENCY,
+    OLLAMA_INITIAL_CONCURRENCY,
+    OLLAMA_LATENCY_TOLERANCE,
+    OLLAMA_NUM_CTX,
+    TRANSLATE_EXPANSION_RATIO,
+    TRANSLATE_MAX_CHUNK_TOKENS,
+    OLLAMA_STREAM,
+    TRANSLATE_MAX_OUTPUT_RATIO,
+    TRANSLATE_CHUNK_CONCURRENCY,
+    TRANSLATE_BATCH_SIZE,
+    TRANSLATE_BATCH_MAX_CHARS,
+    TRANSLATION_MEMORY,
+    TRANSLATION_MEMORY_LRU_SIZE,
+    TRANSLATION_MEMORY_MAX_CHARS,
     RATE_LIMIT_DEFAULT,
     RATE_LIMIT_ENABLED,
 )
@@ -18,14 +79,75 @@ __all__ = [
     "MONGO_URI",
     "DB_NAME",
     "ARTICLES_COLLECTION",
+    "FEED_STATE_COLLECTION",
+    "TRANSLATION_MEMORY_COLLECTION",
     "RSS_FEEDS_BY_CATEGORY",
     "FETCH_TIMEOUT",
+    "HTTP_POOL_HOSTS",
+    "HTTP_POOL_SIZE",
+    "BREAKER_FAILURES",
+    "BREAKER_ERROR_RATE",
+    "BREAKER_WINDOW",
+    "BREAKER_COOLDOWN",
+    "FEED_BACKOFF_AFTER",
+    "FEED_BACKOFF_BASE",
+    "FEED_BACKOFF_MAX",
     "CRAWL_LIMIT_PER_FEED",
     "CRAWL_FETCH_WINDOW",
+    "CRAWL_MAX_WORKERS",
+    "CRAWL_HOST_CONCURRENCY",
+    "CRAWL_HOST_MIN_INTERVAL",
+    "FEED_CACHE_ENABLED",
+    "ADAPTIVE_POLLING",
+    "POLL_MIN_INTERVAL",
+    "POLL_MAX_INTERVAL",
+    "POLL_JITTER",
+    "FAST_FEED_PARSER",
+    "FEED_STOP_AFTER_KNOWN",
+    "DEDUP_RECENT_DAYS",
+    "DEDUP_BLOOM_FP_RATE",
     "EXTRACT_CONTENT",
+    "EXTRACT_MAX_WORKERS",
+    "EXTRACT_HOST_CONCURRENCY",
+    "EXTRACT_HOST_MIN_INTERVAL",
+    "EXTRACT_MAX_BYTES",
+    "EXTRACT_PARSE_IN_PROCESSES",
+    "EXTRACT_PARSE_PROCESSES",
+    "EXTRACT_PARSE_MAX_TASKS",
+    "CONTENT_QUALITY_GATE",
+    "CONTENT_QUALITY_MIN",
+    "CONTENT_MIN_WORDS",
+    "HERO_IMAGE_SIZE",
+    "HERO_RETRY_HOURS",
+    "HTML_CACHE_ENABLED",
+    "HTML_CACHE_DIR",
+    "HTML_CACHE_MAX_MB",
+    "HTML_CACHE_TTL_DAYS",
+    "STORY_CLUSTERING",
+    "STORY_MINHASH_PERM",
+    "STORY_LSH_BANDS",
+    "STORY_SIMILARITY",
+    "STORY_WINDOW_HOURS",
+    "TRANSLATE_SKIP_DUPLICATES",
     "OLLAMA_BASE_URL",
     "OLLAMA_MODEL",
     "ENABLE_TRANSLATION",
+    "OLLAMA_TIMEOUT",
+    "OLLAMA_MIN_CONCURRENCY",
+    "OLLAMA_MAX_CONCURRENCY",
+    "OLLAMA_INITIAL_CONCURRENCY",
+    "OLLAMA_LATENCY_TOLERANCE",
+    "OLLAMA_NUM_CTX",
+    "TRANSLATE_EXPANSION_RATIO",
+    "TRANSLATE_MAX_CHUNK_TOKENS",
+    "OLLAMA_STREAM",
+    "TRANSLATE_MAX_OUTPUT_RATIO",
+    "TRANSLATE_CHUNK_CONCURRENCY",
+    "TRANSLATE_BATCH_SIZE",
+    "TRANSLATE_BATCH_MAX_CHARS",
+    "TRANSLATION_MEMORY",
+    "TRANSLATION_MEMORY_LRU_SIZE",
+    "TRANSLATION_MEMORY_MAX_CHARS",
     "RATE_LIMIT_DEFAULT",
     "RATE_LIMIT_ENABLED",
 ]
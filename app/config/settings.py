@@ -13,8 +13,13 @@ if _env_file.exists():
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
 DB_NAME = os.getenv("MONGO_DB_NAME", "news_db")
 ARTICLES_COLLECTION = "articles"
+# Trạng thái từng feed (ETag/Last-Modified, hash body...), key = feed URL
+FEED_STATE_COLLECTION = "feed_state"
+# Translation memory: bản dịch đoạn văn / text ngắn đã có, key = hash(model, loại, text)
+TRANSLATION_MEMORY_COLLECTION = "translation_memory"
 
-# RSS feeds by category (Category name -> list of feed URLs)
+# RSS feeds by category (Category name -> list of feed URLs).
+# Thêm feed chỉ cần thêm URL ở đây; dùng {"url": ..., "source": "ten-nguon"} nếu muốn đặt tên nguồn.
 RSS_FEEDS_BY_CATEGORY = {
     "Tin thế giới": [
         "http://feeds.bbci.co.uk/news/world/rss.xml",
@@ -53,19 +58,115 @@ RSS_FEEDS_BY_CATEGORY = {
 # Optional: request timeout (seconds)
 FETCH_TIMEOUT = int(os.getenv("FETCH_TIMEOUT", "30"))
 
+# HTTP client dùng chung (feed + trang bài viết): số host giữ pool, số kết nối keep-alive mỗi host
+HTTP_POOL_HOSTS = int(os.getenv("HTTP_POOL_HOSTS", "32"))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "8"))
+
+# Circuit breaker theo host: mở khi lỗi liên tiếp >= N hoặc tỉ lệ lỗi trong cửa sổ >= ngưỡng; đóng thử lại sau cooldown (giây)
+BREAKER_FAILURES = int(os.getenv("BREAKER_FAILURES", "3"))
+BREAKER_ERROR_RATE = float(os.getenv("BREAKER_ERROR_RATE", "0.5"))
+BREAKER_WINDOW = int(os.getenv("BREAKER_WINDOW", "20"))
+BREAKER_COOLDOWN = float(os.getenv("BREAKER_COOLDOWN", "60"))
+
+# Feed lỗi liên tiếp >= N lần bị tạm dừng (giây, nhân đôi mỗi lần lỗi, tối đa MAX); lưu trong feed_state
+FEED_BACKOFF_AFTER = int(os.getenv("FEED_BACKOFF_AFTER", "3"))
+FEED_BACKOFF_BASE = float(os.getenv("FEED_BACKOFF_BASE", "600"))
+FEED_BACKOFF_MAX = float(os.getenv("FEED_BACKOFF_MAX", "86400"))
+
 # Số tin tối đa lấy mới nhất cho mỗi category/feed (tránh crawl quá nhiều)
 CRAWL_LIMIT_PER_FEED = int(os.getenv("CRAWL_LIMIT_PER_FEED", "10"))
 
 # Số entry tối đa lấy từ mỗi feed để tìm đủ CRAWL_LIMIT_PER_FEED bài chưa có trong DB (nếu top N đã insert thì lấy N tiếp theo)
 CRAWL_FETCH_WINDOW = int(os.getenv("CRAWL_FETCH_WINDOW", "60"))
 
+# Số feed được fetch song song trong một vòng crawl (thread pool); 1 = tuần tự như trước
+CRAWL_MAX_WORKERS = int(os.getenv("CRAWL_MAX_WORKERS", "8"))
+# Lịch sự với từng host: tối đa N kết nối đồng thời, và cách nhau ít nhất X giây giữa hai lần bắt đầu request
+CRAWL_HOST_CONCURRENCY = int(os.getenv("CRAWL_HOST_CONCURRENCY", "2"))
+CRAWL_HOST_MIN_INTERVAL = float(os.getenv("CRAWL_HOST_MIN_INTERVAL", "0.25"))
+
+# Poll thích ứng: mỗi feed có interval riêng (giây) học từ published + số bài mới, có jitter và min/max
+ADAPTIVE_POLLING = os.getenv("ADAPTIVE_POLLING", "true").lower() in ("1", "true", "yes")
+POLL_MIN_INTERVAL = float(os.getenv("POLL_MIN_INTERVAL", "120"))
+POLL_MAX_INTERVAL = float(os.getenv("POLL_MAX_INTERVAL", "7200"))
+POLL_JITTER = float(os.getenv("POLL_JITTER", "0.1"))
+
+# Dedup trong vòng crawl: link crawl trong N ngày gần đây giữ trong set chính xác, link cũ hơn trong Bloom filter
+DEDUP_RECENT_DAYS = int(os.getenv("DEDUP_RECENT_DAYS", "14"))
+DEDUP_BLOOM_FP_RATE = float(os.getenv("DEDUP_BLOOM_FP_RATE", "0.01"))
+
+# Conditional GET (ETag / Last-Modified + hash body): feed không đổi thì bỏ qua parse và dedup
+FEED_CACHE_ENABLED = os.getenv("FEED_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Parser nhanh (iterparse) cho RSS 2.0/Atom, dừng khi đủ CRAWL_FETCH_WINDOW; feed khác/lỗi XML dùng feedparser
+FAST_FEED_PARSER = os.getenv("FAST_FEED_PARSER", "true").lower() in ("1", "true", "yes")
+# Dừng parse sau N link đã có trong DB liên tiếp (0 = tắt). BBC xếp theo độ nổi bật, bài mới có thể nằm sau bài cũ
+FEED_STOP_AFTER_KNOWN = int(os.getenv("FEED_STOP_AFTER_KNOWN", "0"))
+
 # If True, fetch full article HTML and extract text into content (slower, one request per article) and extract text into content (slower, one request per article)
 EXTRACT_CONTENT = os.getenv("EXTRACT_CONTENT", "true").lower() in ("1", "true", "yes")
+# Trích nội dung song song: số worker, số request đồng thời mỗi host và khoảng cách tối thiểu (giây)
+EXTRACT_MAX_WORKERS = int(os.getenv("EXTRACT_MAX_WORKERS", "8"))
+EXTRACT_HOST_CONCURRENCY = int(os.getenv("EXTRACT_HOST_CONCURRENCY", "4"))
+EXTRACT_HOST_MIN_INTERVAL = float(os.getenv("EXTRACT_HOST_MIN_INTERVAL", "0.1"))
+# Đọc tối đa N byte HTML mỗi bài (stream, sau giải nén); trang không phải HTML bị bỏ ngay từ header
+EXTRACT_MAX_BYTES = int(os.getenv("EXTRACT_MAX_BYTES", str(2 * 1024 * 1024)))
+# Parse HTML (trafilatura + BeautifulSoup) trên process pool thay vì trong thread fetch.
+# EXTRACT_PARSE_PROCESSES = 0: một process mỗi core; worker thay mới sau EXTRACT_PARSE_MAX_TASKS trang
+EXTRACT_PARSE_IN_PROCESSES = os.getenv("EXTRACT_PARSE_IN_PROCESSES", "false").lower() in ("1", "true", "yes")
+EXTRACT_PARSE_PROCESSES = int(os.getenv("EXTRACT_PARSE_PROCESSES", "0"))
+EXTRACT_PARSE_MAX_TASKS = int(os.getenv("EXTRACT_PARSE_MAX_TASKS", "200"))
+# Chấm điểm nội dung trích được (article / boilerplate / empty); boilerplate và empty không được dịch
+CONTENT_QUALITY_GATE = os.getenv("CONTENT_QUALITY_GATE", "true").lower() in ("1", "true", "yes")
+CONTENT_QUALITY_MIN = float(os.getenv("CONTENT_QUALITY_MIN", "0.5"))
+CONTENT_MIN_WORDS = int(os.getenv("CONTENT_MIN_WORDS", "60"))
+# Kích thước ảnh hero (BBC: 240, 320, 480, 640, 800, 1024, 1536) khi lấy cùng lượt trích nội dung
+HERO_IMAGE_SIZE = int(os.getenv("HERO_IMAGE_SIZE", "800"))
+# Trang đã tải mà không tìm thấy ảnh hero: chỉ thử lại sau N giờ
+HERO_RETRY_HOURS = float(os.getenv("HERO_RETRY_HOURS", "24"))
+# Lưu HTML bài viết đã tải (nén, pack files) để chạy lại trích xuất không cần tải lại trang.
+# Đường dẫn tương đối tính từ thư mục gốc project; chỉ một process ghi, process khác chỉ đọc
+HTML_CACHE_ENABLED = os.getenv("HTML_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+HTML_CACHE_DIR = str(_env_path / os.getenv("HTML_CACHE_DIR", "data/html_cache"))
+HTML_CACHE_MAX_MB = int(os.getenv("HTML_CACHE_MAX_MB", "1024"))
+HTML_CACHE_TTL_DAYS = float(os.getenv("HTML_CACHE_TTL_DAYS", "30"))
+
+# Gom cụm tin gần trùng (MinHash + LSH) lúc crawl; bản trùng không dịch lại (hoặc dịch sau cùng)
+STORY_CLUSTERING = os.getenv("STORY_CLUSTERING", "true").lower() in ("1", "true", "yes")
+STORY_MINHASH_PERM = int(os.getenv("STORY_MINHASH_PERM", "64"))
+STORY_LSH_BANDS = int(os.getenv("STORY_LSH_BANDS", "16"))
+STORY_SIMILARITY = float(os.getenv("STORY_SIMILARITY", "0.5"))
+STORY_WINDOW_HOURS = int(os.getenv("STORY_WINDOW_HOURS", "48"))
+TRANSLATE_SKIP_DUPLICATES = os.getenv("TRANSLATE_SKIP_DUPLICATES", "true").lower() in ("1", "true", "yes")
 
 # Ollama settings for translation
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "qwen3.5:cloud")
 ENABLE_TRANSLATION = os.getenv("ENABLE_TRANSLATION", "true").lower() in ("1", "true", "yes")
+# Client Ollama dùng chung: số request đồng thời tự điều chỉnh (AIMD) trong [MIN, MAX], bắt đầu từ INITIAL;
+# giảm một nửa khi lỗi hoặc latency (theo độ dài output) > LATENCY_TOLERANCE lần mức thấp nhất gần đây của response cùng cỡ
+OLLAMA_TIMEOUT = float(os.getenv("OLLAMA_TIMEOUT", "300"))
+OLLAMA_MIN_CONCURRENCY = int(os.getenv("OLLAMA_MIN_CONCURRENCY", "1"))
+OLLAMA_MAX_CONCURRENCY = int(os.getenv("OLLAMA_MAX_CONCURRENCY", "8"))
+OLLAMA_INITIAL_CONCURRENCY = int(os.getenv("OLLAMA_INITIAL_CONCURRENCY", "2"))
+OLLAMA_LATENCY_TOLERANCE = float(os.getenv("OLLAMA_LATENCY_TOLERANCE", "2.0"))
+# Context window xin cho mỗi request (options.num_ctx), giới hạn bởi context_length của model nếu Ollama báo.
+# Chunk dịch = phần input lớn nhất để input + bản dịch (× EXPANSION_RATIO token) vừa context; tối đa MAX_CHUNK_TOKENS
+OLLAMA_NUM_CTX = int(os.getenv("OLLAMA_NUM_CTX", "8192"))
+TRANSLATE_EXPANSION_RATIO = float(os.getenv("TRANSLATE_EXPANSION_RATIO", "1.5"))
+TRANSLATE_MAX_CHUNK_TOKENS = int(os.getenv("TRANSLATE_MAX_CHUNK_TOKENS", "3000"))
+# Stream phản hồi để dừng sớm khi model bình luận / lặp vòng; output tối đa = MAX_OUTPUT_RATIO × token của prompt
+OLLAMA_STREAM = os.getenv("OLLAMA_STREAM", "true").lower() in ("1", "true", "yes")
+TRANSLATE_MAX_OUTPUT_RATIO = float(os.getenv("TRANSLATE_MAX_OUTPUT_RATIO", "2.5"))
+# Số chunk của cùng một bài dịch/format đồng thời (1 = lần lượt như trước)
+TRANSLATE_CHUNK_CONCURRENCY = int(os.getenv("TRANSLATE_CHUNK_CONCURRENCY", "4"))
+# Dịch title/summary theo batch: tối đa BATCH_SIZE bài (và BATCH_MAX_CHARS ký tự nguồn) mỗi lượt gọi (1 = từng bài)
+TRANSLATE_BATCH_SIZE = int(os.getenv("TRANSLATE_BATCH_SIZE", "10"))
+TRANSLATE_BATCH_MAX_CHARS = int(os.getenv("TRANSLATE_BATCH_MAX_CHARS", "6000"))
+# Dùng lại bản dịch của đoạn văn / tiêu đề đã dịch (LRU trong process + Mongo); đoạn dài hơn MAX_CHARS không lưu
+TRANSLATION_MEMORY = os.getenv("TRANSLATION_MEMORY", "true").lower() in ("1", "true", "yes")
+TRANSLATION_MEMORY_LRU_SIZE = int(os.getenv("TRANSLATION_MEMORY_LRU_SIZE", "20000"))
+TRANSLATION_MEMORY_MAX_CHARS = int(os.getenv("TRANSLATION_MEMORY_MAX_CHARS", "1500"))
 
 # API security: rate limit (e.g. "100/minute", "1000/hour")
 RATE_LIMIT_DEFAULT = os.getenv("RATE_LIMIT_DEFAULT", "100/minute")
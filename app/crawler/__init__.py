@@ -4,5 +4,25 @@ from .crypto_crawler import crawl_crypto
 from .nyt_crawler import crawl_nyt
 from .robotics_crawler import crawl_robotics
 from .ai_crawler import crawl_ai
+from .engine import FeedResult, commit_feed_cache, crawl_feeds, print_feed_report
+from .registry import FeedSpec, build_registry, feeds_for
+from .poll_schedule import due_feeds
+from .feed_health import healthy_feeds
 
-__all__ = ["crawl_bbc", "crawl_reuters", "crawl_crypto", "crawl_nyt", "crawl_robotics", "crawl_ai"]
+__all__ = [
+    "crawl_bbc",
+    "crawl_reuters",
+    "crawl_crypto",
+    "crawl_nyt",
+    "crawl_robotics",
+    "crawl_ai",
+    "FeedResult",
+    "crawl_feeds",
+    "commit_feed_cache",
+    "print_feed_report",
+    "FeedSpec",
+    "build_registry",
+    "feeds_for",
+    "due_feeds",
+    "healthy_feeds",
+]
@@ -1,12 +1,15 @@
 """Base RSS fetching logic."""
 import re
 from datetime import datetime
-from typing import List, Optional, Set
+from typing import Callable, List, Optional, Set
 import feedparser
-from urllib.request import Request, urlopen
 
-from app.config import FETCH_TIMEOUT, CRAWL_LIMIT_PER_FEED
-from app.models import Article
+from app.config import CRAWL_LIMIT_PER_FEED, FAST_FEED_PARSER, FEED_STOP_AFTER_KNOWN
+from app.extractor.hero_image import hero_from_feed
+from app.models import CrawlRecord
+from app.net import http_client
+from . import feed_cache
+from .fast_parser import UnsupportedFeed, parse_entries
 
 
 def strip_html_tags(text: str) -> str:
@@ -42,6 +45,15 @@ def _thumbnail_from_entry(entry) -> Optional[str]:
     return None
 
 
+def _media_content_from_entry(entry) -> Optional[str]:
+    """First media:content URL that is an image (feedparser entry)."""
+    for media in getattr(entry, "media_content", None) or []:
+        medium, typ = media.get("medium") or "", media.get("type") or ""
+        if media.get("url") and (medium == "image" or typ.startswith("image/") or not (medium or typ)):
+            return media["url"]
+    return None
+
+
 def _source_from_url(url: str) -> str:
     """Derive short source name from feed URL (e.g. bbc, coindesk)."""
     url_lower = url.lower()
@@ -64,9 +76,9 @@ def _source_from_url(url: str) -> str:
     return "unknown"
 
 
-def take_first_new(articles: List[Article], existing_links: Set[str], n: int) -> List[Article]:
+def take_first_new(articles: List[CrawlRecord], existing_links: Set[str], n: int) -> List[CrawlRecord]:
     """Lấy tối đa n bài đầu tiên (theo thứ tự feed) mà link chưa có trong existing_links."""
-    out: List[Article] = []
+    out: List[CrawlRecord] = []
     for a in articles:
         if len(out) >= n:
             break
@@ -75,35 +87,75 @@ def take_first_new(articles: List[Article], existing_links: Set[str], n: int) ->
     return out
 
 
-def fetch_feed(url: str, category: str, source: Optional[str] = None, limit: Optional[int] = None) -> List[Article]:
-    """Fetch RSS feed and return list of Article for the given category (top N mới nhất)."""
-    req = Request(url, headers={"User-Agent": "NewsCrawler/1.0"})
-    with urlopen(req, timeout=FETCH_TIMEOUT) as resp:
-        content = resp.read()
-    feed = feedparser.parse(content)
+def fetch_feed(
+    url: str,
+    category: str,
+    source: Optional[str] = None,
+    limit: Optional[int] = None,
+    conditional: bool = False,
+    is_known: Optional[Callable[[str], bool]] = None,
+) -> List[CrawlRecord]:
+    """
+    Fetch RSS feed and return CrawlRecords for the given category (top N mới nhất).
+    conditional=True: gửi If-None-Match/If-Modified-Since từ feed_cache; nếu server trả 304
+    hoặc body giống hệt lần trước thì trả về [] (không parse, không cần dedup).
+    is_known: kiểm tra link đã có (chỉ trong RAM); fast parser dừng sau FEED_STOP_AFTER_KNOWN link đã biết liên tiếp.
+    """
+    headers = feed_cache.conditional_headers(url) if conditional else {}
+    resp = http_client.get(url, headers=headers)
+    if conditional and resp.status_code == 304:
+        feed_cache.record_not_modified(url)
+        return []
+    resp.raise_for_status()
+    content = resp.content
+    etag = resp.headers.get("ETag")
+    last_modified = resp.headers.get("Last-Modified")
+    if conditional and feed_cache.record_body(url, content, etag, last_modified):
+        return []
     source_name = source or _source_from_url(url)
     max_entries = limit if limit is not None else CRAWL_LIMIT_PER_FEED
-    articles: List[Article] = []
+    entries = _parse_entries(content, max_entries, is_known)
+    return [_entry_to_record(e, url, category, source_name) for e in entries if e["link"]]
+
+
+def _parse_entries(content: bytes, max_entries: int, is_known: Optional[Callable[[str], bool]] = None) -> List[dict]:
+    """Fast iterparse path for RSS 2.0 / Atom (dừng khi đủ window); feedparser cho feed khác hoặc lỗi XML."""
+    if FAST_FEED_PARSER:
+        try:
+            return parse_entries(content, max_entries, is_known, FEED_STOP_AFTER_KNOWN)
+        except UnsupportedFeed:
+            pass
+    feed = feedparser.parse(content)
+    entries: List[dict] = []
     for entry in feed.entries[:max_entries]:
-        link = getattr(entry, "link", "") or ""
-        if not link:
-            continue
-        title = getattr(entry, "title", "") or ""
-        summary = getattr(entry, "summary", "") or getattr(entry, "description", "") or None
-        if summary and hasattr(summary, "strip"):
-            summary = strip_html_tags(summary)[:2000]  # strip HTML and limit length
-        published = parse_date(entry)
-        thumbnail = _thumbnail_from_entry(entry)
-        articles.append(
-            Article(
-                title=title,
-                link=link,
-                summary=summary,
-                category=category,
-                source_feed=url,
-                source=source_name,
-                thumbnail=thumbnail,
-                published=published,
-            )
-        )
-    return articles
+        entries.append({
+            "title": getattr(entry, "title", "") or "",
+            "link": getattr(entry, "link", "") or "",
+            "summary": getattr(entry, "summary", "") or getattr(entry, "description", "") or None,
+            "published": parse_date(entry),
+            "thumbnail": _thumbnail_from_entry(entry),
+            "media_content": _media_content_from_entry(entry),
+        })
+    return entries
+
+
+def _entry_to_record(entry: dict, url: str, category: str, source_name: str) -> CrawlRecord:
+    """
+    Build a CrawlRecord from a parsed entry dict (same fields for both parsers).
+    content_top_image lấy luôn từ ảnh trong feed nếu nguồn có quy tắc (hero_image.HERO_RULES), không cần tải trang.
+    """
+    summary = entry["summary"]
+    if summary and hasattr(summary, "strip"):
+        summary = strip_html_tags(summary)[:2000]  # strip HTML and limit length
+    record = CrawlRecord(
+        title=entry["title"],
+        link=entry["link"],
+        summary=summary,
+        category=category,
+        source_feed=url,
+        source=source_name,
+        thumbnail=entry["thumbnail"],
+        published=entry["published"],
+    )
+    record.content_top_image = hero_from_feed(entry["link"], entry)
+    return record
@@ -0,0 +1,161 @@
+"""Concurrent crawl engine: fetch every registered feed in parallel (polite per host), then merge per category."""
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.config import (
+    CRAWL_LIMIT_PER_FEED,
+    CRAWL_FETCH_WINDOW,
+    CRAWL_MAX_WORKERS,
+    FEED_CACHE_ENABLED,
+)
+from app.models import CrawlRecord
+from app.database import get_link_index
+from app.net import breaker
+from app.net.politeness import HostLimiter, run_per_host
+from . import feed_cache, feed_health, feed_state, poll_schedule
+from .base_rss import fetch_feed, take_first_new
+from .registry import FeedSpec, build_registry
+
+
+@dataclass
+class FeedResult:
+    """Kết quả crawl một feed: entry trong fetch window, bài mới (chưa có trong DB) và thời gian fetch."""
+
+    url: str
+    category: str
+    raw: List[CrawlRecord] = field(default_factory=list)
+    articles: List[CrawlRecord] = field(default_factory=list)
+    fetched: int = 0  # số entry đọc được từ feed (trong fetch window)
+    elapsed: float = 0.0  # giây, fetch + parse
+    cache: Optional[str] = None  # not_modified / unchanged / misses (None nếu tắt cache)
+    error: Optional[str] = None
+
+
+def _sort_key(a: CrawlRecord) -> datetime:
+    """Sort by published date, newest first; no date goes last."""
+    return a.published or datetime.min
+
+
+def _crawl_feed(spec: FeedSpec) -> FeedResult:
+    """Fetch one feed window (dedup is done once for all feeds afterwards). Never raises."""
+    started = time.perf_counter()
+    url = spec.url
+    result = FeedResult(url=url, category=spec.category)
+    try:
+        result.raw = fetch_feed(
+            url,
+            spec.category,
+            source=spec.source,
+            limit=CRAWL_FETCH_WINDOW,
+            conditional=FEED_CACHE_ENABLED,
+            is_known=get_link_index().is_recent,
+        )
+        if FEED_CACHE_ENABLED:
+            result.cache = feed_cache.last_status(url)
+        result.fetched = len(result.raw)
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def merge_category(results: List[FeedResult], limit: int = CRAWL_LIMIT_PER_FEED) -> List[CrawlRecord]:
+    """Gộp bài mới của các feed trong cùng category, sort mới nhất trước và lấy top N."""
+    articles: List[CrawlRecord] = []
+    for r in results:
+        articles.extend(r.articles)
+    articles.sort(key=_sort_key, reverse=True)
+    return articles[:limit]
+
+
+def crawl_feeds(
+    specs: Optional[List[FeedSpec]] = None,
+    max_workers: int = CRAWL_MAX_WORKERS,
+    limiter: Optional[HostLimiter] = None,
+) -> Tuple[List[CrawlRecord], List[FeedResult]]:
+    """
+    Crawl feeds (default: whole registry) concurrently on a bounded thread pool.
+    Fetch được lập lịch theo host: tối đa CRAWL_HOST_CONCURRENCY kết nối/host, cách nhau ít nhất
+    CRAWL_HOST_MIN_INTERVAL giây, xen kẽ giữa các host.
+    Mỗi feed: fetch window; dedup một lần cho cả vòng qua LinkIndex (tối đa một query Mongo),
+    rồi lấy first N chưa có trong DB mỗi feed và gộp theo category (sort, top N).
+    Wall-clock ≈ feed chậm nhất thay vì tổng thời gian các feed.
+    Returns (articles, per-feed results in registry order).
+    """
+    jobs = specs if specs is not None else build_registry()
+    if not jobs:
+        return [], []
+
+    index = get_link_index()
+    index.refresh()
+
+    results: Dict[FeedSpec, FeedResult] = {}
+    for spec, result in run_per_host(jobs, lambda s: s.host, _crawl_feed, max_workers, limiter or HostLimiter()):
+        results[spec] = result
+
+    ordered = [results[spec] for spec in jobs]
+    existing = index.existing(a.link for r in ordered for a in r.raw)
+    for r in ordered:
+        r.articles = take_first_new(r.raw, existing, CRAWL_LIMIT_PER_FEED)
+        feed_health.record_result(r.url, r.error is None, r.elapsed, r.error)
+        if r.error is None:
+            poll_schedule.record_poll(r.url, len(r.articles), (a.published for a in r.raw))
+        r.raw = []
+
+    articles: List[CrawlRecord] = []
+    for category in dict.fromkeys(spec.category for spec in jobs):
+        articles.extend(merge_category([r for r in ordered if r.category == category]))
+
+    if FEED_CACHE_ENABLED:
+        # Feed còn bài mới chưa lấy (đủ limit hoặc bị cắt khi gộp) → lần sau phải parse lại dù body không đổi
+        kept = {id(a) for a in articles}
+        for r in ordered:
+            if len(r.articles) >= CRAWL_LIMIT_PER_FEED or any(id(a) not in kept for a in r.articles):
+                feed_cache.forget(r.url)
+    feed_state.flush()
+    return articles, ordered
+
+
+def commit_feed_cache(results: List[FeedResult], stored_links: Set[str]) -> None:
+    """
+    Sau khi lưu bài: ghi validators / body hash của các feed mà mọi bài mới đều đã nằm trong DB.
+    Feed có bài lưu lỗi giữ cache cũ → vòng sau tải lại và parse đầy đủ thay vì bỏ qua vì "body không đổi".
+    """
+    if not FEED_CACHE_ENABLED:
+        return
+    feed_cache.commit(
+        r.url for r in results
+        if r.error is None and all(a.link in stored_links for a in r.articles)
+    )
+    feed_state.flush()
+
+
+def print_feed_report(results: List[FeedResult], wall: float) -> None:
+    """In thời gian từng feed và tổng wall-clock của vòng crawl."""
+    for r in sorted(results, key=lambda r: r.elapsed, reverse=True):
+        status = f"✗ {r.error}" if r.error else f"{len(r.articles)} new / {r.fetched}"
+        if r.cache in ("not_modified", "unchanged"):
+            status = f"cached ({r.cache})"
+        print(f"[Crawl] {r.elapsed:6.2f}s  {r.category:<22} {r.url}  {status}")
+    total = sum(r.elapsed for r in results)
+    print(f"[Crawl] {len(results)} feeds in {wall:.2f}s wall-clock (sum of feed times {total:.2f}s).")
+    unhealthy = {host: h for host, h in breaker.snapshot().items() if h["state"] != "closed" or h["error_rate"]}
+    for host, h in unhealthy.items():
+        print(
+            f"[Health] {host}: breaker {h['state']}, error rate {h['error_rate']:.0%}, "
+            f"avg {h['avg_latency_ms']:.0f} ms, {h['short_circuited']} short-circuited"
+        )
+    st = get_link_index().stats
+    print(
+        f"[Dedup] {st['lookups']} link lookups, {st['mongo_queries']} Mongo queries "
+        f"({st['bloom_positives']} Bloom positives, {st['false_positives']} false)"
+    )
+    if FEED_CACHE_ENABLED:
+        st = feed_cache.get_cache_stats()
+        hits = st["not_modified"] + st["unchanged"]
+        print(
+            f"[FeedCache] hits {hits}/{st['requests']} (304: {st['not_modified']}, same body: {st['unchanged']}), "
+            f"misses {st['misses']}, ~{st['bytes_saved'] / 1024:.0f} KiB not downloaded"
+        )
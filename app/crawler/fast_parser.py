@@ -0,0 +1,146 @@
+"""Fast-path RSS 2.0 / Atom parser on ElementTree.iterparse (feedparser is the fallback)."""
+import io
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Iterator, List, Optional
+from xml.etree import ElementTree as ET
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_MEDIA = "{http://search.yahoo.com/mrss/}"
+_DC = "{http://purl.org/dc/elements/1.1/}"
+
+
+class UnsupportedFeed(Exception):
+    """Feed is not well-formed RSS 2.0 / Atom; caller should fall back to feedparser."""
+
+
+def _to_utc_naive(dt: datetime) -> datetime:
+    """feedparser trả về giờ UTC không timezone; giữ cùng quy ước."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _parse_rfc822(text: Optional[str]) -> Optional[datetime]:
+    if not text:
+        return None
+    try:
+        return _to_utc_naive(parsedate_to_datetime(text.strip()))
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def _parse_iso(text: Optional[str]) -> Optional[datetime]:
+    if not text:
+        return None
+    try:
+        return _to_utc_naive(datetime.fromisoformat(text.strip()))
+    except ValueError:
+        return None
+
+
+def _text(elem: Optional[ET.Element]) -> str:
+    return (elem.text or "").strip() if elem is not None else ""
+
+
+def _media_image(elem: ET.Element) -> Optional[str]:
+    """First media:content (also inside media:group) that is an image."""
+    for mc in elem.iter(f"{_MEDIA}content"):
+        medium, typ = mc.get("medium") or "", mc.get("type") or ""
+        if mc.get("url") and (medium == "image" or typ.startswith("image/") or not (medium or typ)):
+            return mc.get("url")
+    return None
+
+
+def _rss_link(item: ET.Element) -> str:
+    """<link>, else a permalink <guid> (isPermaLink mặc định "true" theo RSS 2.0, như feedparser)."""
+    link = _text(item.find("link"))
+    if link:
+        return link
+    guid = item.find("guid")
+    if guid is None or (guid.get("isPermaLink") or "true").lower() == "false":
+        return ""
+    value = _text(guid)
+    return value if value.startswith(("http://", "https://")) else ""
+
+
+def _rss_entry(item: ET.Element) -> dict:
+    thumb = item.find(f"{_MEDIA}thumbnail")
+    return {
+        "title": _text(item.find("title")),
+        "link": _rss_link(item),
+        "summary": _text(item.find("description")) or None,
+        "published": _parse_rfc822(_text(item.find("pubDate"))) or _parse_iso(_text(item.find(f"{_DC}date"))),
+        "thumbnail": thumb.get("url") if thumb is not None else None,
+        "media_content": _media_image(item),
+    }
+
+
+def _atom_entry(entry: ET.Element) -> dict:
+    link = ""
+    for el in entry.findall(f"{_ATOM}link"):
+        if el.get("rel", "alternate") == "alternate" and el.get("href"):
+            link = el.get("href").strip()
+            break
+    thumb = entry.find(f"{_MEDIA}thumbnail")
+    summary = _text(entry.find(f"{_ATOM}summary")) or _text(entry.find(f"{_ATOM}content"))
+    return {
+        "title": _text(entry.find(f"{_ATOM}title")),
+        "link": link,
+        "summary": summary or None,
+        "published": _parse_iso(_text(entry.find(f"{_ATOM}published"))) or _parse_iso(_text(entry.find(f"{_ATOM}updated"))),
+        "thumbnail": thumb.get("url") if thumb is not None else None,
+        "media_content": _media_image(entry),
+    }
+
+
+def iter_entries(stream) -> Iterator[dict]:
+    """
+    Yield feed entries as dicts (title, link, summary, published, thumbnail, media_content) while parsing.
+    Entries are cleared after use so memory stays flat; stop iterating to stop parsing.
+    Raises UnsupportedFeed for malformed XML or a root that is not <rss> / Atom <feed>.
+    """
+    events = ET.iterparse(stream, events=("start", "end"))
+    try:
+        _, root = next(events)
+        if root.tag == "rss":
+            item_tag, to_entry = "item", _rss_entry
+        elif root.tag == f"{_ATOM}feed":
+            item_tag, to_entry = f"{_ATOM}entry", _atom_entry
+        else:
+            raise UnsupportedFeed(f"unsupported root <{root.tag}>")
+        for event, elem in events:
+            if event == "end" and elem.tag == item_tag:
+                yield to_entry(elem)
+                elem.clear()
+                root.clear()
+    except ET.ParseError as e:
+        raise UnsupportedFeed(str(e)) from e
+    except StopIteration:
+        raise UnsupportedFeed("empty document")
+
+
+def parse_entries(
+    content: bytes,
+    max_entries: int,
+    is_known: Optional[Callable[[str], bool]] = None,
+    stop_after_known: int = 0,
+) -> List[dict]:
+    """
+    Parse at most max_entries entries (counted like feed.entries[:max_entries]) and stop early.
+    If is_known and stop_after_known > 0: also stop after that many consecutive known links.
+    Raises UnsupportedFeed before returning anything if the feed needs feedparser.
+    """
+    out: List[dict] = []
+    seen = 0
+    known_run = 0
+    for entry in iter_entries(io.BytesIO(content)):
+        if seen >= max_entries:
+            break
+        seen += 1
+        if is_known and stop_after_known > 0 and entry["link"]:
+            known_run = known_run + 1 if is_known(entry["link"]) else 0
+            if known_run >= stop_after_known:
+                break
+        out.append(entry)
+    return out
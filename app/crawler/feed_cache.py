@@ -0,0 +1,100 @@
+"""
+Conditional GET cache for RSS feeds: ETag / Last-Modified validators + hash of the last body.
+Validators của body mới chỉ được ghi (commit) sau khi bài của vòng crawl đã lưu vào DB.
+"""
+import hashlib
+import threading
+from typing import Dict, Iterable, Optional
+
+from . import feed_state
+
+_SECTION = "cache"
+
+_lock = threading.Lock()
+_stats = {"requests": 0, "not_modified": 0, "unchanged": 0, "misses": 0, "bytes_saved": 0}
+# Kết quả lần fetch gần nhất theo URL: "not_modified" (304), "unchanged" (cùng hash), "miss"
+_last_status: Dict[str, str] = {}
+# Validators + hash của body vừa tải, chờ commit() sau khi lưu bài
+_pending: Dict[str, dict] = {}
+
+
+def _body_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+def _count(key: str, url: str, bytes_saved: int = 0) -> None:
+    with _lock:
+        _stats["requests"] += 1
+        _stats[key] += 1
+        _stats["bytes_saved"] += bytes_saved
+        _last_status[url] = key
+
+
+def conditional_headers(url: str) -> Dict[str, str]:
+    """If-None-Match / If-Modified-Since headers from the validators stored for this feed."""
+    cached = feed_state.get_section(url, _SECTION)
+    headers: Dict[str, str] = {}
+    if cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+    return headers
+
+
+def record_not_modified(url: str) -> None:
+    """Server answered 304: whole body (size of the last one) was not transferred."""
+    cached = feed_state.get_section(url, _SECTION)
+    _count("not_modified", url, bytes_saved=int(cached.get("length") or 0))
+
+
+def record_body(url: str, body: bytes, etag: Optional[str], last_modified: Optional[str]) -> bool:
+    """
+    Stage validators + body hash for a 200 response; they are stored by commit().
+    Return True if the body is identical to the last committed one (caller can skip parse and dedup).
+    """
+    cached = feed_state.get_section(url, _SECTION)
+    digest = _body_hash(body)
+    unchanged = cached.get("body_hash") == digest
+    fields = {"etag": etag, "last_modified": last_modified, "body_hash": digest, "length": len(body)}
+    with _lock:
+        if fields != cached:
+            _pending[url] = fields
+        else:
+            _pending.pop(url, None)
+    _count("unchanged" if unchanged else "misses", url)
+    return unchanged
+
+
+def commit(urls: Iterable[str]) -> int:
+    """
+    Store the staged validators of these feeds (gọi sau khi bài của feed đã được lưu; feed chưa commit
+    sẽ được tải và parse lại đầy đủ ở vòng sau). Return number of feeds committed.
+    """
+    with _lock:
+        staged = {url: _pending.pop(url) for url in urls if url in _pending}
+    for url, fields in staged.items():
+        feed_state.set_section(url, _SECTION, fields)
+    return len(staged)
+
+
+def forget(url: str) -> None:
+    """
+    Drop validators for a feed so the next fetch is unconditional and fully parsed.
+    Dùng khi feed còn bài mới chưa lấy (vượt CRAWL_LIMIT_PER_FEED hoặc bị cắt khi gộp category).
+    """
+    with _lock:
+        _pending.pop(url, None)
+    if feed_state.get_section(url, _SECTION):
+        feed_state.set_section(url, _SECTION, {})
+
+
+def last_status(url: str) -> Optional[str]:
+    """Status of the last fetch of this feed in this process: not_modified, unchanged, misses or None."""
+    with _lock:
+        return _last_status.get(url)
+
+
+def get_cache_stats() -> Dict[str, int]:
+    """Counters since process start: requests, not_modified (304), unchanged (same hash), misses, bytes_saved."""
+    with _lock:
+        return dict(_stats)
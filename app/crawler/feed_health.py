@@ -0,0 +1,53 @@
+"""Persisted per-feed health: error rate, latency, consecutive failures and automatic back-off."""
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from app.config import FEED_BACKOFF_AFTER, FEED_BACKOFF_BASE, FEED_BACKOFF_MAX
+from . import feed_state
+from .registry import FeedSpec
+
+_SECTION = "health"
+# Trọng số EWMA cho error_rate / latency
+_ALPHA = 0.3
+
+
+def _ewma(old: Optional[float], value: float) -> float:
+    return value if old is None else (1 - _ALPHA) * old + _ALPHA * value
+
+
+def record_result(url: str, ok: bool, elapsed: float, error: Optional[str] = None, now: Optional[datetime] = None) -> dict:
+    """
+    Update a feed's health after a fetch. Return the new health section.
+    Sau FEED_BACKOFF_AFTER lần lỗi liên tiếp, feed bị tạm dừng FEED_BACKOFF_BASE giây,
+    nhân đôi mỗi lần lỗi tiếp theo, tối đa FEED_BACKOFF_MAX.
+    """
+    now = now or datetime.utcnow()
+    health = feed_state.get_section(url, _SECTION)
+    failures = 0 if ok else int(health.get("consecutive_failures") or 0) + 1
+    health.update({
+        "consecutive_failures": failures,
+        "error_rate": round(_ewma(health.get("error_rate"), 0.0 if ok else 1.0), 3),
+        "latency_ms": round(_ewma(health.get("latency_ms"), elapsed * 1000), 1),
+        "last_checked": now,
+        "backoff_until": None,
+    })
+    if ok:
+        health["last_ok"] = now
+    else:
+        health["last_error"] = (error or "")[:300]
+        if failures >= FEED_BACKOFF_AFTER:
+            delay = min(FEED_BACKOFF_BASE * 2 ** (failures - FEED_BACKOFF_AFTER), FEED_BACKOFF_MAX)
+            health["backoff_until"] = now + timedelta(seconds=delay)
+    feed_state.set_section(url, _SECTION, health)
+    return health
+
+
+def is_backed_off(url: str, now: Optional[datetime] = None) -> bool:
+    until = feed_state.get_section(url, _SECTION).get("backoff_until")
+    return until is not None and until > (now or datetime.utcnow())
+
+
+def healthy_feeds(specs: List[FeedSpec], now: Optional[datetime] = None) -> List[FeedSpec]:
+    """Drop feeds that are currently backed off after repeated failures."""
+    now = now or datetime.utcnow()
+    return [s for s in specs if not is_backed_off(s.url, now)]
@@ -0,0 +1,52 @@
+"""In-process view of the feed_state collection: loaded once, written back in one bulk per cycle."""
+import threading
+from typing import Dict, Optional
+
+from app.database import load_feed_states, save_feed_states
+
+_lock = threading.Lock()
+_states: Optional[Dict[str, dict]] = None
+_dirty: Dict[str, dict] = {}
+
+
+def _ensure_loaded() -> Dict[str, dict]:
+    """Load all feed states from Mongo on first use. DB lỗi thì chạy với state rỗng (chỉ mất tối ưu)."""
+    global _states
+    if _states is None:
+        try:
+            _states = load_feed_states()
+        except Exception as e:
+            print(f"[FeedState] Could not load feed state: {e}")
+            _states = {}
+    return _states
+
+
+def get_section(url: str, section: str) -> dict:
+    """Return a copy of one section (e.g. "cache") of a feed's state; {} if none."""
+    with _lock:
+        return dict(_ensure_loaded().get(url, {}).get(section) or {})
+
+
+def set_section(url: str, section: str, fields: dict) -> None:
+    """Replace one section of a feed's state; persisted on the next flush()."""
+    with _lock:
+        _ensure_loaded().setdefault(url, {})[section] = dict(fields)
+        _dirty.setdefault(url, {})[section] = dict(fields)
+
+
+def flush() -> int:
+    """Write changed sections back to Mongo in one bulk write. Return number of feeds written."""
+    with _lock:
+        pending = dict(_dirty)
+        _dirty.clear()
+    if not pending:
+        return 0
+    try:
+        return save_feed_states(pending)
+    except Exception as e:
+        print(f"[FeedState] Could not save feed state: {e}")
+        with _lock:
+            for url, sections in pending.items():
+                for section, fields in sections.items():
+                    _dirty.setdefault(url, {}).setdefault(section, fields)
+        return 0
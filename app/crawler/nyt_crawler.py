@@ -1,12 +1,14 @@
-"""NYT RSS crawler (stub). Add NYT RSS feed URL in config to enable."""
+"""NYT RSS crawler. Add NYT RSS feed URL in config to enable."""
 from typing import List
 
-from app.models import Article
+from app.models import CrawlRecord
+from .engine import crawl_feeds
+from .registry import feeds_for
 
 # Add to RSS_FEEDS_BY_CATEGORY in config, e.g. "Tin Mỹ": ["https://rss.nytimes.com/..."]
-# Then implement fetch via base_rss.fetch_feed.
 
 
-def crawl_nyt() -> List[Article]:
-    """Crawl NYT feeds. Currently returns empty list until feed URLs are configured."""
-    return []
+def crawl_nyt() -> List[CrawlRecord]:
+    """Crawl NYT feeds. Returns empty list until feed URLs are configured."""
+    articles, _ = crawl_feeds(feeds_for(source="nyt"))
+    return articles
@@ -0,0 +1,65 @@
+"""Adaptive per-feed polling: learn each feed's update rate and poll it on its own interval."""
+import random
+from datetime import datetime, timedelta
+from statistics import median
+from typing import Iterable, List, Optional
+
+from app.config import POLL_MIN_INTERVAL, POLL_MAX_INTERVAL, POLL_JITTER, CRAWL_LIMIT_PER_FEED
+from . import feed_state
+from .registry import FeedSpec
+
+_SECTION = "poll"
+
+
+def _clamp(seconds: float) -> float:
+    return max(POLL_MIN_INTERVAL, min(POLL_MAX_INTERVAL, seconds))
+
+
+def _typical_gap(published: Iterable[Optional[datetime]]) -> Optional[float]:
+    """Median seconds between consecutive publish times in the window (None if < 2 timestamps)."""
+    times = sorted((p for p in published if p), reverse=True)
+    gaps = [(a - b).total_seconds() for a, b in zip(times, times[1:])]
+    gaps = [g for g in gaps if g > 0]
+    return median(gaps) if gaps else None
+
+
+def is_due(url: str, now: Optional[datetime] = None) -> bool:
+    """True if the feed has never been scheduled or its next poll time has passed."""
+    next_due = feed_state.get_section(url, _SECTION).get("next_due")
+    return next_due is None or next_due <= (now or datetime.utcnow())
+
+
+def due_feeds(specs: List[FeedSpec], now: Optional[datetime] = None) -> List[FeedSpec]:
+    """Filter specs down to feeds due for polling now."""
+    now = now or datetime.utcnow()
+    return [s for s in specs if is_due(s.url, now)]
+
+
+def record_poll(url: str, new_count: int, published: Iterable[Optional[datetime]], now: Optional[datetime] = None) -> float:
+    """
+    Update a feed's interval after a successful poll and schedule the next one. Return the interval (s).
+    - Không có bài mới: giãn interval x1.5.
+    - Bài mới chạm CRAWL_LIMIT_PER_FEED (có thể còn sót): rút interval /2.
+    - Có khoảng cách đăng bài điển hình từ published: kéo interval về phía đó (trung bình cộng).
+    Kết quả kẹp trong [POLL_MIN_INTERVAL, POLL_MAX_INTERVAL], next_due cộng thêm jitter ±POLL_JITTER.
+    """
+    now = now or datetime.utcnow()
+    state = feed_state.get_section(url, _SECTION)
+    interval = float(state.get("interval") or POLL_MIN_INTERVAL)
+    if new_count >= CRAWL_LIMIT_PER_FEED:
+        interval /= 2
+    elif new_count == 0:
+        interval *= 1.5
+    gap = _typical_gap(published)
+    if gap is not None:
+        interval = (interval + gap) / 2
+    interval = _clamp(interval)
+    delay = interval * random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+    feed_state.set_section(url, _SECTION, {
+        "interval": round(interval, 1),
+        "next_due": now + timedelta(seconds=delay),
+        "last_polled": now,
+        "last_new": new_count,
+        "typical_gap": round(gap, 1) if gap is not None else state.get("typical_gap"),
+    })
+    return interval
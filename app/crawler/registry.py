@@ -0,0 +1,60 @@
+"""Feed registry built from RSS_FEEDS_BY_CATEGORY: thêm feed chỉ cần sửa config."""
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+from app.config import RSS_FEEDS_BY_CATEGORY
+from app.net.politeness import host_of
+from .base_rss import _source_from_url
+
+
+@dataclass(frozen=True)
+class FeedSpec:
+    """One configured feed."""
+
+    url: str
+    category: str
+    source: str  # short name: bbc, coindesk, ...
+    host: str
+
+
+def _source_for(url: str, host: str) -> str:
+    """Known sources by name; otherwise the host without www. (vd. www.theverge.com -> theverge)."""
+    source = _source_from_url(url)
+    if source != "unknown" or not host:
+        return source
+    parts = host.split(".")
+    if parts[0] == "www":
+        parts = parts[1:]
+    return parts[0] if len(parts) > 1 else host
+
+
+def build_registry(
+    feeds_by_category: Optional[Dict[str, List[Union[str, dict]]]] = None,
+) -> List[FeedSpec]:
+    """
+    Build FeedSpecs in config order.
+    Mỗi feed trong config là URL (str) hoặc dict {"url": ..., "source": ...} nếu cần đặt tên nguồn.
+    """
+    feeds = feeds_by_category if feeds_by_category is not None else RSS_FEEDS_BY_CATEGORY
+    specs: List[FeedSpec] = []
+    for category, entries in feeds.items():
+        for entry in entries:
+            if isinstance(entry, dict):
+                url, source = entry["url"], entry.get("source")
+            else:
+                url, source = entry, None
+            host = host_of(url)
+            specs.append(FeedSpec(url=url, category=category, source=source or _source_for(url, host), host=host))
+    return specs
+
+
+def feeds_for(
+    category: Optional[str] = None,
+    source: Optional[str] = None,
+) -> List[FeedSpec]:
+    """Configured feeds filtered by category and/or source."""
+    return [
+        s
+        for s in build_registry()
+        if (category is None or s.category == category) and (source is None or s.source == source)
+    ]
@@ -1,3 +1,28 @@
-from .mongo import get_db, get_articles_collection, get_existing_links, save_article, save_articles
+from .mongo import (
+    get_db,
+    get_articles_collection,
+    get_existing_links,
+    save_article,
+    save_articles,
+    SaveResult,
+    get_feed_state_collection,
+    load_feed_states,
+    save_feed_states,
+    get_translation_memory_collection,
+)
+from .link_index import LinkIndex, get_link_index
 
-__all__ = ["get_db", "get_articles_collection", "get_existing_links", "save_article", "save_articles"]
+__all__ = [
+    "get_db",
+    "get_articles_collection",
+    "get_existing_links",
+    "save_article",
+    "save_articles",
+    "SaveResult",
+    "get_feed_state_collection",
+    "load_feed_states",
+    "save_feed_states",
+    "get_translation_memory_collection",
+    "LinkIndex",
+    "get_link_index",
+]
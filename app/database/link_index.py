@@ -0,0 +1,161 @@
+"""In-memory link index for crawl dedup: exact set for recent links + Bloom filter for older ones."""
+import hashlib
+import math
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set
+
+from bson import ObjectId
+
+from app.config import DEDUP_RECENT_DAYS, DEDUP_BLOOM_FP_RATE
+from .mongo import get_articles_collection
+
+# Khi refresh tăng dần theo _id, lùi lại một chút để không sót bài do process khác insert cùng lúc
+_REFRESH_OVERLAP = timedelta(minutes=5)
+# Bloom filter dựng với sức chứa gấp N lần số bài hiện có; đầy thì dựng lại từ Mongo
+_BLOOM_HEADROOM = 2
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over str keys (double hashing on blake2b)."""
+
+    def __init__(self, capacity: int, fp_rate: float):
+        capacity = max(capacity, 1000)
+        self.capacity = capacity
+        self.count = 0
+        self.size = max(8, int(-capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: str) -> None:
+        self.count += 1
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class LinkIndex:
+    """
+    Dedup index for one crawler process.
+    - Link crawl trong DEDUP_RECENT_DAYS ngày gần đây: dict chính xác link -> crawled_at (không cần hỏi Mongo).
+    - Link cũ hơn: Bloom filter; chỉ khi Bloom báo "có thể có" mới hỏi Mongo (một query $in cho cả batch).
+    refresh() lần đầu quét toàn bộ link, các lần sau chỉ lấy bài mới theo _id và chuyển link quá hạn
+    sang Bloom filter; Bloom filter đầy (vượt sức chứa) thì được dựng lại từ Mongo với dư địa.
+    """
+
+    def __init__(self, recent_days: int = DEDUP_RECENT_DAYS, fp_rate: float = DEDUP_BLOOM_FP_RATE):
+        self.recent_days = recent_days
+        self.fp_rate = fp_rate
+        self._lock = threading.Lock()
+        self._recent: Dict[str, datetime] = {}
+        self._older: Optional[BloomFilter] = None
+        self._last_id: Optional[ObjectId] = None
+        self.stats = {"lookups": 0, "mongo_queries": 0, "bloom_positives": 0, "false_positives": 0}
+
+    def _load(self) -> None:
+        """Full scan: recent links into the dict, older ones into a Bloom filter sized with headroom."""
+        col = get_articles_collection()
+        cutoff = datetime.utcnow() - timedelta(days=self.recent_days)
+        older = BloomFilter(col.estimated_document_count() * _BLOOM_HEADROOM, self.fp_rate)
+        recent: Dict[str, datetime] = {}
+        last_id = None
+        for doc in col.find({}, {"link": 1, "crawled_at": 1}):
+            crawled_at = doc.get("crawled_at")
+            if isinstance(crawled_at, datetime) and crawled_at >= cutoff:
+                recent[doc["link"]] = crawled_at
+            else:
+                older.add(doc["link"])
+            if last_id is None or doc["_id"] > last_id:
+                last_id = doc["_id"]
+        with self._lock:
+            self._older, self._recent, self._last_id = older, recent, last_id
+
+    def _age(self) -> None:
+        """Move links crawled more than recent_days ago from the exact dict into the Bloom filter."""
+        cutoff = datetime.utcnow() - timedelta(days=self.recent_days)
+        with self._lock:
+            expired = [link for link, seen in self._recent.items() if seen < cutoff]
+            for link in expired:
+                self._older.add(link)
+                del self._recent[link]
+
+    def refresh(self) -> None:
+        """
+        Load links inserted since the last refresh (all links on first call, or when the Bloom
+        filter is full). One query; then age out links older than recent_days.
+        """
+        if self._older is None or self._older.count >= self._older.capacity:
+            self._load()
+            return
+
+        query = {}
+        if self._last_id is not None:
+            since = self._last_id.generation_time - _REFRESH_OVERLAP
+            query = {"_id": {"$gt": ObjectId.from_datetime(since)}}
+        now = datetime.utcnow()
+        links: Dict[str, datetime] = {}
+        last_id = self._last_id
+        for doc in get_articles_collection().find(query, {"link": 1, "crawled_at": 1}):
+            crawled_at = doc.get("crawled_at")
+            links[doc["link"]] = crawled_at if isinstance(crawled_at, datetime) else now
+            if last_id is None or doc["_id"] > last_id:
+                last_id = doc["_id"]
+        with self._lock:
+            self._recent.update(links)
+            self._last_id = last_id
+        self._age()
+
+    def is_recent(self, link: str) -> bool:
+        """Exact, memory-only check against recently crawled links (no Mongo)."""
+        with self._lock:
+            return link in self._recent
+
+    def existing(self, links: Iterable[str]) -> Set[str]:
+        """Return the subset of links already in DB. At most one Mongo query (for Bloom positives)."""
+        found: Set[str] = set()
+        maybe: List[str] = []
+        with self._lock:
+            for link in set(links):
+                self.stats["lookups"] += 1
+                if link in self._recent:
+                    found.add(link)
+                elif self._older is not None and link in self._older:
+                    maybe.append(link)
+        if maybe:
+            col = get_articles_collection()
+            hits = {doc["link"] for doc in col.find({"link": {"$in": maybe}}, {"link": 1})}
+            with self._lock:
+                self.stats["mongo_queries"] += 1
+                self.stats["bloom_positives"] += len(maybe)
+                self.stats["false_positives"] += len(maybe) - len(hits)
+                # Bài cũ vẫn còn trong feed: giữ trong dict để các vòng sau không hỏi lại Mongo
+                now = datetime.utcnow()
+                self._recent.update((link, now) for link in hits)
+            found |= hits
+        return found
+
+    def add(self, links: Iterable[str]) -> None:
+        """Record links just inserted by this process."""
+        now = datetime.utcnow()
+        with self._lock:
+            self._recent.update((link, now) for link in links)
+
+
+_index: Optional[LinkIndex] = None
+
+
+def get_link_index() -> LinkIndex:
+    """Process-wide LinkIndex (kept across cycles of `all --loop`)."""
+    global _index
+    if _index is None:
+        _index = LinkIndex()
+    return _index
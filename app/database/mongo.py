@@ -1,13 +1,15 @@
 """MongoDB connection and article persistence."""
-from typing import List, Set
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Union
 
 import certifi
-from pymongo import MongoClient, ASCENDING
+from pymongo import MongoClient, ASCENDING, UpdateOne
 from pymongo.database import Database
 from pymongo.collection import Collection
+from pymongo.errors import DuplicateKeyError, PyMongoError
 
-from app.config import MONGO_URI, DB_NAME, ARTICLES_COLLECTION
-from app.models import Article, article_to_doc
+from app.config import MONGO_URI, DB_NAME, ARTICLES_COLLECTION, FEED_STATE_COLLECTION, TRANSLATION_MEMORY_COLLECTION
+from app.models import Article, CrawlRecord, article_to_doc
 
 _client: MongoClient | None = None
 
@@ -35,6 +37,32 @@ def get_articles_collection() -> Collection:
     return col
 
 
+def get_feed_state_collection() -> Collection:
+    """Per-feed state (validators, ...), one document per feed URL (_id = url)."""
+    return get_db()[FEED_STATE_COLLECTION]
+
+
+def get_translation_memory_collection() -> Collection:
+    """Translation memory, one document per (model, kind, normalized source) hash (_id)."""
+    return get_db()[TRANSLATION_MEMORY_COLLECTION]
+
+
+def load_feed_states() -> Dict[str, dict]:
+    """Return {feed_url: state} for all feeds (one query)."""
+    col = get_feed_state_collection()
+    return {doc["_id"]: {k: v for k, v in doc.items() if k != "_id"} for doc in col.find({})}
+
+
+def save_feed_states(states: Dict[str, dict]) -> int:
+    """Upsert state fields for several feeds in one bulk write. Return number of feeds written."""
+    if not states:
+        return 0
+    col = get_feed_state_collection()
+    ops = [UpdateOne({"_id": url}, {"$set": fields}, upsert=True) for url, fields in states.items()]
+    col.bulk_write(ops, ordered=False)
+    return len(ops)
+
+
 def get_existing_links(links: List[str]) -> Set[str]:
     """Return set of links that already exist in the articles collection."""
     if not links:
@@ -57,25 +85,64 @@ def save_article(article: Article) -> bool:
         return False
 
 
-def save_articles(articles: List[Article]) -> int:
-    """Save only articles chưa có trong DB (theo link). Không tạo duplicate, không ghi đè tin cũ."""
+def _to_doc(article: Union[Article, CrawlRecord]) -> dict:
+    """BSON-ready document; CrawlRecords are validated here, at persistence time."""
+    if isinstance(article, CrawlRecord):
+        return article.to_doc()
+    return article_to_doc(article)
+
+
+@dataclass
+class SaveResult:
+    """Kết quả save_articles: link vừa insert và link đã có trong DB (bỏ qua / bị unique index chặn)."""
+
+    inserted: List[str] = field(default_factory=list)
+    duplicates: List[str] = field(default_factory=list)
+
+    @property
+    def saved(self) -> int:
+        return len(self.inserted)
+
+    @property
+    def stored_links(self) -> List[str]:
+        """Links that are in the DB after this call (bài lỗi insert / không hợp lệ không có ở đây)."""
+        return self.inserted + self.duplicates
+
+
+def save_articles(articles: List[Union[Article, CrawlRecord]], existing: Optional[Set[str]] = None) -> SaveResult:
+    """
+    Save only articles chưa có trong DB (theo link). Không tạo duplicate, không ghi đè tin cũ.
+    existing: link đã biết là có trong DB (vd. từ LinkIndex) → bỏ qua query $in; unique index vẫn chặn trùng.
+    """
+    result = SaveResult()
     if not articles:
-        return 0
+        return result
     col = get_articles_collection()
-    links = [a.link for a in articles]
-    existing = set(
-        doc["link"]
-        for doc in col.find({"link": {"$in": links}}, {"link": 1})
-    )
-    saved = 0
+    if existing is None:
+        links = [a.link for a in articles]
+        existing = set(
+            doc["link"]
+            for doc in col.find({"link": {"$in": links}}, {"link": 1})
+        )
+    else:
+        existing = set(existing)
     for a in articles:
         if a.link in existing:
+            result.duplicates.append(a.link)
+            continue
+        try:
+            doc = _to_doc(a)
+        except ValueError as e:
+            print(f"[Save] Skipping invalid article {a.link!r}: {e}")
             continue
-        doc = article_to_doc(a)
         try:
             col.insert_one(doc)
-            existing.add(a.link)
-            saved += 1
-        except Exception:
-            pass
-    return saved
+        except DuplicateKeyError:
+            result.duplicates.append(a.link)
+        except PyMongoError as e:
+            print(f"[Save] Insert failed for {a.link!r}: {e}")
+            continue
+        else:
+            result.inserted.append(a.link)
+        existing.add(a.link)
+    return result
@@ -1,3 +1,35 @@
-from .content_extractor import extract_content, extract_hero_image
+from .content_extractor import (
+    PageExtract,
+    extract_content,
+    extract_hero_image,
+    extract_page,
+    fetch_hero_image,
+    parse_page,
+)
+from .hero_image import HERO_RULES, HeroRule, find_hero_image, hero_from_feed, scan_head
+from .html_cache import HtmlCache, get_html_cache
+from .parse_pool import get_parse_pool, shutdown_parse_pool
+from .quality import ContentQuality, score_content
+from .pool import extract_many, extract_many_offloaded
 
-__all__ = ["extract_content", "extract_hero_image"]
+__all__ = [
+    "PageExtract",
+    "extract_content",
+    "extract_hero_image",
+    "extract_page",
+    "fetch_hero_image",
+    "parse_page",
+    "HERO_RULES",
+    "HeroRule",
+    "find_hero_image",
+    "hero_from_feed",
+    "scan_head",
+    "HtmlCache",
+    "get_html_cache",
+    "get_parse_pool",
+    "shutdown_parse_pool",
+    "ContentQuality",
+    "score_content",
+    "extract_many",
+    "extract_many_offloaded",
+]
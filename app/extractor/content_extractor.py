@@ -1,29 +1,90 @@
 """Extract full article content from URL (optional step after RSS)."""
+import codecs
 import re
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
 
-import requests
 from bs4 import BeautifulSoup
 from trafilatura import extract
 
-from app.config import FETCH_TIMEOUT
+from app.config import EXTRACT_MAX_BYTES, HERO_IMAGE_SIZE, HTML_CACHE_ENABLED
+from app.net import http_client
+from .hero_image import find_hero_image, scan_head
+from .html_cache import get_html_cache
+from .quality import score_content
 
 # Minimum chars from trafilatura to consider it "main content" (avoid nav-only)
 _MIN_MAIN_CONTENT = 200
+# Meta tags kept in Article.og
+_OG_PREFIXES = ("og:", "article:")
+# Content-Type được coi là trang HTML (không có header cũng chấp nhận)
+_HTML_TYPES = ("text/html", "application/xhtml+xml")
+_CHUNK_BYTES = 64 * 1024
+_CHARSET_RE = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.I)
+_META_CHARSET_RE = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?([\w.:-]+)", re.I)
 
 
-def _fetch_html(url: str) -> Optional[str]:
-    """Fetch page HTML with our timeout and user-agent."""
+def _read_html(r) -> Optional[str]:
+    """
+    Decode a streamed response, at most EXTRACT_MAX_BYTES (sau giải nén). None if it is not HTML.
+    Charset từ header, không có thì từ <meta charset> trong chunk đầu, mặc định utf-8; giải mã tăng dần theo chunk.
+    """
+    content_type = r.headers.get("Content-Type", "")
+    mime = content_type.split(";")[0].strip().lower()
+    if mime and mime not in _HTML_TYPES:
+        return None
+    m = _CHARSET_RE.search(content_type)
+    encoding = m.group(1) if m else None
+    decoder = None
+    parts = []
+    received = 0
+    for chunk in r.iter_content(chunk_size=_CHUNK_BYTES):
+        if decoder is None:
+            if encoding is None:
+                meta = _META_CHARSET_RE.search(chunk[:4096])
+                encoding = meta.group(1).decode("ascii", "replace") if meta else "utf-8"
+            try:
+                decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+            except LookupError:
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        chunk = chunk[:EXTRACT_MAX_BYTES - received]
+        received += len(chunk)
+        parts.append(decoder.decode(chunk))
+        if received >= EXTRACT_MAX_BYTES:
+            # Đủ phần đầu trang (head, hero, thân bài); phần còn lại không tải
+            break
+    if decoder is not None:
+        parts.append(decoder.decode(b"", final=True))
+    return "".join(parts)
+
+
+def _fetch_html(url: str, use_cache: bool = True) -> Optional[str]:
+    """
+    Fetch page HTML through the shared pooled client (timeout, user-agent, compression).
+    Streamed: non-HTML responses are dropped after the headers, bodies are capped at EXTRACT_MAX_BYTES.
+    Với HTML_CACHE_ENABLED, trang đã tải trong HTML_CACHE_TTL_DAYS được đọc từ cache trên đĩa.
+    use_cache=False: luôn tải lại (bản mới vẫn được ghi vào cache).
+    """
+    cache = get_html_cache() if HTML_CACHE_ENABLED else None
+    if cache is not None and use_cache:
+        html = cache.get(url)
+        if html is not None:
+            return html
     try:
-        r = requests.get(
-            url,
-            timeout=FETCH_TIMEOUT,
-            headers={"User-Agent": "NewsCrawler/1.0"},
-        )
-        r.raise_for_status()
-        return r.text
+        r = http_client.get(url, stream=True)
+        try:
+            r.raise_for_status()
+            html = _read_html(r)
+        finally:
+            r.close()
     except Exception:
         return None
+    if cache is not None and html:
+        try:
+            cache.put(url, html)
+        except OSError as e:
+            print(f"[HtmlCache] write failed: {e}")
+    return html
 
 
 def _fallback_full_page_text(html: str) -> Optional[str]:
@@ -36,17 +97,8 @@ def _fallback_full_page_text(html: str) -> Optional[str]:
     return text[:50000] if text else None
 
 
-def extract_content(url: str) -> Optional[str]:
-    """
-    Fetch URL and extract main article text only (not nav, footer, related links).
-    Uses trafilatura for main-content extraction; falls back to full-page text if needed.
-    Returns None on failure or if no meaningful text.
-    """
-    html = _fetch_html(url)
-    if not html:
-        return None
-
-    # Extract only main article body (strips headers, footers, nav, related blocks)
+def _main_text(html: str, url: str) -> Optional[str]:
+    """Main article body via trafilatura (strips headers, footers, nav, related blocks); None if too short."""
     main_text = extract(
         html,
         url=url,
@@ -57,51 +109,79 @@ def extract_content(url: str) -> Optional[str]:
     if main_text and len(main_text.strip()) >= _MIN_MAIN_CONTENT:
         normalized = re.sub(r"\n\s*\n", "\n\n", main_text.strip())
         return normalized[:50000]
-    # Fallback if trafilatura didn't find a clear article (e.g. some SPA/JSON pages)
-    return _fallback_full_page_text(html)
+    return None
 
 
-def extract_hero_image(url: str, size: int = 800) -> Optional[str]:
+def extract_content(url: str) -> Optional[str]:
     """
-    Extract hero image from BBC article URL.
-    Prioritizes cpsprodpb images from hero-image element over branded_news og:image.
-    Available sizes: 240, 320, 480, 640, 800, 1024, 1536
+    Fetch URL and extract main article text only (not nav, footer, related links).
+    Uses trafilatura for main-content extraction; falls back to full-page text if needed.
+    Returns None on failure or if no meaningful text.
     """
     html = _fetch_html(url)
     if not html:
         return None
+    # Fallback if trafilatura didn't find a clear article (e.g. some SPA/JSON pages)
+    return _main_text(html, url) or _fallback_full_page_text(html)
 
-    soup = BeautifulSoup(html, "html.parser")
 
-    # Priority 1: Look for hero-image element with cpsprodpb URL (better quality)
-    hero_div = soup.find(attrs={"data-testid": "hero-image"})
-    if hero_div:
-        img = hero_div.find("img")
-        if img:
-            # Try srcset first (contains multiple sizes)
-            srcset = img.get("srcset", "")
-            if srcset and "cpsprodpb" in srcset:
-                # Extract any cpsprodpb URL from srcset and resize
-                match = re.search(r"(https://ichef\.bbci\.co\.uk/news/\d+/cpsprodpb/[^\s]+)", srcset)
-                if match:
-                    img_url = match.group(1)
-                    return re.sub(r"/news/\d+/", f"/news/{size}/", img_url)
-            # Try src attribute
-            src = img.get("src", "")
-            if src and "cpsprodpb" in src:
-                return re.sub(r"/news/\d+/", f"/news/{size}/", src)
-
-    # Priority 2: Look for any img with cpsprodpb URL in article
-    for img in soup.find_all("img"):
-        src = img.get("src", "")
-        if "ichef.bbci.co.uk/news/" in src and "cpsprodpb" in src:
-            return re.sub(r"/news/\d+/", f"/news/{size}/", src)
-
-    # Fallback: og:image meta tag (may have branded_news URL)
-    og_image = soup.find("meta", property="og:image")
-    if og_image and og_image.get("content"):
-        img_url = og_image["content"]
-        if "ichef.bbci.co.uk/news/" in img_url:
-            return re.sub(r"/news/\d+/", f"/news/{size}/", img_url)
-        return img_url
-    return None
+def fetch_hero_image(url: str, size: int = 800, use_cache: bool = True) -> Tuple[bool, Optional[str]]:
+    """
+    Extract hero image from article URL (per-source rules in hero_image.HERO_RULES).
+    BBC: prioritizes cpsprodpb images from hero-image element over branded_news og:image.
+    Available BBC sizes: 240, 320, 480, 640, 800, 1024, 1536
+    use_cache=False: bỏ qua HTML cache (thử lại trang mà lần trước không có ảnh).
+    Returns (fetched, image): fetched=False khi không tải được trang (timeout, 5xx, không phải HTML...),
+    khác với trang tải được nhưng không có ảnh (True, None).
+    """
+    html = _fetch_html(url, use_cache=use_cache)
+    if not html:
+        return False, None
+    return True, find_hero_image(html, url, size)
+
+
+def extract_hero_image(url: str, size: int = 800, use_cache: bool = True) -> Optional[str]:
+    """fetch_hero_image without the fetch status: the image URL, or None."""
+    return fetch_hero_image(url, size, use_cache)[1]
+
+
+@dataclass
+class PageExtract:
+    """Everything taken from one article page download."""
+
+    content: Optional[str] = None
+    hero_image: Optional[str] = None
+    canonical_url: Optional[str] = None
+    og: Dict[str, str] = field(default_factory=dict)
+    quality: Optional[str] = None  # article / boilerplate / empty (quality.score_content)
+    quality_score: Optional[float] = None
+
+
+def parse_page(html: str, url: str, size: int = HERO_IMAGE_SIZE) -> PageExtract:
+    """
+    CPU part of extract_page: main text (with its quality label), hero image, og: metadata and canonical URL.
+    Hero/meta chỉ quét <head> + khối hero; BeautifulSoup chỉ chạy khi trafilatura không tìm được bài.
+    """
+    head = scan_head(html)
+    og = {k: v[:1000] for k, v in head.meta.items() if k.startswith(_OG_PREFIXES)}
+    content = _main_text(html, url) or _fallback_full_page_text(html)
+    quality = score_content(content, html)
+    return PageExtract(
+        content=content,
+        hero_image=find_hero_image(html, url, size, head),
+        canonical_url=head.canonical or og.get("og:url"),
+        og=og,
+        quality=quality.label,
+        quality_score=quality.score,
+    )
+
+
+def extract_page(url: str, size: int = HERO_IMAGE_SIZE) -> Optional[PageExtract]:
+    """
+    Fetch the article page once and extract main text, hero image, og: metadata and canonical URL.
+    Returns None if the page could not be fetched.
+    """
+    html = _fetch_html(url)
+    if not html:
+        return None
+    return parse_page(html, url, size)
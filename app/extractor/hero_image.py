@@ -0,0 +1,195 @@
+"""
+Fast hero image / head metadata extraction: regex scan of <head> and the first hero block only.
+Không dựng cây BeautifulSoup cho cả trang; thẻ meta/link/img được tách bằng regex trên đoạn đầu tài liệu.
+"""
+import html as html_lib
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Mapping, Optional, Pattern, Tuple
+from urllib.parse import urljoin, urlparse
+
+from app.config import HERO_IMAGE_SIZE
+
+# <head> dài hơn mức này (inline script/style khổng lồ) thì chỉ quét tới đây
+_HEAD_LIMIT = 512 * 1024
+# Khối hero phải bắt đầu trong đoạn đầu <body>; chỉ đọc _BLOCK_CHARS ký tự sau marker
+_BODY_SCAN = 256 * 1024
+_BLOCK_CHARS = 8 * 1024
+
+_HEAD_END_RE = re.compile(r"</head\s*>|<body[\s>]", re.I)
+_TAG_RE = re.compile(r"<(meta|link|img|source)\b([^>]*)>", re.I)
+_ATTR_RE = re.compile(r"""([\w:.-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""")
+
+
+def _attrs(raw: str) -> Dict[str, str]:
+    out: Dict[str, str] = {}
+    for m in _ATTR_RE.finditer(raw):
+        name = m.group(1).lower()
+        if name not in out:
+            value = m.group(2) if m.group(2) is not None else m.group(3) if m.group(3) is not None else m.group(4)
+            out[name] = html_lib.unescape(value)
+    return out
+
+
+@dataclass
+class HeadScan:
+    """Meta tags and canonical link of a page, plus where <head> ends."""
+
+    meta: Dict[str, str] = field(default_factory=dict)  # property/name -> content (first wins)
+    canonical: Optional[str] = None
+    head_end: int = 0
+
+
+def scan_head(html: str) -> HeadScan:
+    """Collect <meta> and <link rel="canonical"> up to </head> (or <body>)."""
+    m = _HEAD_END_RE.search(html, 0, _HEAD_LIMIT)
+    end = m.start() if m else min(len(html), _HEAD_LIMIT)
+    scan = HeadScan(head_end=end)
+    for tag in _TAG_RE.finditer(html, 0, end):
+        name = tag.group(1).lower()
+        if name == "meta":
+            a = _attrs(tag.group(2))
+            key = a.get("property") or a.get("name")
+            value = (a.get("content") or "").strip()
+            if key and value and key not in scan.meta:
+                scan.meta[key] = value
+        elif name == "link" and scan.canonical is None:
+            a = _attrs(tag.group(2))
+            if "canonical" in a.get("rel", "").lower().split() and a.get("href"):
+                scan.canonical = a["href"].strip()
+    return scan
+
+
+def _srcset_urls(srcset: str) -> List[str]:
+    """URLs of a srcset, largest width descriptor first."""
+    candidates: List[Tuple[int, str]] = []
+    for part in srcset.split(","):
+        bits = part.strip().split()
+        if not bits:
+            continue
+        width = 0
+        if len(bits) > 1 and bits[1].endswith("w") and bits[1][:-1].isdigit():
+            width = int(bits[1][:-1])
+        candidates.append((width, bits[0]))
+    return [u for _, u in sorted(candidates, key=lambda c: -c[0])]
+
+
+def _bbc_resize(url: str, size: int) -> str:
+    """
+    ichef.bbci.co.uk/news/<w>/... (và /ace/standard/<w>/... trong feed) → kích thước <size>
+    (240, 320, 480, 640, 800, 1024, 1536).
+    """
+    if "ichef.bbci.co.uk/" in url:
+        return re.sub(r"/(news|ace/standard)/\d+/", rf"/\g<1>/{size}/", url, count=1)
+    return url
+
+
+def _width_option(url: str, size: int) -> str:
+    """Cloudflare image options (…/cdn-cgi/image/…,width=1434/…) → width=<size>."""
+    if "/cdn-cgi/image/" in url:
+        return re.sub(r"\bwidth=\d+", f"width={size}", url, count=1)
+    return url
+
+
+@dataclass(frozen=True)
+class HeroRule:
+    """
+    Per-source hero rule. block_marker: chuỗi mở khối hero trong <body> (ảnh trong khối được ưu tiên),
+    accept: ảnh trong khối / trong feed phải khớp pattern, resize: đổi URL sang kích thước yêu cầu,
+    scan_body: không có khối hero thì dùng <img> đầu tiên trong body khớp accept (trước og:image),
+    feed_keys: ảnh nào của feed entry (thumbnail, media_content) chính là ảnh hero → không cần tải trang.
+    """
+
+    hosts: Tuple[str, ...]
+    block_marker: Optional[str] = None
+    accept: Optional[Pattern] = None
+    resize: Optional[Callable[[str, int], str]] = None
+    scan_body: bool = False
+    meta_keys: Tuple[str, ...] = ("og:image", "twitter:image", "twitter:image:src")
+    feed_keys: Tuple[str, ...] = ()
+
+
+HERO_RULES: Tuple[HeroRule, ...] = (
+    # BBC: ảnh cpsprodpb trong khối hero nét hơn og:image (branded_news có logo)
+    HeroRule(
+        hosts=("bbc.co.uk", "bbc.com"),
+        block_marker='data-testid="hero-image"',
+        accept=re.compile(r"ichef\.bbci\.co\.uk/(?:news|ace/standard)/\d+/cpsprodpb/"),
+        resize=_bbc_resize,
+        scan_body=True,
+        # media:thumbnail là ảnh hero ở kích thước 240
+        feed_keys=("thumbnail",),
+    ),
+    HeroRule(hosts=("coindesk.com",), feed_keys=("media_content",)),
+    HeroRule(hosts=("cointelegraph.com",), resize=_width_option, feed_keys=("media_content",)),
+    HeroRule(hosts=("newatlas.com",)),
+    HeroRule(hosts=("zdnet.com",)),
+    HeroRule(hosts=("artificialintelligence-news.com",)),
+)
+_DEFAULT_RULE = HeroRule(hosts=())
+
+
+def rule_for(url: str) -> HeroRule:
+    host = (urlparse(url).hostname or "").lower()
+    for rule in HERO_RULES:
+        if any(host == h or host.endswith("." + h) for h in rule.hosts):
+            return rule
+    return _DEFAULT_RULE
+
+
+def _block_image(html: str, head_end: int, rule: HeroRule) -> Optional[str]:
+    start = html.find(rule.block_marker, head_end, head_end + _BODY_SCAN)
+    if start < 0:
+        return None
+    for tag in _TAG_RE.finditer(html, start, start + _BLOCK_CHARS):
+        if tag.group(1).lower() not in ("img", "source"):
+            continue
+        a = _attrs(tag.group(2))
+        for candidate in _srcset_urls(a.get("srcset", "")) + [a.get("src", "")]:
+            if candidate and (rule.accept is None or rule.accept.search(candidate)):
+                return candidate
+    return None
+
+
+def _body_image(html: str, head_end: int, rule: HeroRule) -> Optional[str]:
+    """First <img src> in the body that matches rule.accept (trang không có khối hero)."""
+    for tag in _TAG_RE.finditer(html, head_end):
+        if tag.group(1).lower() != "img":
+            continue
+        src = _attrs(tag.group(2)).get("src", "")
+        if src and rule.accept.search(src):
+            return src
+    return None
+
+
+def find_hero_image(html: str, url: str, size: int = HERO_IMAGE_SIZE, head: Optional[HeadScan] = None) -> Optional[str]:
+    """
+    Hero image of an article page: the source's hero block first (if it has one), then a matching
+    <img> anywhere in the body (rules with scan_body), then og:image / twitter:image.
+    Pass head (from scan_head) to avoid scanning <head> twice.
+    """
+    rule = rule_for(url)
+    head = head or scan_head(html)
+    img = _block_image(html, head.head_end, rule) if rule.block_marker else None
+    if img is None and rule.scan_body and rule.accept is not None:
+        img = _body_image(html, head.head_end, rule)
+    if img is None:
+        img = next((head.meta[k] for k in rule.meta_keys if head.meta.get(k)), None)
+    if img is None:
+        return None
+    img = urljoin(url, img)
+    return rule.resize(img, size) if rule.resize else img
+
+
+def hero_from_feed(url: str, entry: Mapping[str, Optional[str]], size: int = HERO_IMAGE_SIZE) -> Optional[str]:
+    """
+    Hero image derived from the feed entry's own images (no page fetch), or None when
+    the source has no feed rule. entry: {"thumbnail": ..., "media_content": ...}.
+    """
+    rule = rule_for(url)
+    for key in rule.feed_keys:
+        img = entry.get(key)
+        if img and (rule.accept is None or rule.accept.search(img)):
+            img = urljoin(url, img)
+            return rule.resize(img, size) if rule.resize else img
+    return None
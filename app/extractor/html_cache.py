@@ -0,0 +1,259 @@
+"""
+Local store for fetched article HTML: content-addressed, compressed, append-only pack files.
+
+Layout trong HTML_CACHE_DIR:
+  pack-000001.bin ...  blob nén nối tiếp nhau (zstd nếu có zstandard, không thì gzip/zlib)
+  index.jsonl          mỗi dòng một lần fetch: url, digest, fetched_at, pack, offset, length, codec
+  .lock                flock giữ suốt đời process đang ghi
+Blob được khoá theo sha256 của HTML nên trang không đổi chỉ lưu một lần. Đọc lại qua mmap.
+Một process ghi (process đầu tiên lấy được .lock); process khác mở cache chỉ đọc (put bị bỏ qua,
+không evict). Pack chỉ được nối thêm nên offset đã đọc vẫn đúng. Các thread dùng chung qua lock.
+"""
+import hashlib
+import json
+import mmap
+import os
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from app.config import HTML_CACHE_DIR, HTML_CACHE_MAX_MB, HTML_CACHE_TTL_DAYS
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: không có flock, giả định một process như trước
+    fcntl = None
+
+# Pack mới khi pack hiện tại vượt quá kích thước này; eviction xoá nguyên pack cũ nhất
+_PACK_BYTES = 64 * 2**20
+_INDEX = "index.jsonl"
+_LOCK = ".lock"
+
+
+class _Blob(NamedTuple):
+    pack: int
+    offset: int
+    length: int
+    codec: str
+
+
+class _Entry(NamedTuple):
+    digest: str
+    fetched_at: float
+
+
+def _compress(data: bytes):
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=6).compress(data), "zstd"
+    return zlib.compress(data, 6), "zlib"
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("zstandard not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+class HtmlCache:
+    """URL → latest fetched HTML, kept for HTML_CACHE_TTL_DAYS and at most HTML_CACHE_MAX_MB on disk."""
+
+    def __init__(self, root: str = HTML_CACHE_DIR, max_bytes: int = HTML_CACHE_MAX_MB * 2**20,
+                 ttl: float = HTML_CACHE_TTL_DAYS * 86400):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._urls: Dict[str, _Entry] = {}
+        self._blobs: Dict[str, _Blob] = {}
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._pack = 0
+        self._pack_file = None
+        self._index_file = None
+        self.hits = 0
+        self.misses = 0
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.read_only = False
+        self._lock_file = open(self.root / _LOCK, "a")
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                self.read_only = True
+                print(f"[HtmlCache] {self.root} is in use by another process; opened read-only.")
+        self._load()
+
+    def _pack_path(self, n: int) -> Path:
+        return self.root / f"pack-{n:06d}.bin"
+
+    def _packs(self) -> List[int]:
+        return sorted(int(p.stem.split("-")[1]) for p in self.root.glob("pack-*.bin"))
+
+    def _load(self) -> None:
+        """Replay index.jsonl (dòng hỏng ở cuối do crash bị bỏ qua), then evict and compact."""
+        path = self.root / _INDEX
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                        self._blobs[rec["d"]] = _Blob(rec["p"], rec["o"], rec["n"], rec["c"])
+                        self._urls[rec["u"]] = _Entry(rec["d"], rec["t"])
+                    except (ValueError, KeyError):
+                        continue
+        packs = self._packs()
+        self._pack = packs[-1] if packs else 1
+        if not self.read_only:
+            self._evict()
+
+    def _record(self, url: str, digest: str, fetched_at: float) -> str:
+        b = self._blobs[digest]
+        return json.dumps({"u": url, "d": digest, "t": fetched_at, "p": b.pack, "o": b.offset,
+                           "n": b.length, "c": b.codec}) + "\n"
+
+    def _rewrite_index(self) -> None:
+        """Compact: một dòng cho mỗi URL còn sống (ghi file tạm rồi os.replace)."""
+        if self._index_file:
+            self._index_file.close()
+            self._index_file = None
+        tmp = self.root / (_INDEX + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for url, e in self._urls.items():
+                f.write(self._record(url, e.digest, e.fetched_at))
+        os.replace(tmp, self.root / _INDEX)
+
+    def _drop_pack(self, n: int) -> None:
+        m = self._maps.pop(n, None)
+        if m is not None:
+            m.close()
+        try:
+            self._pack_path(n).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _evict(self) -> None:
+        """Drop entries past the TTL, delete packs nobody references, then oldest packs while over max_bytes."""
+        cutoff = time.time() - self.ttl
+        self._urls = {u: e for u, e in self._urls.items() if e.fetched_at >= cutoff and e.digest in self._blobs}
+        live = {self._blobs[e.digest].pack for e in self._urls.values()}
+        gone = set()
+        for n in self._packs():
+            if n != self._pack and n not in live:
+                self._drop_pack(n)
+                gone.add(n)
+        packs = self._packs()
+        total = sum(self._pack_path(n).stat().st_size for n in packs)
+        for n in packs:
+            if total <= self.max_bytes or n == self._pack:
+                break
+            total -= self._pack_path(n).stat().st_size
+            self._drop_pack(n)
+            gone.add(n)
+        self._blobs = {d: b for d, b in self._blobs.items() if b.pack not in gone}
+        self._urls = {u: e for u, e in self._urls.items() if e.digest in self._blobs}
+        self._rewrite_index()
+
+    def _append_blob(self, data: bytes) -> _Blob:
+        if self._pack_file is None:
+            self._pack_file = open(self._pack_path(self._pack), "ab")
+        if self._pack_file.tell() >= _PACK_BYTES:
+            self._pack_file.close()
+            self._pack += 1
+            self._evict()
+            self._pack_file = open(self._pack_path(self._pack), "ab")
+        blob, codec = _compress(data)
+        offset = self._pack_file.tell()
+        self._pack_file.write(blob)
+        self._pack_file.flush()
+        return _Blob(self._pack, offset, len(blob), codec)
+
+    def put(self, url: str, html: str, fetched_at: Optional[float] = None) -> str:
+        """Store one fetch of url (no-op when read-only). Return the content digest (sha256 hex)."""
+        data = html.encode("utf-8", errors="replace")
+        digest = hashlib.sha256(data).hexdigest()
+        fetched_at = fetched_at or time.time()
+        if self.read_only:
+            return digest
+        with self._lock:
+            if digest not in self._blobs:
+                self._blobs[digest] = self._append_blob(data)
+                self.raw_bytes += len(data)
+                self.stored_bytes += self._blobs[digest].length
+            self._urls[url] = _Entry(digest, fetched_at)
+            if self._index_file is None:
+                self._index_file = open(self.root / _INDEX, "a", encoding="utf-8")
+            self._index_file.write(self._record(url, digest, fetched_at))
+            self._index_file.flush()
+        return digest
+
+    def _read(self, b: _Blob) -> bytes:
+        m = self._maps.get(b.pack)
+        if m is None or b.offset + b.length > len(m):
+            # Pack đang ghi đã dài thêm từ lần map trước: map lại
+            if m is not None:
+                m.close()
+            with open(self._pack_path(b.pack), "rb") as f:
+                m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[b.pack] = m
+        return _decompress(m[b.offset:b.offset + b.length], b.codec)
+
+    def get(self, url: str, max_age: Optional[float] = None) -> Optional[str]:
+        """Latest cached HTML for url, or None if missing / older than max_age (default: TTL)."""
+        with self._lock:
+            e = self._urls.get(url)
+            if e is None or e.fetched_at < time.time() - (self.ttl if max_age is None else max_age):
+                self.misses += 1
+                return None
+            try:
+                data = self._read(self._blobs[e.digest])
+            except (OSError, ValueError, KeyError, zlib.error):
+                self._urls.pop(url, None)
+                self.misses += 1
+                return None
+            self.hits += 1
+        return data.decode("utf-8")
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = sum(self._pack_path(n).stat().st_size for n in self._packs())
+            return {
+                "urls": len(self._urls),
+                "blobs": len(self._blobs),
+                "disk_mib": round(size / 2**20, 1),
+                "hits": self.hits,
+                "misses": self.misses,
+                "ratio": round(self.raw_bytes / self.stored_bytes, 1) if self.stored_bytes else 0.0,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            for f in (self._pack_file, self._index_file, self._lock_file):
+                if f is not None:
+                    f.close()
+            self._pack_file = self._index_file = self._lock_file = None
+            for m in self._maps.values():
+                m.close()
+            self._maps.clear()
+
+
+_cache: Optional[HtmlCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_html_cache() -> HtmlCache:
+    """Process-wide cache opened on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = HtmlCache()
+        return _cache
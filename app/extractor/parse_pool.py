@@ -0,0 +1,89 @@
+"""
+Process pool for the CPU-bound half of extraction (trafilatura + BeautifulSoup).
+Thread tải trang (I/O), process parse HTML: parse không còn tranh GIL với nhau và với thread fetch.
+"""
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Tuple
+
+from app.config import EXTRACT_PARSE_PROCESSES, EXTRACT_PARSE_MAX_TASKS, HERO_IMAGE_SIZE
+from .content_extractor import PageExtract, parse_page
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+# future → pool đã nhận nó, để chỉ reset đúng pool bị hỏng
+_owners: "weakref.WeakKeyDictionary[Future, ProcessPoolExecutor]" = weakref.WeakKeyDictionary()
+
+
+def _parse_bytes(data: bytes, url: str, size: int) -> Tuple[PageExtract, float]:
+    """Runs in a worker process: HTML bytes in, (PageExtract, parse seconds) out."""
+    started = time.perf_counter()
+    page = parse_page(data.decode("utf-8", errors="replace"), url, size)
+    return page, time.perf_counter() - started
+
+
+def pool_size() -> int:
+    """EXTRACT_PARSE_PROCESSES, or one process per core when 0."""
+    return EXTRACT_PARSE_PROCESSES or os.cpu_count() or 1
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """
+    Shared pool, created on first use. Worker được thay mới sau EXTRACT_PARSE_MAX_TASKS trang
+    để giới hạn bộ nhớ (lxml/bs4 không trả lại heap cho OS).
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=pool_size(), max_tasks_per_child=EXTRACT_PARSE_MAX_TASKS or None)
+        return _pool
+
+
+def _reset_pool(broken: ProcessPoolExecutor) -> None:
+    """Drop a pool whose worker died (vd. OOM khi parse trang quá lớn); lần sau tạo pool mới."""
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def submit_parse(html: str, url: str, size: int = HERO_IMAGE_SIZE) -> Future:
+    """Queue one page for parsing; the future resolves to (PageExtract, parse seconds)."""
+    data = html.encode("utf-8", errors="replace")
+    for attempt in range(2):
+        pool = get_parse_pool()
+        try:
+            future = pool.submit(_parse_bytes, data, url, size)
+        except BrokenProcessPool:
+            _reset_pool(pool)
+            if attempt:
+                raise
+            continue
+        _owners[future] = pool
+        return future
+
+
+def parse_result(future: Future) -> Tuple[Optional[PageExtract], float]:
+    """Result of submit_parse; (None, 0.0) if parsing failed or the worker died."""
+    try:
+        return future.result()
+    except BrokenProcessPool:
+        pool = _owners.get(future)
+        if pool is not None:
+            _reset_pool(pool)
+    except Exception:
+        pass
+    return None, 0.0
+
+
+def shutdown_parse_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
@@ -0,0 +1,100 @@
+"""Concurrent article-page extraction: bounded worker pool with per-host limits, results streamed as they finish."""
+import queue
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+from app.config import EXTRACT_MAX_WORKERS, EXTRACT_HOST_CONCURRENCY, EXTRACT_HOST_MIN_INTERVAL
+from app.models import CrawlRecord
+from app.net.politeness import HostLimiter, host_of, run_per_host
+from .content_extractor import PageExtract, _fetch_html, extract_page
+from .parse_pool import parse_result, submit_parse
+
+_DONE = object()
+
+
+def extract_many(
+    records: Iterable[CrawlRecord],
+    extract: Callable[[str], Any] = extract_page,
+    max_workers: int = EXTRACT_MAX_WORKERS,
+    limiter: Optional[HostLimiter] = None,
+) -> Iterator[Tuple[CrawlRecord, Any, float]]:
+    """
+    Run extract(record.link) for every record on a bounded thread pool (default: extract_page).
+    Mỗi host tối đa EXTRACT_HOST_CONCURRENCY request đồng thời, cách nhau EXTRACT_HOST_MIN_INTERVAL giây.
+    Yields (record, result or None, seconds) in completion order.
+    """
+    limiter = limiter or HostLimiter(EXTRACT_HOST_CONCURRENCY, EXTRACT_HOST_MIN_INTERVAL)
+
+    def _run(record: CrawlRecord) -> Tuple[Any, float]:
+        started = time.perf_counter()
+        try:
+            result = extract(record.link)
+        except Exception:
+            result = None
+        return result, time.perf_counter() - started
+
+    for record, (result, elapsed) in run_per_host(
+        records, lambda r: host_of(r.link), _run, max_workers, limiter, thread_name_prefix="extract"
+    ):
+        yield record, result, elapsed
+
+
+def extract_many_offloaded(
+    records: Iterable[CrawlRecord],
+    max_workers: int = EXTRACT_MAX_WORKERS,
+    limiter: Optional[HostLimiter] = None,
+) -> Iterator[Tuple[CrawlRecord, Optional[PageExtract], float]]:
+    """
+    Same result as extract_many(records, extract_page), but threads only fetch HTML:
+    parse (trafilatura + BeautifulSoup) chạy trên process pool (parse_pool), nên dùng hết các core.
+    Each page is queued for parsing as soon as its fetch finishes, and results (fetch failures and
+    parsed pages alike) are yielded in completion order while other fetches are still running.
+    seconds = fetch + parse time of the article (không tính thời gian chờ trong hàng đợi).
+    """
+    limiter = limiter or HostLimiter(EXTRACT_HOST_CONCURRENCY, EXTRACT_HOST_MIN_INTERVAL)
+    # (record, parse future or None, fetch seconds); cuối cùng (_DONE, lỗi or None, số parse đã submit)
+    done: "queue.Queue[tuple]" = queue.Queue()
+
+    def _fetch(record: CrawlRecord) -> Tuple[Optional[str], float]:
+        started = time.perf_counter()
+        return _fetch_html(record.link), time.perf_counter() - started
+
+    def _fetch_all() -> None:
+        submitted, error = 0, None
+        try:
+            for record, (html, fetch_seconds) in run_per_host(
+                records, lambda r: host_of(r.link), _fetch, max_workers, limiter, thread_name_prefix="extract"
+            ):
+                if not html:
+                    done.put((record, None, fetch_seconds))
+                    continue
+                try:
+                    future = submit_parse(html, record.link)
+                except BrokenProcessPool:
+                    done.put((record, None, fetch_seconds))
+                    continue
+                submitted += 1
+                future.add_done_callback(lambda f, r=record, s=fetch_seconds: done.put((r, f, s)))
+        except Exception as e:
+            error = e
+        done.put((_DONE, error, submitted))
+
+    threading.Thread(target=_fetch_all, name="extract-fetch", daemon=True).start()
+    parses_left: Optional[int] = None  # biết khi fetch xong
+    parsed = 0
+    while parses_left is None or parsed < parses_left:
+        record, future, fetch_seconds = done.get()
+        if record is _DONE:
+            # Fetch xong: future = lỗi của luồng fetch (nếu có), fetch_seconds = số trang đã đưa đi parse
+            if future is not None:
+                raise future
+            parses_left = fetch_seconds
+            continue
+        if future is None:
+            yield record, None, fetch_seconds
+            continue
+        parsed += 1
+        page, parse_seconds = parse_result(future)
+        yield record, page, fetch_seconds + parse_seconds
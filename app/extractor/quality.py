@@ -0,0 +1,77 @@
+"""
+Cheap content quality gate: label extracted text as article, boilerplate or empty.
+Bài bị gắn boilerplate/empty không được đưa vào hàng đợi dịch (tiết kiệm lượt gọi Ollama).
+"""
+import html as html_lib
+import re
+from dataclasses import dataclass
+from typing import Optional, Set
+
+from app.config import CONTENT_MIN_WORDS, CONTENT_QUALITY_MIN
+
+ARTICLE = "article"
+BOILERPLATE = "boilerplate"
+EMPTY = "empty"
+
+_ANCHOR_RE = re.compile(r"<a\b[^>]*>(.*?)</a\s*>", re.I | re.S)
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+# Dòng ngắn hơn chừng này từ thường là menu, nút, nhãn
+_SHORT_LINE_WORDS = 4
+
+
+@dataclass
+class ContentQuality:
+    """Quality signals of one extracted text; score in [0, 1], label from score and length."""
+
+    label: str
+    score: float
+    words: int
+    link_density: float  # phần ký tự của nội dung trùng với chữ trong thẻ <a>
+    repetition: float  # tỉ lệ dòng lặp lại
+    short_lines: float  # tỉ lệ dòng rất ngắn (menu, nút)
+    text_ratio: float  # ký tự text / ký tự HTML
+
+
+def _norm(text: str) -> str:
+    return _WS_RE.sub(" ", text).strip().lower()
+
+
+def _anchor_texts(html: str) -> Set[str]:
+    out = set()
+    for m in _ANCHOR_RE.finditer(html):
+        text = _norm(html_lib.unescape(_TAG_RE.sub(" ", m.group(1))))
+        if text:
+            out.add(text)
+    return out
+
+
+def score_content(text: Optional[str], html: Optional[str] = None) -> ContentQuality:
+    """
+    Score extracted text. html (the page it came from) enables the link-density and
+    text/markup signals; without it only length, repetition and line shape are used.
+    """
+    lines = [_norm(line) for line in (text or "").splitlines()]
+    lines = [line for line in lines if line]
+    words = sum(len(line.split()) for line in lines)
+    if words < CONTENT_MIN_WORDS:
+        return ContentQuality(EMPTY, 0.0, words, 0.0, 0.0, 0.0, 0.0)
+
+    chars = sum(len(line) for line in lines)
+    repetition = 1 - len(set(lines)) / len(lines)
+    short_lines = sum(1 for line in lines if len(line.split()) < _SHORT_LINE_WORDS) / len(lines)
+    link_density = 0.0
+    text_ratio = 1.0
+    if html:
+        anchors = _anchor_texts(html)
+        link_density = sum(len(line) for line in lines if line in anchors) / chars
+        text_ratio = min(1.0, chars / len(html))
+
+    # Mỗi tín hiệu trừ điểm; bài thật: ít link, ít dòng lặp, đa số dòng là câu dài
+    score = 1.0 - link_density - repetition - max(0.0, short_lines - 0.5)
+    if text_ratio < 0.01:
+        score -= 0.1
+    score = round(max(0.0, min(1.0, score)), 3)
+    label = ARTICLE if score >= CONTENT_QUALITY_MIN else BOILERPLATE
+    return ContentQuality(label, score, words, round(link_density, 3), round(repetition, 3),
+                          round(short_lines, 3), round(text_ratio, 4))
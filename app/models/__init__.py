@@ -1,3 +1,4 @@
 from .article_model import Article, article_to_doc, doc_to_article
+from .crawl_record import CrawlRecord
 
-__all__ = ["Article", "article_to_doc", "doc_to_article"]
+__all__ = ["Article", "article_to_doc", "doc_to_article", "CrawlRecord"]
@@ -1,6 +1,6 @@
 """Article model for MongoDB."""
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 from pydantic import BaseModel, Field
 
 
@@ -15,13 +15,21 @@ class Article(BaseModel):
     source: Optional[str] = None  # short name: bbc, coindesk, cointelegraph, reuters, nyt, etc.
     thumbnail: Optional[str] = None  # image URL from media:thumbnail or similar
     content_top_image: Optional[str] = None  # hero image extracted from article page
+    hero_checked_at: Optional[datetime] = None  # page fetched for a hero image but none found (negative cache)
+    canonical_url: Optional[str] = None  # <link rel="canonical"> (or og:url) of the article page
+    og: Optional[Dict[str, str]] = None  # og:* / article:* meta tags; {} = page parsed, no tags
     published: Optional[datetime] = None
     crawled_at: datetime = Field(default_factory=datetime.utcnow)
     content: Optional[str] = None  # full text if extracted
+    content_quality: Optional[str] = None  # article / boilerplate / empty; only "article" (or unset) is translated
+    quality_score: Optional[float] = None  # 0..1 from the extractor's quality gate
     content_VN: Optional[str] = None  # translated & formatted Vietnamese content
     title_vn: Optional[str] = None  # translated Vietnamese title
     summary_vn: Optional[str] = None  # translated Vietnamese summary
     isShow: Optional[bool] = None  # true when title_vn, summary_vn, content_VN are all set
+    minhash: Optional[bytes] = None  # MinHash signature (uint32 array) for near-duplicate detection
+    story_id: Optional[str] = None  # link of the first article of the story cluster
+    duplicate_of: Optional[str] = None  # story_id if this article is a near-duplicate of an earlier one
 
     class Config:
         from_attributes = True
@@ -29,11 +37,7 @@ class Article(BaseModel):
 
 def article_to_doc(article: Article) -> dict:
     """Convert Article to MongoDB document (with datetime)."""
-    d = article.model_dump()
-    for k, v in d.items():
-        if hasattr(v, "isoformat"):
-            d[k] = v
-    return d
+    return article.model_dump()
 
 
 def doc_to_article(doc: dict) -> Article:
@@ -0,0 +1,85 @@
+"""Lightweight crawl-time record: __slots__ object, validated only when persisted."""
+from datetime import datetime
+from typing import Optional, Tuple, Union, get_args, get_origin
+
+from .article_model import Article
+
+
+def _field_spec(name: str) -> Tuple[str, type, bool]:
+    """(field, type, required) of an Article field: Optional[X] → X, not required; Dict[...] → dict."""
+    annotation = Article.model_fields[name].annotation
+    required = True
+    if get_origin(annotation) is Union and type(None) in get_args(annotation):
+        (annotation,) = [a for a in get_args(annotation) if a is not type(None)]
+        required = False
+    return name, get_origin(annotation) or annotation, required
+
+
+# Lấy từ schema của Article (thêm field ở Article là đủ); dùng để kiểm tra khi lưu
+_FIELDS = tuple(_field_spec(name) for name in Article.model_fields)
+
+
+class CrawlRecord:
+    """
+    One feed entry during a crawl. Same attribute names as Article, but no pydantic validation
+    per entry: phần lớn entry trong fetch window bị take_first_new bỏ đi, chỉ bài được lưu mới cần kiểm tra.
+    """
+
+    __slots__ = tuple(name for name, _, _ in _FIELDS)
+
+    def __init__(
+        self,
+        title: str,
+        link: str,
+        category: str,
+        source_feed: str,
+        summary: Optional[str] = None,
+        source: Optional[str] = None,
+        thumbnail: Optional[str] = None,
+        published: Optional[datetime] = None,
+        crawled_at: Optional[datetime] = None,
+    ):
+        self.title = title
+        self.link = link
+        self.summary = summary
+        self.category = category
+        self.source_feed = source_feed
+        self.source = source
+        self.thumbnail = thumbnail
+        self.content_top_image = None
+        self.hero_checked_at = None
+        self.canonical_url = None
+        self.og = None
+        self.published = published
+        self.crawled_at = crawled_at or datetime.utcnow()
+        self.content = None
+        self.content_quality = None
+        self.quality_score = None
+        self.content_VN = None
+        self.title_vn = None
+        self.summary_vn = None
+        self.isShow = None
+        self.minhash = None
+        self.story_id = None
+        self.duplicate_of = None
+
+    def __repr__(self) -> str:
+        return f"CrawlRecord(link={self.link!r}, title={self.title!r})"
+
+    def to_doc(self) -> dict:
+        """
+        Validate field types and return the MongoDB document directly (datetimes stay datetimes).
+        Raises ValueError if a required field is missing/empty or a field has the wrong type.
+        """
+        doc = {}
+        for name, typ, required in _FIELDS:
+            value = getattr(self, name, None)
+            if value is None:
+                if required:
+                    raise ValueError(f"{name} is required")
+            elif not isinstance(value, typ):
+                raise ValueError(f"{name} must be {typ.__name__}, got {type(value).__name__}")
+            doc[name] = value
+        if not self.link:
+            raise ValueError("link is required")
+        return doc
@@ -0,0 +1,5 @@
+from .http_client import get, get_session
+from .health import CircuitOpenError, breaker
+from .politeness import HostLimiter, host_of, run_per_host
+
+__all__ = ["get", "get_session", "CircuitOpenError", "breaker", "HostLimiter", "host_of", "run_per_host"]
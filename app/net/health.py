@@ -0,0 +1,101 @@
+"""Per-host health tracking and circuit breaker for the shared HTTP client."""
+import threading
+import time
+from collections import deque
+from typing import Dict
+
+from app.config import BREAKER_FAILURES, BREAKER_ERROR_RATE, BREAKER_WINDOW, BREAKER_COOLDOWN
+
+
+class CircuitOpenError(Exception):
+    """Request short-circuited: the host's breaker is open (too many recent failures)."""
+
+
+class HostHealth:
+    """
+    Rolling stats for one host (last BREAKER_WINDOW requests) + breaker state.
+    closed → open khi lỗi liên tiếp >= BREAKER_FAILURES hoặc tỉ lệ lỗi >= BREAKER_ERROR_RATE
+    (cửa sổ đủ mẫu); open → half-open sau BREAKER_COOLDOWN giây, cho đúng một request thử;
+    thành công thì đóng lại, lỗi thì mở tiếp.
+    """
+
+    def __init__(self):
+        self.outcomes: deque = deque(maxlen=BREAKER_WINDOW)  # (ok, latency seconds)
+        self.consecutive_failures = 0
+        self.state = "closed"
+        self.open_until = 0.0
+        self.short_circuited = 0
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return sum(1 for ok, _ in self.outcomes if not ok) / len(self.outcomes)
+
+    @property
+    def avg_latency(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return sum(lat for _, lat in self.outcomes) / len(self.outcomes)
+
+    def _should_open(self) -> bool:
+        if self.consecutive_failures >= BREAKER_FAILURES:
+            return True
+        return len(self.outcomes) >= BREAKER_WINDOW // 2 and self.error_rate >= BREAKER_ERROR_RATE
+
+
+class CircuitBreaker:
+    """Breakers for all hosts, shared by crawler and extractor threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, HostHealth] = {}
+
+    def _host(self, host: str) -> HostHealth:
+        if host not in self._hosts:
+            self._hosts[host] = HostHealth()
+        return self._hosts[host]
+
+    def before_request(self, host: str) -> None:
+        """Raise CircuitOpenError if the host is open; let one probe through once the cooldown ended."""
+        with self._lock:
+            h = self._host(host)
+            if h.state == "closed":
+                return
+            now = time.monotonic()
+            if h.state == "open" and now >= h.open_until:
+                h.state = "half-open"
+                return
+            h.short_circuited += 1
+            raise CircuitOpenError(f"circuit open for {host}")
+
+    def record(self, host: str, ok: bool, latency: float) -> None:
+        with self._lock:
+            h = self._host(host)
+            h.outcomes.append((ok, latency))
+            if ok:
+                h.consecutive_failures = 0
+                h.state = "closed"
+                return
+            h.consecutive_failures += 1
+            if h.state == "half-open" or h._should_open():
+                h.state = "open"
+                h.open_until = time.monotonic() + BREAKER_COOLDOWN
+
+    def snapshot(self) -> Dict[str, dict]:
+        """{host: {state, error_rate, avg_latency_ms, consecutive_failures, requests, short_circuited}}"""
+        with self._lock:
+            return {
+                host: {
+                    "state": h.state,
+                    "error_rate": round(h.error_rate, 2),
+                    "avg_latency_ms": round(h.avg_latency * 1000, 1),
+                    "consecutive_failures": h.consecutive_failures,
+                    "requests": len(h.outcomes),
+                    "short_circuited": h.short_circuited,
+                }
+                for host, h in self._hosts.items()
+            }
+
+
+breaker = CircuitBreaker()
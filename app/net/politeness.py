@@ -0,0 +1,105 @@
+"""Per-host politeness: concurrent-connection limit and minimum spacing between request starts."""
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+from app.config import CRAWL_HOST_CONCURRENCY, CRAWL_HOST_MIN_INTERVAL
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def host_of(url: str) -> str:
+    """Lower-cased hostname of a URL ("" if none)."""
+    return (urlsplit(url).hostname or "").lower()
+
+
+class HostLimiter:
+    """Giới hạn số request đồng thời và khoảng cách tối thiểu giữa hai lần bắt đầu request cho mỗi host."""
+
+    def __init__(self, max_per_host: int = CRAWL_HOST_CONCURRENCY, min_interval: float = CRAWL_HOST_MIN_INTERVAL):
+        self.max_per_host = max(1, max_per_host)
+        self.min_interval = max(0.0, min_interval)
+        self._lock = threading.Lock()
+        self._sems: Dict[str, threading.Semaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    def _sem(self, host: str) -> threading.Semaphore:
+        with self._lock:
+            if host not in self._sems:
+                self._sems[host] = threading.Semaphore(self.max_per_host)
+            return self._sems[host]
+
+    def _reserve_start(self, host: str) -> float:
+        """Reserve the next start time for this host; return seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.min_interval
+            return start - now
+
+    @contextmanager
+    def slot(self, host: str):
+        """Hold one connection slot for `host`, started no sooner than min_interval after the previous one."""
+        sem = self._sem(host)
+        sem.acquire()
+        try:
+            delay = self._reserve_start(host)
+            if delay > 0:
+                time.sleep(delay)
+            yield
+        finally:
+            sem.release()
+
+
+def run_per_host(
+    items: Iterable[T],
+    host_key: Callable[[T], str],
+    fn: Callable[[T], R],
+    max_workers: int,
+    limiter: HostLimiter,
+    thread_name_prefix: str = "crawl",
+) -> Iterator[Tuple[T, R]]:
+    """
+    Run fn(item) on a thread pool, yielding (item, result) as each completes.
+    Chỉ giao việc cho host còn slot trống (round-robin giữa các host), nên worker không bị chiếm
+    bởi các job đang chờ cùng một host trong khi host khác rảnh. fn nên tự bắt lỗi.
+    """
+    queues: Dict[str, deque] = {}
+    for item in items:
+        queues.setdefault(host_key(item), deque()).append(item)
+    if not queues:
+        return
+    active: Dict[str, int] = {host: 0 for host in queues}
+    workers = max(1, min(max_workers, sum(len(q) for q in queues.values())))
+
+    def _run(host: str, item: T) -> R:
+        with limiter.slot(host):
+            return fn(item)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=thread_name_prefix) as pool:
+        pending = {}
+
+        def _dispatch() -> None:
+            progressed = True
+            while progressed and len(pending) < workers:
+                progressed = False
+                for host, q in queues.items():
+                    if q and active[host] < limiter.max_per_host and len(pending) < workers:
+                        item = q.popleft()
+                        active[host] += 1
+                        pending[pool.submit(_run, host, item)] = (host, item)
+                        progressed = True
+
+        _dispatch()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                host, item = pending.pop(fut)
+                active[host] -= 1
+                yield item, fut.result()
+            _dispatch()
@@ -1,4 +1,6 @@
 from .job_runner import (
+    CrawlReport,
+    run_crawl_cycle,
     run_all_crawlers,
     run_translation,
     run_extract_hero_images,
@@ -8,6 +10,8 @@ from .job_runner import (
 )
 
 __all__ = [
+    "CrawlReport",
+    "run_crawl_cycle",
     "run_all_crawlers",
     "run_translation",
     "run_extract_hero_images",
@@ -1,38 +1,139 @@
 """Run all crawlers and save to MongoDB."""
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from typing import List
-from datetime import datetime
-
-from app.config import EXTRACT_CONTENT
-from app.crawler import crawl_bbc, crawl_reuters, crawl_crypto, crawl_nyt, crawl_robotics, crawl_ai
-from app.models import Article
-from app.database import save_articles, get_articles_collection
-from app.extractor import extract_content, extract_hero_image
-from app.ai import translate_article_content
-from app.ai.translate_service import translate_title_and_summary
+from datetime import datetime, timedelta
+
+from app.config import (
+    EXTRACT_CONTENT,
+    EXTRACT_PARSE_IN_PROCESSES,
+    HTML_CACHE_ENABLED,
+    CONTENT_QUALITY_GATE,
+    HERO_RETRY_HOURS,
+    OLLAMA_MAX_CONCURRENCY,
+    TRANSLATE_BATCH_SIZE,
+    TRANSLATE_BATCH_MAX_CHARS,
+    ADAPTIVE_POLLING,
+    STORY_CLUSTERING,
+    TRANSLATE_SKIP_DUPLICATES,
+)
+from app.clustering import assign_story_clusters
+from app.crawler import FeedResult, commit_feed_cache, crawl_feeds, print_feed_report, build_registry, due_feeds, healthy_feeds
+from app.database import save_articles, get_articles_collection, get_link_index
+from app.extractor import extract_many, extract_many_offloaded, fetch_hero_image, get_html_cache, hero_from_feed
+from app.ai import ollama_client, translate_article_content, translation_memory
+from app.ai.translate_service import translate_title_and_summary, translate_titles_and_summaries
+
+
+@dataclass
+class CrawlReport:
+    """Số liệu một vòng crawl: bài đã lưu, kết quả từng feed và thời gian từng bước (giây)."""
+
+    saved: int = 0
+    articles: int = 0  # bài mới sau dedup + gộp category
+    feeds: List[FeedResult] = field(default_factory=list)
+    crawl_seconds: float = 0.0
+    extract_seconds: float = 0.0
+    extract_latencies: List[float] = field(default_factory=list)  # giây, từng bài
+    save_seconds: float = 0.0
+    wall_seconds: float = 0.0
+
+
+def run_crawl_cycle() -> CrawlReport:
+    """
+    Crawl every feed in RSS_FEEDS_BY_CATEGORY concurrently (BBC, Crypto, Robotics, AI, ...).
+    Feeds backed off after repeated failures are skipped; with ADAPTIVE_POLLING only feeds
+    whose own interval has elapsed are fetched.
+    Each new article page is fetched once for content, hero image, og: metadata and canonical URL;
+    cluster near-duplicates and save to DB. Return the cycle's CrawlReport.
+    """
+    report = CrawlReport()
+    cycle_started = time.perf_counter()
+    all_specs = build_registry()
+    specs = healthy_feeds(all_specs)
+    if len(specs) < len(all_specs):
+        print(f"[Health] {len(all_specs) - len(specs)} feeds backed off after repeated failures.")
+    if ADAPTIVE_POLLING:
+        due = due_feeds(specs)
+        print(f"[Poll] {len(due)}/{len(all_specs)} feeds due.")
+        specs = due
+    if not specs:
+        return report
+    started = time.perf_counter()
+    articles, report.feeds = crawl_feeds(specs)
+    report.crawl_seconds = time.perf_counter() - started
+    report.articles = len(articles)
+    print_feed_report(report.feeds, report.crawl_seconds)
+
+    from_feed = sum(1 for a in articles if a.content_top_image)
+    if articles:
+        print(f"[Hero] {from_feed}/{len(articles)} hero images taken from feed images (no page fetch).")
+
+    started = time.perf_counter()
+    if EXTRACT_CONTENT:
+        pending = [a for a in articles if not a.content]
+        extractor = extract_many_offloaded if EXTRACT_PARSE_IN_PROCESSES else extract_many
+        for record, page, elapsed in extractor(pending):
+            report.extract_latencies.append(elapsed)
+            if page is None:
+                continue
+            record.content = page.content
+            record.content_quality = page.quality
+            record.quality_score = page.quality_score
+            record.content_top_image = record.content_top_image or page.hero_image
+            record.canonical_url = page.canonical_url
+            record.og = page.og
+    report.extract_seconds = time.perf_counter() - started
+    if report.extract_latencies:
+        lat = sorted(report.extract_latencies)
+        ok = sum(1 for a in articles if a.content)
+        hero = sum(1 for a in articles if a.content_top_image)
+        print(
+            f"[Extract] {len(lat)} articles in {report.extract_seconds:.2f}s wall-clock "
+            f"(sum {sum(lat):.2f}s, p50 {lat[len(lat) // 2]:.2f}s, max {lat[-1]:.2f}s), "
+            f"{ok} with content, {hero} with hero image."
+        )
+        labels = Counter(a.content_quality for a in articles if a.content_quality)
+        print(
+            f"[Quality] {labels['article']} article, {labels['boilerplate']} boilerplate, "
+            f"{labels['empty']} empty" + (" (boilerplate/empty are not translated)." if CONTENT_QUALITY_GATE else ".")
+        )
+        if HTML_CACHE_ENABLED:
+            st = get_html_cache().stats()
+            print(
+                f"[HtmlCache] hits {st['hits']}, misses {st['misses']}; {st['urls']} pages "
+                f"({st['blobs']} distinct) in {st['disk_mib']} MiB, compression x{st['ratio']}."
+            )
 
+    if STORY_CLUSTERING and articles:
+        n_dup = assign_story_clusters(articles)
+        print(f"[Cluster] {n_dup}/{len(articles)} new articles are near-duplicates of a known story.")
 
-def run_all_crawlers() -> int:
-    """Run BBC, Reuters, Crypto, Robotics, AI (and NYT if configured). Save to DB. Return total saved count."""
-    articles: List[Article] = []
-    articles.extend(crawl_bbc())
-    articles.extend(crawl_reuters())
-    articles.extend(crawl_crypto())
-    articles.extend(crawl_nyt())
-    articles.extend(crawl_robotics())
-    articles.extend(crawl_ai())
+    started = time.perf_counter()
+    # Bài trong danh sách đã được LinkIndex xác nhận là mới → không cần query $in lần nữa
+    result = save_articles(articles, existing=set())
+    report.saved = result.saved
+    # Chỉ link đã thực sự nằm trong DB; bài insert lỗi / không hợp lệ sẽ được crawl lại vòng sau
+    get_link_index().add(result.stored_links)
+    commit_feed_cache(report.feeds, set(result.stored_links))
+    report.save_seconds = time.perf_counter() - started
+    report.wall_seconds = time.perf_counter() - cycle_started
+    return report
 
-    if EXTRACT_CONTENT:
-        for article in articles:
-            if not article.content:
-                article.content = extract_content(article.link)
 
-    return save_articles(articles)
+def run_all_crawlers() -> int:
+    """Run one crawl cycle (see run_crawl_cycle). Return total saved count."""
+    return run_crawl_cycle().saved
 
 
 def run_translation(limit: int = 0) -> int:
     """
     Translate articles that have content but no content_VN.
-    Runs sequentially (single-threaded).
+    Near-duplicates (duplicate_of set) are skipped with TRANSLATE_SKIP_DUPLICATES, otherwise queued last.
+    With CONTENT_QUALITY_GATE, content labelled boilerplate/empty at extraction is not translated.
+    Articles run concurrently on the shared Ollama client; in-flight requests are capped by its AIMD limiter.
     
     Args:
         limit: Max number of articles to translate. 0 = no limit.
@@ -49,8 +150,15 @@ def run_translation(limit: int = 0) -> int:
             {"content_VN": {"$exists": False}}
         ]
     }
-    
-    cursor = col.find(query)
+    if TRANSLATE_SKIP_DUPLICATES:
+        # Bản gần trùng của một story đã có: không dịch lại
+        query["duplicate_of"] = None
+    if CONTENT_QUALITY_GATE:
+        # Menu/cookie banner/footer: không tốn lượt gọi Ollama (bài cũ chưa chấm điểm vẫn dịch)
+        query["content_quality"] = {"$nin": ["boilerplate", "empty"]}
+
+    # Bài gốc của story trước, bản trùng (nếu không bỏ qua) xếp sau cùng
+    cursor = col.find(query).sort("duplicate_of", 1)
     if limit > 0:
         cursor = cursor.limit(limit)
     
@@ -63,28 +171,53 @@ def run_translation(limit: int = 0) -> int:
     
     print(f"Found {total} articles to translate.")
     translated_count = 0
-    
-    for i, doc in enumerate(articles_to_translate):
-        #print(f"Translating article {i+1}/{total}...")
-        content = doc.get("content", "")
-        full_title = doc.get("title", "")
-        #print(f"Full title: {full_title}")
-        content_vn = translate_article_content_raw(content, full_title)
-        doc_id = doc["_id"]
-        title = full_title[:50]
-        #print(f"Translated article {i+1}/{total}...")
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        if content_vn:
-            col.update_one(
-                {"_id": doc_id},
-                {"$set": {"content_VN": content_vn}}
-            )
-            translated_count += 1
-            print(f"[{i+1}/{total}] [{timestamp}] ✓ {title}...")
-        else:
-            print(f"[{i+1}/{total}] [{timestamp}] ✗ {title}...")
-    
+    before = ollama_client.stats.snapshot()
+    decreases_before = ollama_client.limiter.decreases
+    tm_before = translation_memory.stats_snapshot()
+    started = time.perf_counter()
+
+    def _translate(doc):
+        return translate_article_content_raw(doc.get("content", ""), doc.get("title", ""))
+
+    # Nhiều bài cùng lúc; số request Ollama thực sự đang chạy do limiter AIMD quyết định
+    with ThreadPoolExecutor(max_workers=OLLAMA_MAX_CONCURRENCY, thread_name_prefix="translate") as pool:
+        futures = {pool.submit(_translate, doc): doc for doc in articles_to_translate}
+        for i, future in enumerate(as_completed(futures)):
+            doc = futures[future]
+            try:
+                content_vn = future.result()
+            except Exception as e:
+                print(f"[Translate] {doc.get('link')}: {e}")
+                content_vn = None
+            title = doc.get("title", "")[:50]
+            timestamp = datetime.now().strftime("%H:%M:%S")
+            if content_vn:
+                col.update_one(
+                    {"_id": doc["_id"]},
+                    {"$set": {"content_VN": content_vn}}
+                )
+                translated_count += 1
+                print(f"[{i+1}/{total}] [{timestamp}] ✓ {title}...")
+            else:
+                print(f"[{i+1}/{total}] [{timestamp}] ✗ {title}...")
+
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    snap = ollama_client.stats.snapshot()
+    limiter = ollama_client.limiter
     print(f"\nCompleted: {translated_count}/{total} articles translated.")
+    print(
+        f"[Translate] {elapsed:.1f}s, {translated_count / elapsed * 60:.1f} articles/min, "
+        f"{(snap['calls'] - before['calls']) / elapsed:.2f} chunks/s, "
+        f"concurrency {limiter.limit:.1f} (peak {limiter.peak_limit:.1f}, "
+        f"{limiter.decreases - decreases_before} decreases, {snap['errors'] - before['errors']} errors)"
+    )
+    stopped = ", ".join(
+        f"{n - before['stopped'][reason]} {reason}"
+        for reason, n in snap["stopped"].items() if n > before["stopped"][reason]
+    )
+    if stopped:
+        print(f"[Translate] Output stopped early: {stopped}")
+    print(translation_memory.report(tm_before))
     return translated_count
 
 
@@ -124,10 +257,29 @@ def update_article_title_summary_vn(article_id) -> bool:
     return True
 
 
+def _title_summary_batches(docs: List[dict]) -> List[List[dict]]:
+    """Nhóm bài theo TRANSLATE_BATCH_SIZE bài / TRANSLATE_BATCH_MAX_CHARS ký tự title + summary."""
+    batches: List[List[dict]] = []
+    current: List[dict] = []
+    chars = 0
+    for doc in docs:
+        size = len(doc.get("title") or "") + len(doc.get("summary") or "")
+        if current and (len(current) >= TRANSLATE_BATCH_SIZE or chars + size > TRANSLATE_BATCH_MAX_CHARS):
+            batches.append(current)
+            current, chars = [], 0
+        current.append(doc)
+        chars += size
+    if current:
+        batches.append(current)
+    return batches
+
+
 def run_translate_title_summary(limit: int = 0) -> int:
     """
     Translate title and summary to Vietnamese for articles that don't have title_vn or summary_vn.
     Saves results to title_vn and summary_vn.
+    Articles are translated in batches (TRANSLATE_BATCH_SIZE per Ollama call, JSON output), with
+    per-article fallback for items the model drops or garbles.
     """
     col = get_articles_collection()
 
@@ -160,35 +312,56 @@ def run_translate_title_summary(limit: int = 0) -> int:
 
     print(f"Found {total} articles to translate title/summary.")
     translated_count = 0
-
-    for i, doc in enumerate(articles_to_translate):
-        title = doc.get("title", "")
-        summary = doc.get("summary") or ""
-        doc_id = doc["_id"]
-
-        title_vn, summary_vn = translate_title_and_summary(title, summary or None)
-
-        updates = {}
-        if title_vn is not None:
-            updates["title_vn"] = title_vn
-        if summary_vn is not None:
-            updates["summary_vn"] = summary_vn
-
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        if updates:
-            col.update_one({"_id": doc_id}, {"$set": updates})
-            translated_count += 1
-            print(f"[{i+1}/{total}] [{timestamp}] ✓ {title[:50]}...")
-        else:
-            print(f"[{i+1}/{total}] [{timestamp}] ✗ {title[:50]}...")
+    tm_before = translation_memory.stats_snapshot()
+
+    calls_before = ollama_client.stats.snapshot()["calls"]
+    batches = _title_summary_batches(articles_to_translate)
+
+    def _translate(batch):
+        if TRANSLATE_BATCH_SIZE <= 1:
+            return [translate_title_and_summary(doc.get("title", ""), doc.get("summary") or None) for doc in batch]
+        return translate_titles_and_summaries([(doc.get("title", ""), doc.get("summary") or None) for doc in batch])
+
+    # Mỗi batch một lượt gọi Ollama (JSON); các batch chạy song song dưới limiter AIMD
+    i = 0
+    with ThreadPoolExecutor(max_workers=OLLAMA_MAX_CONCURRENCY, thread_name_prefix="translate") as pool:
+        futures = {pool.submit(_translate, batch): batch for batch in batches}
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                results = future.result()
+            except Exception as e:
+                print(f"[Translate] title/summary batch failed: {e}")
+                results = [(None, None)] * len(batch)
+            for doc, (title_vn, summary_vn) in zip(batch, results):
+                i += 1
+                title = doc.get("title", "")
+                updates = {}
+                if title_vn is not None:
+                    updates["title_vn"] = title_vn
+                if summary_vn is not None:
+                    updates["summary_vn"] = summary_vn
+
+                timestamp = datetime.now().strftime("%H:%M:%S")
+                if updates:
+                    col.update_one({"_id": doc["_id"]}, {"$set": updates})
+                    translated_count += 1
+                    print(f"[{i}/{total}] [{timestamp}] ✓ {title[:50]}...")
+                else:
+                    print(f"[{i}/{total}] [{timestamp}] ✗ {title[:50]}...")
 
     print(f"\nCompleted: {translated_count}/{total} title/summary translations.")
+    print(f"[Translate] {len(batches)} batches, {ollama_client.stats.snapshot()['calls'] - calls_before} Ollama calls")
+    print(translation_memory.report(tm_before))
     return translated_count
 
 
 def run_extract_hero_images(limit: int = 0, size: int = 800) -> int:
     """
     Extract hero images for articles that don't have content_top_image.
+    Articles whose page was already parsed at crawl time (og set) are skipped: không tải lại trang.
+    Nguồn có quy tắc ảnh feed (BBC thumbnail ...) được suy ra từ thumbnail, không tải trang.
+    Trang đã tải mà không có ảnh được ghi hero_checked_at và chỉ thử lại sau HERO_RETRY_HOURS.
     Runs sequentially (single-threaded).
     
     Args:
@@ -201,10 +374,19 @@ def run_extract_hero_images(limit: int = 0, size: int = 800) -> int:
     col = get_articles_collection()
     
     query = {
-        "$or": [
-            {"content_top_image": None},
-            {"content_top_image": {"$exists": False}}
-        ]
+        "$and": [
+            {"$or": [
+                {"content_top_image": None},
+                {"content_top_image": {"$exists": False}}
+            ]},
+            # Negative cache: lần tải trước không thấy ảnh
+            {"$or": [
+                {"hero_checked_at": None},
+                {"hero_checked_at": {"$lt": datetime.utcnow() - timedelta(hours=HERO_RETRY_HOURS)}}
+            ]},
+        ],
+        # og = {} khi trang đã parse lúc crawl nhưng không có ảnh; None/thiếu = chưa từng tải
+        "og": None,
     }
     
     cursor = col.find(query)
@@ -220,11 +402,18 @@ def run_extract_hero_images(limit: int = 0, size: int = 800) -> int:
     
     print(f"Found {total} articles to extract hero images.")
     updated_count = 0
+    from_feed = 0
     
     for i, doc in enumerate(articles_to_process):
         link = doc.get("link", "")
         title = doc.get("title", "")[:50]
-        hero_img = extract_hero_image(link, size=size)
+        hero_img = hero_from_feed(link, {"thumbnail": doc.get("thumbnail")}, size)
+        fetched = True
+        if hero_img:
+            from_feed += 1
+        else:
+            # Lần thử lại (đã từng không có ảnh): tải trang mới, không đọc bản cũ trong HTML cache
+            fetched, hero_img = fetch_hero_image(link, size=size, use_cache=not doc.get("hero_checked_at"))
         doc_id = doc["_id"]
         
         timestamp = datetime.now().strftime("%H:%M:%S")
@@ -235,10 +424,14 @@ def run_extract_hero_images(limit: int = 0, size: int = 800) -> int:
             )
             updated_count += 1
             print(f"[{i+1}/{total}] [{timestamp}] ✓ {title}...")
-        else:
+        elif fetched:
+            # Chỉ ghi negative cache khi trang thực sự tải được mà không có ảnh
+            col.update_one({"_id": doc_id}, {"$set": {"hero_checked_at": datetime.utcnow()}})
             print(f"[{i+1}/{total}] [{timestamp}] ✗ {title}...")
+        else:
+            print(f"[{i+1}/{total}] [{timestamp}] ✗ {title}... (fetch failed, retry next run)")
     
-    print(f"\nCompleted: {updated_count}/{total} articles updated with hero images.")
+    print(f"\nCompleted: {updated_count}/{total} articles updated with hero images ({from_feed} from feed thumbnails, no fetch).")
     return updated_count
 
 
@@ -0,0 +1 @@
+"""Offline micro-benchmarks: run from project root, e.g. python -m benchmarks.bench_feed_parser"""
@@ -0,0 +1,129 @@
+"""
+Offline crawl benchmark: full run_crawl_cycle against a local HTTP stand-in and an in-memory store.
+Run: python -m benchmarks.bench_crawl [--copies 4] [--hosts 3] [--latency 0.05] [--error-rate 0.02]
+     [--parse-processes 0] [--json out.json]
+Numbers are comparable across commits when run with the same arguments on the same machine.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+
+def _percentile(values, q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def _git_commit() -> str:
+    try:
+        root = Path(__file__).resolve().parent.parent
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=root, text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--copies", type=int, default=4, help="Serve each recorded feed N times (as N feeds)")
+    parser.add_argument("--hosts", type=int, default=3, help="Simulated hosts (127.0.0.1..N)")
+    parser.add_argument("--cycles", type=int, default=2, help="Crawl cycles (1st cold, then warm)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Base response latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.05, help="Extra random latency up to (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered 500")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Fraction of responses trickled slowly")
+    parser.add_argument("--slow-bps", type=int, default=64 * 1024, help="Bytes/s for slow responses")
+    parser.add_argument("--no-extract", action="store_true", help="Skip full-article extraction")
+    parser.add_argument("--parse-processes", type=int, default=None, metavar="N",
+                        help="Parse pages on a process pool of N workers (0 = one per core)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", type=str, default=None, help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    # Settings are read at import time: pin the ones that would make cycles non-comparable
+    os.environ["ADAPTIVE_POLLING"] = "false"
+    os.environ["STORY_CLUSTERING"] = "false"
+    os.environ["EXTRACT_CONTENT"] = "false" if args.no_extract else "true"
+    os.environ.setdefault("FETCH_TIMEOUT", "10")
+    if args.parse_processes is not None:
+        os.environ["EXTRACT_PARSE_IN_PROCESSES"] = "true"
+        os.environ["EXTRACT_PARSE_PROCESSES"] = str(args.parse_processes)
+    # Cache HTML mới cho mỗi lần chạy: cycle 1 luôn tải trang thật
+    os.environ["HTML_CACHE_DIR"] = tempfile.mkdtemp(prefix="bench-html-cache-")
+
+    from benchmarks import memory_store
+    from benchmarks.fixtures import load_feeds
+    from benchmarks.local_server import FaultConfig, LocalSite
+
+    from app.config import RSS_FEEDS_BY_CATEGORY
+    from app.scheduler import run_crawl_cycle
+
+    feeds = {f"{name}-{i}": body for name, body in load_feeds().items() for i in range(args.copies)}
+    faults = FaultConfig(args.latency, args.jitter, args.error_rate, args.slow_rate, args.slow_bps, args.seed)
+    site = LocalSite(feeds, args.hosts, faults)
+    site.start()
+    memory_store.install()
+    RSS_FEEDS_BY_CATEGORY.clear()
+    for name, url in site.feed_urls().items():
+        RSS_FEEDS_BY_CATEGORY[name] = [url]
+
+    cycles = []
+    tracemalloc.start()
+    try:
+        for n in range(args.cycles):
+            requests_before = site.requests
+            report = run_crawl_cycle()
+            latencies = [r.elapsed for r in report.feeds if r.error is None]
+            cycles.append({
+                "cycle": n + 1,
+                "feeds": len(report.feeds),
+                "feed_errors": sum(1 for r in report.feeds if r.error),
+                "articles": report.articles,
+                "saved": report.saved,
+                "http_requests": site.requests - requests_before,
+                "wall_s": round(report.wall_seconds, 3),
+                "crawl_s": round(report.crawl_seconds, 3),
+                "extract_s": round(report.extract_seconds, 3),
+                "save_s": round(report.save_seconds, 3),
+                "feeds_per_s": round(len(report.feeds) / report.crawl_seconds, 2) if report.crawl_seconds else 0.0,
+                "articles_per_s": round(report.articles / report.wall_seconds, 2) if report.wall_seconds else 0.0,
+                "fetch_p50_ms": round(_percentile(latencies, 50) * 1000, 1),
+                "fetch_p99_ms": round(_percentile(latencies, 99) * 1000, 1),
+                "extract_p50_ms": round(_percentile(report.extract_latencies, 50) * 1000, 1),
+                "extract_p99_ms": round(_percentile(report.extract_latencies, 99) * 1000, 1),
+            })
+    finally:
+        from app.extractor import shutdown_parse_pool
+        shutdown_parse_pool()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        site.stop()
+
+    result = {
+        "commit": _git_commit(),
+        "args": vars(args),
+        "cycles": cycles,
+        "peak_traced_mib": round(peak / 2**20, 2),
+        "max_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+    print()
+    print(f"commit {result['commit']}  feeds={len(feeds)} hosts={args.hosts}  peak traced {result['peak_traced_mib']} MiB, max RSS {result['max_rss_mib']} MiB")
+    cols = ["cycle", "feeds", "feed_errors", "articles", "saved", "http_requests", "wall_s", "crawl_s",
+            "extract_s", "feeds_per_s", "articles_per_s", "fetch_p50_ms", "fetch_p99_ms", "extract_p50_ms", "extract_p99_ms"]
+    print("  ".join(cols))
+    for c in cycles:
+        print("  ".join(str(c[k]).rjust(len(k)) for k in cols))
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, indent=2))
+        print(f"Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+Micro-benchmark: pydantic Article vs CrawlRecord per feed entry (build + BSON doc for the kept ones).
+Run: python -m benchmarks.bench_crawl_record [--window 60] [--keep 10] [--feeds 200]
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import datetime
+
+from app.models import Article, CrawlRecord, article_to_doc
+
+
+def _entries(window: int):
+    now = datetime(2026, 10, 1, 12, 0, 0)
+    return [
+        {
+            "title": f"Story {i} as leaders meet",
+            "link": f"https://www.bbc.com/news/articles/c{i:011d}",
+            "summary": f"Short standfirst for story {i}, in the style of BBC World summaries." * 2,
+            "published": now,
+            "thumbnail": f"https://ichef.bbci.co.uk/news/240/cpsprodpb/{i:04x}/live/img{i}.jpg",
+        }
+        for i in range(window)
+    ]
+
+
+def _build(cls, entries):
+    return [
+        cls(title=e["title"], link=e["link"], summary=e["summary"], category="Tin thế giới",
+            source_feed="http://feeds.bbci.co.uk/news/world/rss.xml", source="bbc",
+            thumbnail=e["thumbnail"], published=e["published"])
+        for e in entries
+    ]
+
+
+def _to_doc(obj):
+    return obj.to_doc() if isinstance(obj, CrawlRecord) else article_to_doc(obj)
+
+
+def _run(cls, entries, feeds: int, keep: int):
+    """(µs per entry built, µs per kept doc, bytes per live entry)"""
+    t = time.perf_counter()
+    batches = [_build(cls, entries) for _ in range(feeds)]
+    build_us = (time.perf_counter() - t) / (feeds * len(entries)) * 1e6
+    t = time.perf_counter()
+    for batch in batches:
+        for obj in batch[:keep]:
+            _to_doc(obj)
+    doc_us = (time.perf_counter() - t) / (feeds * keep) * 1e6
+    del batches
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    live = _build(cls, entries)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del live
+    return build_us, doc_us, (after - before) / len(entries)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--window", type=int, default=60, help="Entries per feed (CRAWL_FETCH_WINDOW)")
+    parser.add_argument("--keep", type=int, default=10, help="Entries saved per feed (CRAWL_LIMIT_PER_FEED)")
+    parser.add_argument("--feeds", type=int, default=200, help="Feeds to simulate")
+    args = parser.parse_args()
+
+    entries = _entries(args.window)
+    print(f"{'type':<12} {'build µs/entry':>15} {'to_doc µs':>10} {'bytes/entry':>12}")
+    rows = {}
+    for cls in (Article, CrawlRecord):
+        rows[cls] = _run(cls, entries, args.feeds, args.keep)
+        build_us, doc_us, size = rows[cls]
+        print(f"{cls.__name__:<12} {build_us:15.2f} {doc_us:10.2f} {size:12.0f}")
+    a, r = rows[Article], rows[CrawlRecord]
+    window_a = a[0] * args.window + a[1] * args.keep
+    window_r = r[0] * args.window + r[1] * args.keep
+    print(f"Per feed window ({args.window} entries, {args.keep} saved): {window_a:.0f} µs -> {window_r:.0f} µs "
+          f"({window_a / window_r:.1f}x), {a[2] * args.window / 1024:.1f} KiB -> {r[2] * args.window / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
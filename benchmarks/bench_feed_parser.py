@@ -0,0 +1,56 @@
+"""
+Micro-benchmark: fast iterparse path vs feedparser on recorded BBC / CoinDesk / ZDNet feeds.
+Run: python -m benchmarks.bench_feed_parser [--window 60] [--repeat 50]
+Record real feeds first with: python -m benchmarks.fixtures
+"""
+import argparse
+import time
+
+import feedparser
+
+from benchmarks.fixtures import load_feeds, recorded_names
+from app.crawler.base_rss import parse_date, _thumbnail_from_entry
+from app.crawler.fast_parser import parse_entries
+
+
+def _feedparser_entries(content: bytes, window: int) -> list:
+    """Same work as the feedparser path of fetch_feed."""
+    feed = feedparser.parse(content)
+    return [
+        (getattr(e, "link", "") or "", parse_date(e), _thumbnail_from_entry(e))
+        for e in feed.entries[:window]
+    ]
+
+
+def _fast_entries(content: bytes, window: int) -> list:
+    return [(e["link"], e["published"], e["thumbnail"]) for e in parse_entries(content, window)]
+
+
+def _bench(fn, content: bytes, window: int, repeat: int) -> float:
+    """Best-of-repeat time in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn(content, window)
+        best = min(best, time.perf_counter() - t)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--window", type=int, default=60, help="Entries per feed (CRAWL_FETCH_WINDOW)")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'feed':<24} {'KiB':>6} {'feedparser ms':>14} {'fast ms':>9} {'speedup':>8}  same")
+    recorded = recorded_names()
+    for name, content in load_feeds().items():
+        slow = _bench(_feedparser_entries, content, args.window, args.repeat)
+        fast = _bench(_fast_entries, content, args.window, args.repeat)
+        same = _feedparser_entries(content, args.window) == _fast_entries(content, args.window)
+        label = name if name in recorded else f"{name} (synthetic)"
+        print(f"{label:<24} {len(content) / 1024:6.1f} {slow:14.2f} {fast:9.2f} {slow / fast:7.1f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
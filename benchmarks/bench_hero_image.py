@@ -0,0 +1,90 @@
+"""
+Micro-benchmark: head/hero-block scan (app.extractor.hero_image) vs the BeautifulSoup html.parser path
+it replaced, on recorded article pages.
+Run: python -m benchmarks.bench_hero_image [--repeat 20] [--pad-kb 300]
+Record real pages first with: python -m benchmarks.fixtures
+"""
+import argparse
+import re
+import time
+from typing import Optional
+
+from bs4 import BeautifulSoup
+
+from benchmarks.fixtures import load_pages
+from benchmarks.local_server import synthetic_page
+from app.extractor.hero_image import find_hero_image
+
+
+def _soup_hero_image(html: str, size: int) -> Optional[str]:
+    """The previous extract_hero_image body: full html.parser tree, BBC rules, og:image fallback."""
+    soup = BeautifulSoup(html, "html.parser")
+    hero_div = soup.find(attrs={"data-testid": "hero-image"})
+    if hero_div:
+        img = hero_div.find("img")
+        if img:
+            srcset = img.get("srcset", "")
+            if srcset and "cpsprodpb" in srcset:
+                match = re.search(r"(https://ichef\.bbci\.co\.uk/news/\d+/cpsprodpb/[^\s]+)", srcset)
+                if match:
+                    return re.sub(r"/news/\d+/", f"/news/{size}/", match.group(1))
+            src = img.get("src", "")
+            if src and "cpsprodpb" in src:
+                return re.sub(r"/news/\d+/", f"/news/{size}/", src)
+    for img in soup.find_all("img"):
+        src = img.get("src", "")
+        if "ichef.bbci.co.uk/news/" in src and "cpsprodpb" in src:
+            return re.sub(r"/news/\d+/", f"/news/{size}/", src)
+    og_image = soup.find("meta", property="og:image")
+    if og_image and og_image.get("content"):
+        img_url = og_image["content"]
+        if "ichef.bbci.co.uk/news/" in img_url:
+            return re.sub(r"/news/\d+/", f"/news/{size}/", img_url)
+        return img_url
+    return None
+
+
+def _synthetic_pages(n: int, pad_kb: int):
+    """BBC-shaped pages padded after the hero block (inline JSON, paragraphs) to a realistic size."""
+    pages = []
+    for i in range(n):
+        body = synthetic_page("bbc", i).decode("utf-8")
+        filler = "".join(f"<p>Filler paragraph {k} with enough words to look like article text.</p>" for k in range(pad_kb * 14))
+        blob = '<script id="__NEXT_DATA__" type="application/json">{"props":"' + "x" * (pad_kb * 256) + '"}</script>'
+        body = body.replace("</main>", filler + "</main>" + blob)
+        pages.append(("bbc (synthetic)", f"https://www.bbc.com/news/articles/c{i:011d}", body.encode("utf-8")))
+    return pages
+
+
+def _best_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--size", type=int, default=800)
+    parser.add_argument("--pad-kb", type=int, default=300, help="Approximate size of synthetic pages (KiB)")
+    args = parser.parse_args()
+
+    pages = load_pages() or _synthetic_pages(5, args.pad_kb)
+    print(f"{'page':<20} {'KiB':>6} {'bs4 ms':>8} {'scan ms':>8} {'speedup':>8}  same")
+    total_old = total_new = 0.0
+    for name, url, body in pages:
+        html = body.decode("utf-8", errors="replace")
+        old = _best_ms(lambda: _soup_hero_image(html, args.size), args.repeat)
+        new = _best_ms(lambda: find_hero_image(html, url, args.size), args.repeat)
+        same = _soup_hero_image(html, args.size) == find_hero_image(html, url, args.size)
+        total_old += old
+        total_new += new
+        print(f"{name:<20} {len(body) / 1024:>6.0f} {old:>8.2f} {new:>8.3f} {old / new:>7.0f}x  {'yes' if same else 'no'}")
+    print(f"{'total':<20} {'':>6} {total_old:>8.2f} {total_new:>8.3f} {total_old / total_new:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
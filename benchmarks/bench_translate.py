@@ -0,0 +1,78 @@
+"""
+Offline translation benchmark: run_translation against a local fake Ollama backend and an in-memory store.
+Run: python -m benchmarks.bench_translate [--stage content|titles] [--articles 40] [--capacity 4] [--paragraphs 12]
+Numbers are comparable across commits when run with the same arguments on the same machine.
+"""
+import argparse
+import os
+import sys
+import time
+
+
+def _article(i: int, paragraphs: int) -> dict:
+    body = "\n\n".join(
+        f"Paragraph {p} of article {i}. Officials said the plan would be reviewed next week, while analysts "
+        f"expect markets and regulators to respond before the end of the quarter, according to people familiar "
+        f"with the matter who asked not to be named because the talks are private."
+        for p in range(paragraphs)
+    )
+    # Đoạn lặp lại giữa các bài (byline, disclaimer) như feed thật
+    body = f"By Staff Reporter, Example News\n\n{body}\n\nThis article is for information only and is not investment advice."
+    return {
+        "link": f"https://www.example.invalid/article/{i}",
+        "title": f"Article {i}: regulators weigh new rules",
+        "summary": f"Summary of article {i}.",
+        "content": body,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stage", choices=("content", "titles"), default="content",
+                        help="run_translation (content) or run_translate_title_summary (titles)")
+    parser.add_argument("--articles", type=int, default=40)
+    parser.add_argument("--paragraphs", type=int, default=12, help="Paragraphs per article (~260 chars each)")
+    parser.add_argument("--capacity", type=int, default=4, help="Requests the fake backend serves in parallel")
+    parser.add_argument("--latency", type=float, default=0.05, help="Base seconds per request")
+    parser.add_argument("--per-kchar", type=float, default=0.02, help="Extra seconds per 1000 prompt chars")
+    parser.add_argument("--max-queue", type=int, default=16, help="Queued requests beyond this get 503")
+    parser.add_argument("--chars-per-sec", type=float, default=20000, help="Backend generation speed")
+    parser.add_argument("--degenerate-rate", type=float, default=0.0,
+                        help="Fraction of answers that add commentary or loop until num_predict")
+    args = parser.parse_args()
+
+    from benchmarks.fake_ollama import FakeOllama
+
+    backend = FakeOllama(args.capacity, args.latency, args.per_kchar, args.max_queue,
+                         chars_per_sec=args.chars_per_sec, degenerate_rate=args.degenerate_rate)
+    # Settings are read at import time
+    os.environ["OLLAMA_BASE_URL"] = backend.start()
+    os.environ["ENABLE_TRANSLATION"] = "true"
+    os.environ["CONTENT_QUALITY_GATE"] = "false"
+
+    from benchmarks import memory_store
+    from app.database import get_articles_collection
+    from app.scheduler.job_runner import run_translate_title_summary, run_translation
+
+    memory_store.install()
+    col = get_articles_collection()
+    for i in range(args.articles):
+        doc = _article(i, args.paragraphs)
+        if args.stage == "titles":
+            doc["content_vn"] = "[vi] ..."
+        col.insert_one(doc)
+
+    started = time.perf_counter()
+    try:
+        translated = run_translation() if args.stage == "content" else run_translate_title_summary()
+    finally:
+        backend.stop()
+    elapsed = time.perf_counter() - started
+    print()
+    print(f"translated {translated}/{args.articles} in {elapsed:.2f}s ({translated / elapsed * 60:.1f} articles/min); "
+          f"backend: {backend.requests} requests, {backend.rejected} rejected, peak {backend.peak_in_flight} in flight, "
+          f"{backend.generated_chars} chars generated")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
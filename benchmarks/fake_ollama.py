@@ -0,0 +1,198 @@
+"""
+Local stand-in for the Ollama /api/chat endpoint: a backend with a fixed number of parallel slots,
+so requests beyond capacity queue (latency rises) and a deep queue is answered 503.
+JSON-mode requests (batched titles/summaries) get a JSON object keyed by item id.
+The "translation" echoes the text after the prompt's last "Nội dung..." label, prefixed with [vi].
+A fraction of answers can degenerate (commentary after the translation, or a loop until num_predict),
+and output is generated at a fixed rate, so stopping a stream early saves backend time.
+"""
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+
+_SOURCE_RE = re.compile(r"\n(?:Nội dung cần dịch|Nội dung):\n", re.S)
+_COMMENTARY = (
+    "\n\nIt seems the text you provided is a news article. Could you clarify what you need?"
+    "\n\nIf you'd like, I can: summarize it, format it, or translate it again."
+)
+_LOOP = "Thị trường tăng. "
+# Bước stream (ký tự mỗi message)
+_STREAM_STEP = 16
+
+
+def fake_translation(prompt: str) -> str:
+    parts = _SOURCE_RE.split(prompt)
+    source = parts[-1] if len(parts) > 1 else prompt.rsplit("\n\n", 1)[-1]
+    return "[vi] " + source.strip()
+
+
+def fake_batch_translation(prompt: str) -> str:
+    """JSON-mode answer to the batched title/summary prompt: {id: {field: "[vi] ..."}}."""
+    items = json.loads(prompt[prompt.index("(JSON):\n") + len("(JSON):\n"):])
+    return json.dumps({
+        item["id"]: {k: "[vi] " + v for k, v in item.items() if k != "id"}
+        for item in items
+    }, ensure_ascii=False)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Client dừng stream sớm / đóng kết nối keep-alive: bình thường, không in traceback
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+class FakeOllama:
+    """
+    capacity: requests served in parallel; each takes base_latency + per_kchar × prompt kB seconds
+    (prefill) plus output chars / chars_per_sec (generation).
+    max_queue: waiting requests beyond this are refused with 503 (backend overloaded).
+    context_length: reported by /api/show as the model's trained context.
+    degenerate_rate: fraction of text answers that ramble on (commentary) or loop until num_predict.
+    """
+
+    def __init__(self, capacity: int = 4, base_latency: float = 0.05, per_kchar: float = 0.02,
+                 max_queue: int = 16, context_length: int = 32768, chars_per_sec: float = 20000,
+                 degenerate_rate: float = 0.0, seed: int = 1):
+        self.capacity = capacity
+        self.context_length = context_length
+        self.base_latency = base_latency
+        self.per_kchar = per_kchar
+        self.max_queue = max_queue
+        self.chars_per_sec = chars_per_sec
+        self.degenerate_rate = degenerate_rate
+        self.requests = 0
+        self.rejected = 0
+        self.peak_in_flight = 0
+        self.generated_chars = 0
+        self._rng = random.Random(seed)
+        self._slots = threading.Semaphore(capacity)
+        self._waiting = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._server: Optional[_Server] = None
+
+    def respond(self, body: dict) -> Tuple[str, str]:
+        """(content, done_reason): a loop runs until num_predict and is reported as "length"."""
+        prompt = "\n".join(m.get("content", "") for m in body.get("messages", []))
+        if body.get("format") == "json":
+            return fake_batch_translation(prompt), "stop"
+        out = fake_translation(prompt)
+        with self._lock:
+            draw = self._rng.random()
+        if draw < self.degenerate_rate / 2:
+            out += _COMMENTARY
+        elif draw < self.degenerate_rate:
+            # Vòng lặp tới num_predict (≈ 4 ký tự / token)
+            limit = (body.get("options") or {}).get("num_predict") or 50_000
+            out += "\n\n" + _LOOP * (limit * 4 // len(_LOOP))
+            return out, "length"
+        return out, "stop"
+
+    def _handler(self):
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, payload: dict) -> None:
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _chunk(self, payload: dict) -> None:
+                data = json.dumps(payload).encode("utf-8") + b"\n"
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+            def _stream(self, model: str, content: str, reason: str) -> int:
+                """NDJSON parts at chars_per_sec; returns chars sent before the client hung up."""
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                sent = 0
+                try:
+                    for i in range(0, len(content), _STREAM_STEP):
+                        piece = content[i:i + _STREAM_STEP]
+                        time.sleep(len(piece) / backend.chars_per_sec)
+                        self._chunk({"model": model, "message": {"role": "assistant", "content": piece}, "done": False})
+                        sent += len(piece)
+                    self._chunk({"model": model, "message": {"role": "assistant", "content": ""},
+                                 "done": True, "done_reason": reason})
+                    self.wfile.write(b"0\r\n\r\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True
+                return sent
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if self.path == "/api/show":
+                    self._send(200, {"model_info": {"fake.context_length": backend.context_length}})
+                    return
+                if self.path != "/api/chat":
+                    self._send(404, {"error": "not found"})
+                    return
+                with backend._lock:
+                    backend.requests += 1
+                    if backend._waiting >= backend.max_queue:
+                        backend.rejected += 1
+                        overloaded = True
+                    else:
+                        backend._waiting += 1
+                        overloaded = False
+                if overloaded:
+                    self._send(503, {"error": "server busy"})
+                    return
+                with backend._slots:
+                    with backend._lock:
+                        backend._waiting -= 1
+                        backend._in_flight += 1
+                        backend.peak_in_flight = max(backend.peak_in_flight, backend._in_flight)
+                    prompt_chars = sum(len(m.get("content", "")) for m in body.get("messages", []))
+                    time.sleep(backend.base_latency + backend.per_kchar * prompt_chars / 1000)
+                    content, reason = backend.respond(body)
+                    model = body.get("model", "")
+                    if body.get("stream", True):
+                        generated = self._stream(model, content, reason)
+                    else:
+                        time.sleep(len(content) / backend.chars_per_sec)
+                        generated = len(content)
+                        self._send(200, {
+                            "model": model,
+                            "created_at": "1970-01-01T00:00:00Z",
+                            "message": {"role": "assistant", "content": content},
+                            "done": True,
+                            "done_reason": reason,
+                        })
+                    with backend._lock:
+                        backend._in_flight -= 1
+                        backend.generated_chars += generated
+
+        return Handler
+
+    def start(self) -> str:
+        """Start serving; returns the base URL (OLLAMA_BASE_URL)."""
+        self._server = _Server(("127.0.0.1", 0), self._handler())
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
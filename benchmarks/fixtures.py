@@ -0,0 +1,131 @@
+"""
+Recorded feeds (benchmarks/data/feeds/<name>.xml) and article pages (benchmarks/data/pages/<name>-<n>.html)
+for benchmarks, with synthetic fallbacks.
+"""
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+from urllib.request import Request, urlopen
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+FEEDS_DIR = DATA_DIR / "feeds"
+PAGES_DIR = DATA_DIR / "pages"
+
+# Feeds to record: name -> live URL
+RECORD_SOURCES = {
+    "bbc": "http://feeds.bbci.co.uk/news/world/rss.xml",
+    "coindesk": "https://www.coindesk.com/arc/outboundfeeds/rss/",
+    "zdnet": "https://www.zdnet.com/topic/artificial-intelligence/rss.xml",
+}
+
+
+def record_feeds() -> None:
+    """Download RECORD_SOURCES into FEEDS_DIR (needs network, run once and commit the files)."""
+    FEEDS_DIR.mkdir(parents=True, exist_ok=True)
+    for name, url in RECORD_SOURCES.items():
+        req = Request(url, headers={"User-Agent": "NewsCrawler/1.0"})
+        with urlopen(req, timeout=30) as resp:
+            body = resp.read()
+        (FEEDS_DIR / f"{name}.xml").write_bytes(body)
+        print(f"Recorded {name}: {len(body)} bytes")
+
+
+def record_pages(per_feed: int = 5) -> None:
+    """Download the first per_feed article pages of each recorded feed into PAGES_DIR (needs network)."""
+    from app.crawler.fast_parser import parse_entries
+
+    PAGES_DIR.mkdir(parents=True, exist_ok=True)
+    for name in sorted(recorded_names()):
+        entries = parse_entries((FEEDS_DIR / f"{name}.xml").read_bytes(), per_feed)
+        for n, entry in enumerate(entries):
+            req = Request(entry["link"], headers={"User-Agent": "NewsCrawler/1.0"})
+            try:
+                with urlopen(req, timeout=30) as resp:
+                    body = resp.read()
+            except OSError as e:
+                print(f"Skipped {entry['link']}: {e}")
+                continue
+            (PAGES_DIR / f"{name}-{n}.html").write_bytes(body)
+            print(f"Recorded {name}-{n}: {len(body)} bytes ({entry['link']})")
+
+
+def load_pages() -> List[Tuple[str, str, bytes]]:
+    """Recorded article pages as (name, article URL guess, body); URL comes from <link rel=canonical> if present."""
+    import re
+
+    pages = []
+    for path in sorted(PAGES_DIR.glob("*.html")) if PAGES_DIR.exists() else []:
+        body = path.read_bytes()
+        m = re.search(rb'<link[^>]+rel="canonical"[^>]+href="([^"]+)"', body[:200000])
+        name = path.stem.rsplit("-", 1)[0]
+        url = m.group(1).decode("utf-8", "replace") if m else RECORD_SOURCES.get(name, "https://example.invalid/")
+        pages.append((name, url, body))
+    return pages
+
+
+def _synthetic_item(name: str, i: int, when: datetime) -> str:
+    pub = when.strftime("%a, %d %b %Y %H:%M:%S GMT")
+    if name == "bbc":
+        return f"""<item>
+<title><![CDATA[World story number {i} as leaders meet]]></title>
+<description><![CDATA[Short standfirst for story {i}, in the style of BBC World summaries.]]></description>
+<link>https://www.bbc.com/news/articles/c{i:011d}</link>
+<guid isPermaLink="false">https://www.bbc.com/news/articles/c{i:011d}#0</guid>
+<pubDate>{pub}</pubDate>
+<media:thumbnail width="240" height="135" url="https://ichef.bbci.co.uk/news/240/cpsprodpb/{i:04x}/live/img{i}.jpg"/>
+</item>"""
+    body = "".join(f"<p>Paragraph {p} of article {i}: markets, tokens and regulators.</p>" for p in range(40))
+    if name == "coindesk":
+        return f"""<item>
+<title><![CDATA[Bitcoin moves on day {i}]]></title>
+<link>https://www.coindesk.com/markets/2026/10/01/story-{i}</link>
+<guid isPermaLink="false">{i:08d}-coindesk</guid>
+<dc:creator><![CDATA[Reporter {i % 7}]]></dc:creator>
+<description><![CDATA[Crypto markets summary {i}.]]></description>
+<content:encoded><![CDATA[{body}]]></content:encoded>
+<pubDate>{pub}</pubDate>
+<media:content url="https://www.coindesk.com/resizer/{i}.jpg" type="image/jpeg" medium="image" width="1200" height="600"/>
+</item>"""
+    return f"""<item>
+<title>AI feature story {i}</title>
+<link>https://www.zdnet.com/article/ai-story-{i}/</link>
+<description>&lt;p&gt;ZDNet AI teaser {i} with &lt;a href="https://www.zdnet.com/"&gt;links&lt;/a&gt;.&lt;/p&gt;</description>
+<dc:creator>Writer {i % 5}</dc:creator>
+<pubDate>{pub}</pubDate>
+<media:thumbnail url="https://www.zdnet.com/a/img/resize/{i}.jpg" width="300"/>
+</item>"""
+
+
+def synthetic_feed(name: str, n: int = 100) -> bytes:
+    """RSS 2.0 document shaped like the recorded feed `name` (used when nothing was recorded)."""
+    now = datetime(2026, 10, 1, 12, 0, 0)
+    items = "\n".join(_synthetic_item(name, i, now - timedelta(minutes=17 * i)) for i in range(n))
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/" xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+<channel><title>{name}</title><link>https://example.invalid/{name}</link><description>{name}</description>
+{items}
+</channel></rss>""".encode("utf-8")
+
+
+def recorded_names() -> Set[str]:
+    """Sources that have a recorded feed on disk."""
+    return {name for name in RECORD_SOURCES if (FEEDS_DIR / f"{name}.xml").exists()}
+
+
+def load_feeds() -> Dict[str, bytes]:
+    """Recorded feeds from FEEDS_DIR; synthetic stand-ins for any source that was not recorded."""
+    recorded = recorded_names()
+    return {
+        name: (FEEDS_DIR / f"{name}.xml").read_bytes() if name in recorded else synthetic_feed(name)
+        for name in RECORD_SOURCES
+    }
+
+
+if __name__ == "__main__":
+    record_feeds()
+    record_pages()
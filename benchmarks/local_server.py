@@ -0,0 +1,143 @@
+"""Local HTTP stand-in for feed and article hosts, with injectable latency, errors and slow bodies."""
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.fixtures import PAGES_DIR
+
+_LINK_RE = re.compile(r"<link>\s*(?:<!\[CDATA\[)?\s*(https?://[^<\]\s]+)\s*(?:\]\]>)?\s*</link>")
+_ATOM_LINK_RE = re.compile(r'(<link[^>]*\bhref=")(https?://[^"]+)(")')
+
+
+def synthetic_page(name: str, i: int) -> bytes:
+    """Article page with nav/footer boilerplate around ~12 paragraphs of body text."""
+    paragraphs = "\n".join(
+        f"<p>Paragraph {p} of {name} article {i}. Officials said the plan would be reviewed next week, "
+        f"while analysts expect markets and regulators to respond before the end of the quarter.</p>"
+        for p in range(12)
+    )
+    nav = "".join(f'<li><a href="/section/{n}">Section {n}</a></li>' for n in range(30))
+    return f"""<!DOCTYPE html><html><head><meta charset="utf-8">
+<title>{name} article {i}</title>
+<meta property="og:image" content="https://images.example.invalid/{name}/{i}.jpg">
+<link rel="canonical" href="https://www.example.invalid/{name}/{i}">
+</head><body><header><nav><ul>{nav}</ul></nav></header>
+<main><article><h1>{name} article {i}</h1>
+<div data-testid="hero-image"><img src="https://ichef.bbci.co.uk/news/480/cpsprodpb/{i:04x}/live/hero.jpg"></div>
+{paragraphs}</article></main>
+<footer><p>Copyright. Cookie settings. Terms of use. Privacy policy.</p></footer></body></html>""".encode("utf-8")
+
+
+def _recorded_pages() -> List[bytes]:
+    return [p.read_bytes() for p in sorted(PAGES_DIR.glob("*.html"))] if PAGES_DIR.exists() else []
+
+
+class FaultConfig:
+    """Injected faults, drawn from one seeded RNG so runs are reproducible."""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 slow_rate: float = 0.0, slow_bytes_per_sec: int = 64 * 1024, seed: int = 1):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.slow_bytes_per_sec = slow_bytes_per_sec
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self) -> Tuple[float, bool, bool]:
+        """(delay seconds, fail with 500?, trickle the body?)"""
+        with self._lock:
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            return delay, self._rng.random() < self.error_rate, self._rng.random() < self.slow_rate
+
+
+class LocalSite:
+    """
+    One ThreadingHTTPServer per simulated host, each on its own loopback address (127.0.0.N, Linux)
+    so per-host politeness behaves as it would against BBC / CoinDesk / ZDNet.
+    Serves /feed/<name> (item links rewritten to /article/<name>/<n> on the same host) and article pages.
+    """
+
+    def __init__(self, feeds: Dict[str, bytes], hosts: int, faults: FaultConfig):
+        self.feeds = feeds
+        self.faults = faults
+        self.hosts = max(1, hosts)
+        self.pages = _recorded_pages()
+        self.requests = 0
+        self._servers: List[ThreadingHTTPServer] = []
+        self._feed_host: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with site._lock:
+                    site.requests += 1
+                delay, fail, slow = site.faults.draw()
+                if delay:
+                    time.sleep(delay)
+                body, ctype = site._body(self.path, f"http://{self.headers.get('Host')}")
+                if fail or body is None:
+                    self.send_response(500 if fail else 404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if not slow:
+                    self.wfile.write(body)
+                    return
+                chunk = max(1, site.faults.slow_bytes_per_sec // 10)
+                for i in range(0, len(body), chunk):
+                    self.wfile.write(body[i:i + chunk])
+                    self.wfile.flush()
+                    time.sleep(0.1)
+
+        return Handler
+
+    def _body(self, path: str, base: str) -> Tuple[Optional[bytes], str]:
+        parts = path.strip("/").split("/")
+        if len(parts) == 2 and parts[0] == "feed" and parts[1] in self.feeds:
+            name = parts[1]
+            counter = iter(range(1_000_000))
+            text = self.feeds[name].decode("utf-8", "replace")
+            text = _LINK_RE.sub(lambda m: f"<link>{base}/article/{name}/{next(counter)}</link>", text)
+            text = _ATOM_LINK_RE.sub(lambda m: f"{m.group(1)}{base}/article/{name}/{next(counter)}{m.group(3)}", text)
+            return text.encode("utf-8"), "application/rss+xml; charset=utf-8"
+        if len(parts) == 3 and parts[0] == "article" and parts[2].isdigit():
+            i = int(parts[2])
+            body = self.pages[i % len(self.pages)] if self.pages else synthetic_page(parts[1], i)
+            return body, "text/html; charset=utf-8"
+        return None, "text/plain"
+
+    def start(self) -> None:
+        for n in range(self.hosts):
+            server = ThreadingHTTPServer((f"127.0.0.{n + 1}", 0), self._handler())
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self._servers.append(server)
+        for i, name in enumerate(self.feeds):
+            host, port = self._servers[i % self.hosts].server_address[:2]
+            self._feed_host[name] = f"http://{host}:{port}"
+
+    def stop(self) -> None:
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+
+    def feed_urls(self) -> Dict[str, str]:
+        """name -> local feed URL"""
+        return {name: f"{base}/feed/{name}" for name, base in self._feed_host.items()}
@@ -0,0 +1,138 @@
+"""In-memory stand-in for the Mongo collections used by a crawl cycle (benchmarks only)."""
+import copy
+import threading
+from typing import Any, Dict, List
+
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+_MISSING = object()
+
+
+def _match_value(value: Any, cond: Any) -> bool:
+    if not isinstance(cond, dict) or not any(k.startswith("$") for k in cond):
+        return (None if value is _MISSING else value) == cond
+    for op, arg in cond.items():
+        v = None if value is _MISSING else value
+        if op == "$in" and v not in arg:
+            return False
+        if op == "$nin" and v in arg:
+            return False
+        if op == "$ne" and v == arg:
+            return False
+        if op == "$exists" and (value is not _MISSING) != bool(arg):
+            return False
+        if op in ("$gt", "$gte", "$lt", "$lte"):
+            if v is None:
+                return False
+            if op == "$gt" and not v > arg:
+                return False
+            if op == "$gte" and not v >= arg:
+                return False
+            if op == "$lt" and not v < arg:
+                return False
+            if op == "$lte" and not v <= arg:
+                return False
+    return True
+
+
+def matches(doc: dict, query: dict) -> bool:
+    """Subset of the Mongo query language: equality, $in/$nin/$ne/$exists/$gt(e)/$lt(e), $or, $and."""
+    for key, cond in query.items():
+        if key == "$or":
+            if not any(matches(doc, q) for q in cond):
+                return False
+        elif key == "$and":
+            if not all(matches(doc, q) for q in cond):
+                return False
+        elif not _match_value(doc.get(key, _MISSING), cond):
+            return False
+    return True
+
+
+class Cursor(list):
+    def sort(self, key, direction=1):
+        super().sort(key=lambda d: (d.get(key) is not None, d.get(key)), reverse=direction < 0)
+        return self
+
+    def limit(self, n):
+        return Cursor(self[:n]) if n else self
+
+
+class UpdateResult:
+    def __init__(self, modified: int):
+        self.modified_count = modified
+
+
+class MemoryCollection:
+    def __init__(self, unique_link: bool = False):
+        self._docs: List[dict] = []
+        self._lock = threading.Lock()
+        self._unique_link = unique_link
+        self._links: set = set()
+
+    def create_index(self, *args, **kwargs):
+        return "link_1"
+
+    def estimated_document_count(self) -> int:
+        return len(self._docs)
+
+    def count_documents(self, query: dict) -> int:
+        return len(self.find(query))
+
+    def find(self, query: Dict = None, projection: Dict = None) -> Cursor:
+        with self._lock:
+            return Cursor(copy.copy(d) for d in self._docs if matches(d, query or {}))
+
+    def find_one(self, query: Dict = None, projection: Dict = None):
+        found = self.find(query)
+        return found[0] if found else None
+
+    def insert_one(self, doc: dict):
+        with self._lock:
+            if self._unique_link and doc.get("link") in self._links:
+                raise DuplicateKeyError("duplicate link")
+            doc = dict(doc)
+            doc.setdefault("_id", ObjectId())
+            self._docs.append(doc)
+            self._links.add(doc.get("link"))
+
+    def update_one(self, query: dict, update: dict, upsert: bool = False) -> UpdateResult:
+        with self._lock:
+            for d in self._docs:
+                if matches(d, query):
+                    d.update(update.get("$set", {}))
+                    return UpdateResult(1)
+            if upsert:
+                doc = {k: v for k, v in query.items() if not k.startswith("$")}
+                doc.update(update.get("$set", {}))
+                doc.setdefault("_id", ObjectId())
+                self._docs.append(doc)
+            return UpdateResult(0)
+
+    def bulk_write(self, ops, ordered: bool = True):
+        for op in ops:
+            self.update_one(op._filter, op._doc, upsert=op._upsert)
+
+
+class MemoryDatabase(dict):
+    def __missing__(self, name: str) -> MemoryCollection:
+        col = MemoryCollection(unique_link=(name == "articles"))
+        self[name] = col
+        return col
+
+
+class MemoryClient(dict):
+    def __missing__(self, name: str) -> MemoryDatabase:
+        db = MemoryDatabase()
+        self[name] = db
+        return db
+
+
+def install() -> MemoryClient:
+    """Make app.database.mongo use an in-memory client for the rest of the process."""
+    from app.database import mongo
+
+    client = MemoryClient()
+    mongo._client = client
+    return client